@@ -3,6 +3,7 @@ import ast
 import os
 
 from flow_3d import Workspace
+from flow_3d.simulation.utils.profile import PROFILE_ENV, PROFILE_FILENAME
 
 
 def parse_value(value):
@@ -31,6 +32,11 @@ def main():
     )
 
     parser.add_argument("--verbose", help="Defaults to `False`.", action="store_true")
+    parser.add_argument(
+        "--profile",
+        help="Records usage of each stage to `profile.jsonl`.",
+        action="store_true",
+    )
 
     args, unknown_args = parser.parse_known_args()
 
@@ -41,6 +47,10 @@ def main():
 
     workspace_filename = os.path.basename(workspace_path)
 
+    # Set within environment so that solver and worker processes inherit it.
+    if args.profile:
+        os.environ[PROFILE_ENV] = os.path.join(workspace_path, PROFILE_FILENAME)
+
     if verbose:
         print(f"workspace_path: {workspace_path}")
         print(f"workspace_filename: {workspace_filename}")
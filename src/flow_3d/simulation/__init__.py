@@ -1,4 +1,5 @@
 from .base import SimulationBase
+from .cost import SimulationCost
 from .huggingface import SimulationHuggingFace
 from .measurements import SimulationMeasurements
 from .name import SimulationName
@@ -6,12 +7,15 @@ from .parameters import SimulationParameters
 from .post_processing import SimulationPostProcessing
 from .prepin import SimulationPrepin
 from .status import SimulationStatus
+from .store import SimulationStore
+from .results import SimulationResults
 from .run import SimulationRun
 from .utils.compression import SimulationUtilsCompression
 from .utils.crop import SimulationUtilsCrop
 from .utils.decorators import SimulationUtilsDecorators
 from .utils.mesh import SimulationUtilsMesh
 from .utils.multiprocessing import SimulationUtilsMultiprocessing
+from .utils.profile import SimulationUtilsProfile
 from .view import SimulationView
 from .visualizations import SimulationVisualizations
 
@@ -19,6 +23,7 @@ from .visualizations import SimulationVisualizations
 class Simulation(
     SimulationBase,
     SimulationParameters,
+    SimulationCost,
     SimulationHuggingFace,
     SimulationMeasurements,
     SimulationName,
@@ -26,11 +31,13 @@ class Simulation(
     SimulationPrepin,
     SimulationRun,
     SimulationStatus,
+    SimulationStore,
     SimulationUtilsCompression,
     SimulationUtilsCrop,
     SimulationUtilsDecorators,
     SimulationUtilsMesh,
     SimulationUtilsMultiprocessing,
+    SimulationUtilsProfile,
     SimulationView,
     SimulationVisualizations,
 ):
@@ -0,0 +1,141 @@
+import math
+import os
+import statistics
+
+from flow_3d.simulation.report import SimulationReport
+from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+# Coefficients of cost model from a reference run of the default simulation
+# (150 x 50 x 30 cells, 1 ms at 5 µs output intervals): 44,577 cycles,
+# 5,671 s elapsed, 179,030 s cpu and 29 gb of `flsgrf.simulation`.
+DEFAULT_COST_COEFFICIENTS = {
+    # Mean timestep (s) per mesh size (m).
+    "timestep_per_mesh_size": 1.1217e-3,
+    # Seconds per cell per cycle.
+    "elapsed_per_cell_cycle": 5.654e-7,
+    "cpu_per_cell_cycle": 1.785e-5,
+    # Output bytes per cell per spatial output frame.
+    "bytes_per_cell_frame": 688.5,
+}
+
+
+class SimulationCost:
+    """
+    Estimates solver runtime and output size from mesh and domain parameters.
+    ```
+    cells   = (x extent / mesh_size) * (y ...) * (z ...)
+    frames  = floor(twfin / tpltd(1)) + 1
+    cycles  = twfin / (timestep_per_mesh_size * mesh_size)
+    elapsed = elapsed_per_cell_cycle * cells * cycles
+    bytes   = bytes_per_cell_frame * cells * frames
+    ```
+    Coefficients default to `DEFAULT_COST_COEFFICIENTS` and are calibrated
+    against completed runs with `Workspace.cost_calibrate`.
+    """
+
+    def cost_cells(self):
+        """
+        Number of cells of mesh block.
+        """
+        cells = 1
+        for axis in ["x", "y", "z"]:
+            extent = getattr(self, f"mesh_{axis}_end") - getattr(
+                self, f"mesh_{axis}_start"
+            )
+            cells *= max(round(extent / self.mesh_size), 1)
+        return cells
+
+    def cost_frames(self):
+        """
+        Number of spatial output frames from `tpltd(1)` within prepin file.
+        """
+        namelist = self.prepin_namelist
+        finish_time = namelist.get("xput", "twfin", self.simulation_finish_time)
+        interval = namelist.get("xput", "tpltd(1)")
+        if not interval:
+            return 1
+        return math.floor(finish_time / interval + 1e-9) + 1
+
+    def cost_estimate(self, coefficients=None):
+        """
+        Estimated solver runtime and output size.
+
+        @param coefficients: Overrides of `DEFAULT_COST_COEFFICIENTS`
+        @return: Dictionary of `cells`, `frames`, `cycles`, `elapsed` and `cpu`
+        seconds and `output_bytes`.
+        """
+        coefficients = {**DEFAULT_COST_COEFFICIENTS, **(coefficients or {})}
+
+        cells = self.cost_cells()
+        frames = self.cost_frames()
+        timestep = coefficients["timestep_per_mesh_size"] * self.mesh_size
+        cycles = self.simulation_finish_time / timestep
+
+        return {
+            "name": self.name,
+            "cells": cells,
+            "frames": frames,
+            "cycles": cycles,
+            "elapsed": coefficients["elapsed_per_cell_cycle"] * cells * cycles,
+            "cpu": coefficients["cpu_per_cell_cycle"] * cells * cycles,
+            "output_bytes": coefficients["bytes_per_cell_frame"] * cells * frames,
+        }
+
+    @SimulationUtilsDecorators.change_working_directory
+    def cost_observed(self, **kwargs):
+        """
+        Observed cost of completed run from `report.simulation`, `None` if
+        the run has not completed.
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        report_path = f"report.{self.filename}"
+        if not os.path.exists(report_path):
+            return None
+
+        summary = SimulationReport.read_summary(report_path)
+        if not summary["completed"] or not summary["cycle"]:
+            return None
+
+        # Exact size while output is still on disk, report rounds to units.
+        output_path = f"flsgrf.{self.filename}"
+        if os.path.exists(output_path):
+            summary["output_bytes"] = os.path.getsize(output_path)
+
+        return {
+            "name": self.name,
+            "cells": self.cost_cells(),
+            "frames": self.cost_frames(),
+            "mesh_size": self.mesh_size,
+            **summary,
+        }
+
+    @staticmethod
+    def cost_coefficients(observed):
+        """
+        Coefficients fit to observed costs, as the median of each ratio.
+
+        @param observed: List of `cost_observed` records.
+        @return: Dictionary of coefficients, defaults where not observed.
+        """
+        ratios = {key: [] for key in DEFAULT_COST_COEFFICIENTS}
+        for record in observed:
+            cell_cycles = record["cells"] * record["cycle"]
+            ratios["timestep_per_mesh_size"].append(
+                record["time"] / record["cycle"] / record["mesh_size"]
+            )
+            if record["elapsed"] is not None:
+                ratios["elapsed_per_cell_cycle"].append(record["elapsed"] / cell_cycles)
+            if record["cpu"] is not None:
+                ratios["cpu_per_cell_cycle"].append(record["cpu"] / cell_cycles)
+            if record["output_bytes"] is not None:
+                ratios["bytes_per_cell_frame"].append(
+                    record["output_bytes"] / (record["cells"] * record["frames"])
+                )
+
+        coefficients = dict(DEFAULT_COST_COEFFICIENTS)
+        for key, values in ratios.items():
+            if len(values):
+                coefficients[key] = statistics.median(values)
+
+        return coefficients
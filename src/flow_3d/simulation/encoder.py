@@ -0,0 +1,223 @@
+import imageio
+import multiprocessing
+import numpy as np
+import queue
+import traceback
+
+from PIL import GifImagePlugin, Image
+
+# Optional video writer (`pip install FLOW-3D[video]`).
+try:
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
+
+# Animation formats and default codec of each, `gif` is written with Pillow.
+ANIMATION_FORMATS = {
+    "gif": None,
+    "mp4": "libx264",
+    "webm": "libvpx-vp9",
+}
+
+# Frames waiting on the encoder process before rendering blocks.
+ENCODER_QUEUE_SIZE = 16
+
+# Seconds waited on the encoder process between checks that it is alive.
+ENCODER_POLL_INTERVAL = 1.0
+
+
+class SimulationFrameEncoder:
+    """
+    Appends RGB frames to an animation as they are rendered, so that frames
+    are never collected into a list before encoding.
+    ```
+    with SimulationFrameEncoder("temperature.mp4", fps=10) as encoder:
+        for frame in frames:
+            encoder.append(frame)
+    ```
+    `.mp4` and `.webm` frames are piped straight into ffmpeg. `.gif` frames
+    are quantized to a palette and written to the open file as they arrive.
+
+    With `in_process=False` encoding runs within a separate process fed from
+    a bounded queue while rendering continues.
+    """
+
+    def __init__(
+        self,
+        path,
+        fps=10,
+        codec=None,
+        quality=None,
+        in_process=True,
+        queue_size=ENCODER_QUEUE_SIZE,
+    ):
+        """
+        @param path: Animation path, format from extension, e.g., "temperature.gif"
+        @param fps: Frames per second -> 10
+        @param codec: ffmpeg codec of `.mp4` or `.webm` -> `ANIMATION_FORMATS`
+        @param quality: ffmpeg quality from 0 to 10 -> None (ffmpeg default)
+        @param in_process: Encodes within this process -> True
+        @param queue_size: Frames queued for encoder process -> 16
+        """
+        self.path = path
+        self.format = self.animation_format(path)
+        self.fps = fps
+        self.codec = codec if codec is not None else ANIMATION_FORMATS[self.format]
+        self.quality = quality
+        self.in_process = in_process
+
+        if self.format != "gif" and imageio_ffmpeg is None:
+            raise ImportError(
+                f"`.{self.format}` animations require `imageio-ffmpeg`, "
+                "install with `pip install FLOW-3D[video]`."
+            )
+
+        self.count = 0
+
+        if in_process:
+            self.writer = self.open_writer(self.path, self.fps, self.codec, quality)
+        else:
+            context = multiprocessing.get_context()
+            self.queue = context.Queue(maxsize=queue_size)
+            self.process = context.Process(
+                target=self.encode_queue,
+                args=(self.queue, self.path, self.fps, self.codec, quality),
+            )
+            self.process.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def append(self, frame):
+        """
+        Appends `(row, col, 3)` uint8 frame, blocks while the queue is full.
+        """
+        if self.in_process:
+            self.writer.append(frame)
+        else:
+            self.put(frame)
+        self.count += 1
+
+    def put(self, item):
+        # Checks on encoder process so that a failed encoder does not block.
+        while True:
+            try:
+                self.queue.put(item, timeout=ENCODER_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise Exception(f"Encoder of `{self.path}` stopped.")
+
+    def close(self):
+        """
+        Finishes animation, waiting on encoder process if used.
+        """
+        if self.in_process:
+            self.writer.close()
+        else:
+            self.put(None)
+            self.process.join()
+            if self.process.exitcode != 0:
+                raise Exception(
+                    f"Encoder of `{self.path}` exited with {self.process.exitcode}."
+                )
+
+    @staticmethod
+    def animation_format(path):
+        extension = path.rsplit(".", 1)[-1].lower()
+        if extension not in ANIMATION_FORMATS:
+            raise Exception(
+                f"Animation format `.{extension}` not in {list(ANIMATION_FORMATS)}."
+            )
+        return extension
+
+    @staticmethod
+    def open_writer(path, fps, codec=None, quality=None):
+        if SimulationFrameEncoder.animation_format(path) == "gif":
+            return GifFrameWriter(path, fps)
+        return VideoFrameWriter(path, fps, codec, quality)
+
+    @staticmethod
+    def encode_queue(frames, path, fps, codec=None, quality=None):
+        """
+        Encoder process appending frames from queue until `None` is received.
+        """
+        try:
+            writer = SimulationFrameEncoder.open_writer(path, fps, codec, quality)
+            while (frame := frames.get()) is not None:
+                writer.append(frame)
+            writer.close()
+        except Exception:
+            print(traceback.format_exc())
+            raise
+
+
+class GifFrameWriter:
+    """
+    Writes palette quantized frames to `.gif` as they are appended, each with
+    its own color table, so that no frames are kept in memory.
+    """
+
+    def __init__(self, path, fps):
+        self.path = path
+        self.duration = round(1000 / fps)
+        self.file = None
+
+    def append(self, frame):
+        image = Image.fromarray(np.asarray(frame, dtype=np.uint8))
+        image = image.quantize(colors=256)
+
+        # Opened with the first frame so that no empty `.gif` is written.
+        if self.file is None:
+            self.file = open(self.path, "wb")
+            header, _ = GifImagePlugin.getheader(
+                image, info={"loop": 0, "duration": self.duration}
+            )
+            self.file.writelines(header)
+
+        self.file.writelines(
+            GifImagePlugin.getdata(
+                image, duration=self.duration, include_color_table=True
+            )
+        )
+
+    def close(self):
+        if self.file is None:
+            return
+
+        # Trailer
+        self.file.write(b";")
+        self.file.close()
+        self.file = None
+
+
+class VideoFrameWriter:
+    """
+    Pipes frames into ffmpeg as they are appended.
+    """
+
+    def __init__(self, path, fps, codec, quality=None):
+        # Frames are padded to even sizes required by `yuv420p`.
+        self.writer = imageio.get_writer(
+            path,
+            format="FFMPEG",
+            mode="I",
+            fps=fps,
+            codec=codec,
+            quality=quality,
+            pixelformat="yuv420p",
+            macro_block_size=1,
+        )
+
+    def append(self, frame):
+        frame = np.asarray(frame, dtype=np.uint8)
+        rows, cols = frame.shape[0] % 2, frame.shape[1] % 2
+        if rows or cols:
+            frame = np.pad(frame, ((0, rows), (0, cols), (0, 0)), mode="edge")
+        self.writer.append_data(frame)
+
+    def close(self):
+        self.writer.close()
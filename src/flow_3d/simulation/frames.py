@@ -0,0 +1,305 @@
+import numpy as np
+
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+
+# Colors within colormap lookup table.
+LUT_SIZE = 256
+
+# Each cell is drawn as a square of `FRAME_SCALE` pixels.
+FRAME_SCALE = 4
+
+# Pixel sizes of title strip (above) and colorbar strip (right) of frames.
+TITLE_HEIGHT = 32
+COLORBAR_WIDTH = 80
+
+# Matplotlib is only used to draw text of strips, once per title or colorbar.
+STRIP_DPI = 100
+
+# Color of `NaN` cells.
+BAD_COLOR = (255, 255, 255)
+
+# Pixels per voxel edge of isometric frames, kept even so that every voxel
+# projects onto whole pixels.
+ISOMETRIC_SCALE = 4
+
+# Visible faces of isometric view (looking from +x, -y, +z) as the axis and
+# side of the voxel, with the shading of each face.
+ISOMETRIC_FACES = [
+    {"axis": 0, "side": 1, "shade": 0.8},
+    {"axis": 1, "side": -1, "shade": 0.65},
+    {"axis": 2, "side": 1, "shade": 1.0},
+]
+
+# Shading of face outline pixels, drawn as voxel edges.
+ISOMETRIC_EDGE_SHADE = 0.8
+
+
+class SimulationFrameRenderer:
+    """
+    Renders 2D arrays straight to RGB frames with a precomputed colormap
+    lookup table and a fixed `clim`, so that frames can be streamed into a
+    `.gif` writer without a matplotlib figure per frame.
+    ```
+    ┌───────────────────────────┐
+    │ Temperature (100 W, 1 m/s)│  title strip (cached per title)
+    ├──────────────────────┬────┤
+    │                      │ ▇  │
+    │   data (LUT mapped)  │ ▅  │  colorbar strip (cached per height)
+    │                      │ ▂  │
+    └──────────────────────┴────┘
+    ```
+    """
+
+    def __init__(self, cmap, clim, label=None, scale=FRAME_SCALE):
+        """
+        @param cmap: Matplotlib colormap name, e.g., "plasma"
+        @param clim: Fixed `[vmin, vmax]` of colormap.
+        @param label: Colorbar label -> None
+        @param scale: Pixels per cell -> 4
+        """
+        self.cmap = cmap
+        self.clim = clim
+        self.label = label
+        self.scale = scale
+
+        colors = colormaps[cmap](np.linspace(0, 1, LUT_SIZE))[:, :3]
+        self.lut = np.vstack([np.round(colors * 255), BAD_COLOR]).astype(np.uint8)
+
+        self.titles = {}
+        self.colorbars = {}
+
+    def colorize(self, data):
+        """
+        Maps array to `(row * scale, col * scale, 3)` RGB with lookup table.
+        """
+        data = np.asarray(data, dtype=np.float32)
+        rgb = self.lut[self.lut_indices(data)]
+
+        if self.scale > 1:
+            rgb = np.repeat(np.repeat(rgb, self.scale, axis=0), self.scale, axis=1)
+
+        return rgb
+
+    def lut_indices(self, data):
+        """
+        Lookup table indices of values, `NaN` mapped to `BAD_COLOR`.
+        """
+        vmin, vmax = self.clim
+        bad = np.isnan(data)
+        indices = (data - vmin) * ((LUT_SIZE - 1) / (vmax - vmin))
+        indices[bad] = 0
+        indices = np.clip(indices, 0, LUT_SIZE - 1, out=indices)
+        indices = np.round(indices, out=indices).astype(np.intp)
+        indices[bad] = LUT_SIZE
+        return indices
+
+    def render(self, data, title=""):
+        """
+        RGB frame of array with title and colorbar strips.
+        """
+        return self.compose(self.colorize(data), title)
+
+    def compose(self, body, title=""):
+        """
+        Frame of RGB body with title strip above and colorbar strip right.
+        """
+        height, width = body.shape[:2]
+
+        colorbar = self.colorbar_strip(height)
+        title_strip = self.title_strip(title, width + COLORBAR_WIDTH)
+
+        frame = np.empty((TITLE_HEIGHT + height, width + COLORBAR_WIDTH, 3), np.uint8)
+        frame[:TITLE_HEIGHT] = title_strip
+        frame[TITLE_HEIGHT:, :width] = body
+        frame[TITLE_HEIGHT:, width:] = colorbar
+
+        return frame
+
+    def title_strip(self, title, width):
+        if (title, width) not in self.titles:
+            figure = self.strip_figure(width, TITLE_HEIGHT)
+            figure.text(0.5, 0.5, title, ha="center", va="center", fontsize=10)
+            self.titles[(title, width)] = self.draw_strip(figure, width, TITLE_HEIGHT)
+
+        return self.titles[(title, width)]
+
+    def colorbar_strip(self, height):
+        if height not in self.colorbars:
+            figure = self.strip_figure(COLORBAR_WIDTH, height)
+            cax = figure.add_axes([0.1, 0.05, 0.2, 0.9])
+            mappable = ScalarMappable(
+                norm=Normalize(vmin=self.clim[0], vmax=self.clim[1]),
+                cmap=self.cmap,
+            )
+            colorbar = figure.colorbar(mappable, cax=cax)
+            colorbar.ax.tick_params(labelsize=7)
+            if self.label is not None:
+                colorbar.set_label(self.label, fontsize=7)
+            self.colorbars[height] = self.draw_strip(figure, COLORBAR_WIDTH, height)
+
+        return self.colorbars[height]
+
+    @staticmethod
+    def strip_figure(width, height):
+        return Figure(figsize=(width / STRIP_DPI, height / STRIP_DPI), dpi=STRIP_DPI)
+
+    @staticmethod
+    def draw_strip(figure, width, height):
+        canvas = FigureCanvasAgg(figure)
+        canvas.draw()
+        drawn = np.asarray(canvas.buffer_rgba())[..., :3]
+
+        # Figure size in inches may round a pixel off of the strip size.
+        strip = np.full((height, width, 3), 255, dtype=np.uint8)
+        rows, cols = min(height, drawn.shape[0]), min(width, drawn.shape[1])
+        strip[:rows, :cols] = drawn[:rows, :cols]
+        return strip
+
+
+class SimulationIsometricRenderer(SimulationFrameRenderer):
+    """
+    Renders thresholded `(x, y, z)` volumes as isometric voxel frames in
+    NumPy. Only faces exposed towards the viewer are extracted and each is
+    drawn as a precomputed pixel sprite, resolved with a depth buffer. The
+    projection is the 2:1 pixel isometric, viewed from the +x, -y, +z side.
+    """
+
+    def __init__(self, cmap, clim, label=None, scale=ISOMETRIC_SCALE):
+        """
+        @param scale: Pixels per voxel edge, even -> 4
+        """
+        if scale % 2:
+            raise Exception(f"Isometric scale `{scale}` must be even.")
+
+        super().__init__(cmap, clim, label=label, scale=scale)
+
+        self.sprites = [self.face_sprite(face) for face in ISOMETRIC_FACES]
+
+    def project(self, x, y, z):
+        """
+        Screen `(column, row)` pixel of point, rows increasing downwards.
+        """
+        return (x + y) * self.scale, (x - y) * self.scale // 2 - z * self.scale
+
+    def face_sprite(self, face):
+        """
+        Pixel offsets from the projected voxel origin covered by a face,
+        along with the shading of each pixel.
+        """
+        # Corners of face of voxel at origin, in order around the face.
+        axes = [a for a in range(3) if a != face["axis"]]
+        corners = []
+        for a, b in [(0, 0), (1, 0), (1, 1), (0, 1)]:
+            corner = [0, 0, 0]
+            corner[face["axis"]] = 1 if face["side"] > 0 else 0
+            corner[axes[0]], corner[axes[1]] = a, b
+            corners.append(self.project(*corner))
+        corners = np.array(corners, dtype=float)
+
+        # Pixels with centers inside of face (convex, same side of each edge).
+        cols = np.arange(corners[:, 0].min(), corners[:, 0].max())
+        rows = np.arange(corners[:, 1].min(), corners[:, 1].max())
+        cols, rows = np.meshgrid(cols, rows)
+        centers = np.stack([cols.ravel(), rows.ravel()], axis=-1) + 0.5
+
+        edges = np.roll(corners, -1, axis=0) - corners
+        relative = centers[:, np.newaxis] - corners[np.newaxis]
+        cross = edges[:, 0] * relative[..., 1] - edges[:, 1] * relative[..., 0]
+        inside = (cross > 0).all(axis=1) | (cross < 0).all(axis=1)
+
+        offsets = (centers[inside] - 0.5).astype(int)
+
+        # Pixels missing a neighbor within the face outline the voxel.
+        covered = {tuple(offset) for offset in offsets}
+        shade = np.full(len(offsets), face["shade"])
+        for index, (col, row) in enumerate(offsets):
+            neighbors = [(col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)]
+            if not all(neighbor in covered for neighbor in neighbors):
+                shade[index] *= ISOMETRIC_EDGE_SHADE
+
+        return {"offsets": offsets, "shade": shade}
+
+    def colorize_volume(self, volume, threshold):
+        """
+        Maps thresholded volume to an RGB isometric image, sized from the
+        volume shape so that frames of a simulation share the same size.
+
+        @param volume: `(x, y, z)` array, i.e. temperature.
+        @param threshold: Voxels above threshold are drawn.
+        """
+        volume = np.asarray(volume, dtype=np.float32)
+        solid = volume > threshold
+
+        # Image bounds from corners of volume.
+        nx, ny, nz = volume.shape
+        corners = np.array(
+            [self.project(x, y, z) for x in [0, nx] for y in [0, ny] for z in [0, nz]]
+        )
+        origin = corners.min(axis=0)
+        width, height = corners.max(axis=0) - origin
+
+        pixels, depths, colors = [], [], []
+        for face, sprite in zip(ISOMETRIC_FACES, self.sprites):
+            # Faces are exposed when the neighbor is empty or off the mesh.
+            axis, side = face["axis"], face["side"]
+            neighbor = np.zeros_like(solid)
+            source = [slice(None)] * 3
+            target = [slice(None)] * 3
+            source[axis] = slice(1, None) if side > 0 else slice(None, -1)
+            target[axis] = slice(None, -1) if side > 0 else slice(1, None)
+            neighbor[tuple(target)] = solid[tuple(source)]
+
+            x, y, z = np.nonzero(solid & ~neighbor)
+            if not len(x):
+                continue
+
+            col, row = self.project(x, y, z)
+            col, row = col - origin[0], row - origin[1]
+
+            # Nearer faces have a larger `x - y + z` at their center.
+            center = np.stack([x, y, z], axis=-1) + 0.5
+            center[:, axis] += 0.5 * side
+            depth = center[:, 0] - center[:, 1] + center[:, 2]
+
+            rgb = self.lut[self.lut_indices(volume[x, y, z])].astype(np.float32)
+
+            offsets = sprite["offsets"]
+            sprite_cols = col[:, np.newaxis] + offsets[np.newaxis, :, 0]
+            sprite_rows = row[:, np.newaxis] + offsets[np.newaxis, :, 1]
+            pixels.append((sprite_rows * width + sprite_cols).ravel())
+            depths.append(np.repeat(depth, len(offsets)))
+            colors.append(
+                (rgb[:, np.newaxis] * sprite["shade"][np.newaxis, :, np.newaxis])
+                .reshape(-1, 3)
+                .astype(np.uint8)
+            )
+
+        image = np.full((height * width, 3), 255, dtype=np.uint8)
+
+        if len(pixels):
+            pixels = np.concatenate(pixels)
+            depths = np.concatenate(depths)
+            colors = np.concatenate(colors)
+
+            # Nearest face of each pixel is drawn.
+            order = np.lexsort((-depths, pixels))
+            pixels, first = np.unique(pixels[order], return_index=True)
+            image[pixels] = colors[order][first]
+
+        return image.reshape(height, width, 3)
+
+    def render(self, volume, title="", threshold=None):
+        """
+        RGB isometric frame of volume with title and colorbar strips.
+
+        @param threshold: Voxels above threshold are drawn -> `clim[0]`
+        """
+        if threshold is None:
+            threshold = self.clim[0]
+
+        body = self.colorize_volume(volume, threshold)
+        return self.compose(body, title)
@@ -3,20 +3,42 @@ import os
 import shutil
 import zipfile
 
-from datasets import concatenate_datasets, Dataset, load_from_disk
+from datasets import (
+    Array2D,
+    Array3D,
+    Array4D,
+    Array5D,
+    Dataset,
+    Features,
+    Sequence,
+    Value,
+    load_from_disk,
+)
 from huggingface_hub import HfApi
-from tqdm import tqdm
 
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
 
 hf_api = HfApi()
 
+# Fixed shape array features by number of dimensions.
+ARRAY_FEATURES = {
+    2: Array2D,
+    3: Array3D,
+    4: Array4D,
+    5: Array5D,
+}
+
+# Timesteps buffered in memory before being written to the Arrow file.
+DATASET_WRITER_BATCH_SIZE = 8
+
 
 class SimulationHuggingFace:
     """
     Runs methods for huggingface related calls
     """
 
+    @SimulationUtilsProfile.profile_stage("dataset")
     @SimulationUtilsDecorators.change_working_directory
     def create_flslnk_dataset(
         self,
@@ -25,50 +47,99 @@ class SimulationHuggingFace:
         delete_output=True,
         delete_source=True,
         zip_output=True,
+        writer_batch_size=DATASET_WRITER_BATCH_SIZE,
         **kwargs,
     ):
-        # Unzip npz files
-        if not os.path.exists(npz_dir_path):
-            if os.path.exists(f"{npz_dir_path}.zip"):
-                os.makedirs(npz_dir_path)
-                with zipfile.ZipFile(f"{npz_dir_path}.zip", "r") as zip_ref:
-                    zip_ref.extractall(npz_dir_path)
-            else:
-                raise FileNotFoundError(f"`{npz_dir_path}.zip` file not found")
-
-        # Generate and concatenate datasets.
-        npz_data_listdir = sorted(os.listdir(npz_dir_path))
-
-        dataset = None
-
-        for npz_file in tqdm(npz_data_listdir):
-            npz_file_path = os.path.join(npz_dir_path, npz_file)
-
-            row_dict = np.load(npz_file_path)
-
-            time_step_dataset = Dataset.from_dict(row_dict)
-
-            if dataset is None:
-                dataset = time_step_dataset
-            else:
-                dataset = concatenate_datasets([dataset, time_step_dataset])
-
+        """
+        Writes flslnk `.npz` timesteps (folder or `.zip`) into a dataset in a
+        single pass, streaming timesteps through a generator with fixed shape
+        array features so that only `writer_batch_size` timesteps are held in
+        memory at once.
+
+        @param npz_dir_path: Folder (or `.zip`) of flslnk `.npz` files
+        @param dataset_path: Output dataset folder -> "flslnk_dataset"
+        @param delete_output: Deletes `dataset_path` folder after zipping -> True
+        @param delete_source: Deletes `npz_dir_path` folder if it exists -> True
+        @param zip_output: Zips `dataset_path` folder -> True
+        @param writer_batch_size: Timesteps per written Arrow record batch -> 8
+        @return: `dataset_path` of saved dataset, `None` if deleted.
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        # Features are taken from the first timestep as shapes are fixed.
+        examples = self.iter_flslnk_examples(npz_dir_path)
+        features = self.flslnk_dataset_features(next(examples))
+        examples.close()
+
+        # Generator cache is written within the simulation and removed after
+        # saving so that a rerun does not reuse stale cached timesteps.
+        cache_dir = f"{dataset_path}_cache"
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+
+        dataset = Dataset.from_generator(
+            self.iter_flslnk_examples,
+            features=features,
+            cache_dir=cache_dir,
+            gen_kwargs={"npz_dir_path": npz_dir_path},
+            writer_batch_size=writer_batch_size,
+        )
         dataset.save_to_disk(dataset_path)
 
+        del dataset
+        shutil.rmtree(cache_dir)
+
         if zip_output:
             print(f"Zipping `{dataset_path}` folder...")
             shutil.make_archive(dataset_path, "zip", dataset_path)
 
-        if delete_source:
+        if delete_source and os.path.isdir(npz_dir_path):
             print(f"Deleting `{npz_dir_path}` source folder")
             shutil.rmtree(npz_dir_path)
 
+        # Path rather than dataset is returned so that the dataset is never
+        # read back into memory (or pickled back from worker processes).
         if delete_output:
             print(f"Deleting `{dataset_path}` output folder")
             shutil.rmtree(dataset_path)
+            return None
+
+        return dataset_path
+
+    def iter_flslnk_examples(self, npz_dir_path="flslnk_npz"):
+        """
+        Yields each timestep of flslnk `.npz` files as a dataset example.
+        """
+        for _, npz_data in self.iter_flslnk_npz(npz_dir_path):
+            with npz_data:
+                # Values are saved as single item lists within `.npz` files.
+                yield {key: npz_data[key][0] for key in npz_data.files}
+
+    @staticmethod
+    def flslnk_dataset_features(example):
+        """
+        Dataset features of a flslnk timestep, i.e. `temperature` as an
+        `Array3D` of shape `(z, y, x)` and `power` as a `Value`.
+        """
+        features = {}
+        for key, value in example.items():
+            value = np.asarray(value)
+            dtype = str(value.dtype)
+
+            if value.ndim == 0:
+                features[key] = Value(dtype)
+            elif value.ndim == 1:
+                features[key] = Sequence(Value(dtype), length=len(value))
+            elif value.ndim in ARRAY_FEATURES:
+                features[key] = ARRAY_FEATURES[value.ndim](
+                    shape=value.shape, dtype=dtype
+                )
+            else:
+                raise Exception(f"`{key}` with {value.ndim} dimensions not supported.")
 
-        return dataset
+        return Features(features)
 
+    @SimulationUtilsProfile.profile_stage("upload")
     @SimulationUtilsDecorators.change_working_directory
     def upload_flslnk_dataset(
         self,
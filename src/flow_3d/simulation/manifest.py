@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+
+# Written next to the stage output so that it survives zipping and deleting
+# the output folder, i.e. `flslnk_npz.manifest.jsonl`.
+STAGE_MANIFEST_SUFFIX = ".manifest.jsonl"
+
+# Read size used when hashing output files (16 MiB).
+HASH_CHUNK_SIZE = 16 * 1024**2
+
+
+class SimulationStageManifest:
+    """
+    Append only log of the outputs (i.e. timesteps) finished by a post
+    processing stage, along with their size and sha256 hash (or modified
+    time for large outputs).
+    ```
+    {"name": "00000001", "size": 48213, "sha256": "9f86d0..."}
+    {"name": "00000002", "size": 48377, "sha256": "a3c5e1..."}
+    {"total": 2}
+    {"completed": true}
+    ```
+    Each line is written once an output is saved, so a stage interrupted
+    part way through can be resumed from the outputs already recorded.
+    """
+
+    def __init__(self, output_path):
+        """
+        @param output_path: Stage output, e.g., "flslnk_npz"
+        """
+        self.output_path = output_path
+        self.path = f"{output_path}{STAGE_MANIFEST_SUFFIX}"
+
+        self.entries = {}
+        self.total = None
+        self.completed = False
+
+        # Size up to last complete line, set when last line is partial.
+        self.valid_size = None
+
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                content = f.read()
+
+            if not content.endswith(b"\n"):
+                self.valid_size = content.rfind(b"\n") + 1
+
+            for line in content.decode("utf-8", errors="replace").splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partially written last line of an interrupted stage.
+                    continue
+
+                if "name" in record:
+                    self.entries[record["name"]] = record
+                if "total" in record:
+                    self.total = record["total"]
+                if "completed" in record:
+                    self.completed = record["completed"]
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def reset(self):
+        """
+        Removes recorded outputs so that the stage is run from the start.
+        """
+        if self.exists:
+            os.remove(self.path)
+
+        self.entries = {}
+        self.total = None
+        self.completed = False
+        self.valid_size = None
+
+    def append(self, record):
+        if self.valid_size is not None:
+            # Truncates partial last line so that records are not appended
+            # onto it.
+            with open(self.path, "r+b") as f:
+                f.truncate(self.valid_size)
+            self.valid_size = None
+
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def record(self, name, file_path, checksum=True):
+        """
+        Records output file of `name` as finished.
+
+        @param checksum: Hashes file, otherwise records modified time for
+        outputs too large to read again, e.g., `flslnk.tmp` -> True
+        """
+        entry = {"name": name, **self.file_entry(file_path, checksum)}
+        self.append(entry)
+        self.entries[name] = entry
+
+    def set_total(self, total):
+        self.append({"total": total})
+        self.total = total
+
+    def complete(self):
+        """
+        Marks stage as completed, written last after outputs are zipped.
+        """
+        if self.total is None:
+            self.set_total(len(self.entries))
+
+        self.append({"completed": True})
+        self.completed = True
+
+    def is_recorded(self, name, file_path):
+        """
+        Checks that output of `name` is recorded and that `file_path` still
+        matches the recorded size and hash (or modified time).
+        """
+        entry = self.entries.get(name)
+        if entry is None or not os.path.exists(file_path):
+            return False
+
+        if os.path.getsize(file_path) != entry["size"]:
+            return False
+
+        if "sha256" not in entry:
+            return os.path.getmtime(file_path) == entry["mtime"]
+
+        return self.file_entry(file_path)["sha256"] == entry["sha256"]
+
+    def progress(self):
+        """
+        Progress of stage, `total` is `None` until known.
+        """
+        return {
+            "completed": len(self.entries),
+            "total": self.total,
+            "done": self.completed,
+        }
+
+    @staticmethod
+    def file_entry(file_path, checksum=True):
+        """
+        Size and sha256 hash of file, or size and modified time.
+        """
+        if not checksum:
+            return {
+                "size": os.path.getsize(file_path),
+                "mtime": os.path.getmtime(file_path),
+            }
+
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                sha256.update(chunk)
+
+        return {
+            "size": os.path.getsize(file_path),
+            "sha256": sha256.hexdigest(),
+        }
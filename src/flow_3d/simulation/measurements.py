@@ -1,11 +1,12 @@
 import numpy as np
 import os
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from skimage import measure
-from tqdm import tqdm
+from scipy import ndimage
 
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
 
 # TODO: Handle with class (maybe parameters)
 COLUMNS_CONFIG = {
@@ -24,6 +25,19 @@ COLUMNS_CONFIG = {
     "liquid_label": {"cmap": "viridis", "clim": [0, 100], "title": "Liquid Label"},
 }
 
+# Timesteps measured together within a batch.
+MEASUREMENT_BATCH_SIZE = 64
+
+# Bitpacked mask columns, only written with `save_masks`.
+MASK_COLUMNS = [
+    "mask_shape_xy",
+    "mask_xy",
+    "mask_max_blob_xy",
+    "mask_shape_xz",
+    "mask_xz",
+    "mask_max_blob_xz",
+]
+
 
 class SimulationMeasurements:
     """
@@ -43,12 +57,7 @@ class SimulationMeasurements:
         simulation/
         ├─ measurements/
         │  ├─ melt_pool/
-        │  │  ├─ fraction_of_fluid/
-        │  │  ├─ liquid_label/
-        │  │  ├─ pressure/
-        │  │  ├─ temperature/
-        │  │  │  ├─ 00000001.npz
-        │  │  ├─ temperature.csv
+        │  │  ├─ temperature.parquet
         ...
         ```
         """
@@ -56,15 +65,11 @@ class SimulationMeasurements:
         if not os.path.exists("measurements"):
             os.makedirs("measurements")
 
-        # Column subfolders
+        # Measurement subfolders
         for subfolder in ["melt_pool"]:
             if not os.path.exists(f"measurements/{subfolder}"):
                 os.makedirs(f"measurements/{subfolder}")
 
-            for key in COLUMNS_CONFIG.keys():
-                if not os.path.exists(f"measurements/{subfolder}/{key}"):
-                    os.makedirs(f"measurements/{subfolder}/{key}")
-
         # Unzip npz files
         self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
 
@@ -72,16 +77,25 @@ class SimulationMeasurements:
         if not os.path.exists(f"mesh_x_y_z.npz") or regenerate_mesh_x_y_z:
             self.generate_mesh_x_y_z(npz_dir_path=npz_dir_path)
 
+    @SimulationUtilsProfile.profile_stage("measurements")
     @SimulationUtilsDecorators.change_working_directory
     def generate_melt_pool_measurements(
         self,
         npz_dir_path="flslnk_npz",
         num_proc=1,
+        batch_size=MEASUREMENT_BATCH_SIZE,
+        interpolate=False,
+        save_masks=False,
         **kwargs,
     ):
         """
         Provides depth, width, and length measurements of melt pool based on
         output ("pressure", "temperature", "fraction_of_fluid") threshold.
+
+        @param num_proc: Number of processes measuring batches -> 1
+        @param batch_size: Timesteps measured together -> 64
+        @param interpolate: Adds sub-voxel `*_interp_m` dimensions -> False
+        @param save_masks: Adds bitpacked `mask_*` columns -> False
         """
         print(
             f"""\n
@@ -90,147 +104,302 @@ Measurements: `{self.name}`
 ################################################################################
 """
         )
-        # #TODO: Add checks
-        # if num_proc > 1:
-        #     with multiprocessing.Pool(processes=num_proc) as pool:
-
-        #         for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-        #             npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-        #             example = {key: npz_data[key] for key in npz_data.keys()}
-        #             pool.apply_async(
-        #                 self.generate_melt_pool_dimensions,
-        #                 args=(example, index),
-        #                 error_callback=self.error_callback,
-        #             )
-        #         pool.close()
-        #         pool.join()
-
-        # else:
-
-        self.generate_melt_pool_dimensions(npz_dir_path=npz_dir_path)
+        self.generate_melt_pool_dimensions(
+            npz_dir_path=npz_dir_path,
+            num_proc=num_proc,
+            batch_size=batch_size,
+            interpolate=interpolate,
+            save_masks=save_masks,
+        )
 
-    def generate_melt_pool_dimensions(self, npz_dir_path="flslnk_npz"):
+    def generate_melt_pool_dimensions(
+        self,
+        npz_dir_path="flslnk_npz",
+        num_proc=1,
+        batch_size=MEASUREMENT_BATCH_SIZE,
+        interpolate=False,
+        save_masks=False,
+    ):
         """
         Provides depth, width, and length measurements of melt pool based on
         output ("pressure", "temperature", "fraction_of_fluid") threshold.
+
+        Thresholded projections of `batch_size` timesteps are stacked and the
+        largest blob of every timestep is labeled and measured at once. Rows
+        of each batch are streamed into `measurements/melt_pool/{key}.parquet`
+        as they finish, so rows are not necessarily ordered by timestep.
+
+        With `interpolate`, `depth_interp_m`, `length_interp_m` and
+        `width_interp_m` are also measured between the threshold crossings
+        linearly interpolated at the boundary voxels of the largest blob.
+
+        @param num_proc: Number of processes measuring batches -> 1
+        @param batch_size: Timesteps measured together -> 64
+        @param interpolate: Adds sub-voxel `*_interp_m` dimensions -> False
+        @param save_masks: Adds bitpacked `mask_*` columns -> False
         """
 
+        results = self.load_results(npz_dir_path=npz_dir_path)
+
         for key, configs in COLUMNS_CONFIG.items():
 
-            data_rows = []
-
-            if key == "temperature":
-
-                for npz_file in tqdm(sorted(os.listdir(npz_dir_path))):
-                    timestep = npz_file.split(".")[0]
-
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
-
-                    power, velocity = example["power"][0], example["velocity"][0]
-
-                    thresholded_data = np.copy(npz_data[key]).squeeze()
-                    thresholded_data[thresholded_data <= configs["clim"][0]] = 0
-                    thresholded_data[thresholded_data > configs["clim"][0]] = 1
-                    thresholded_data_unique = np.unique(thresholded_data)
-
-                    if len(thresholded_data_unique) > 1:
-
-                        data_dict = {
-                            "timestep": timestep,
-                            "beam_diameter": self.beam_diameter,
-                            "mesh_size": self.mesh_size,
-                            # Change to `self.material` when implemented
-                            "material": self.template_id,
-                            "power": power,
-                            "velocity": velocity,
-                            "depth_m": None,
-                            "depth_px": None,
-                            "length_m": None,
-                            "length_px": None,
-                            "width_m": None,
-                            "width_px": None,
-                        }
-
-                        skimage_dict = {
-                            "bbox_xy": (None, None, None, None),
-                            "bbox_xz": (None, None, None, None),
-                            "labels_all_xy": None,
-                            "labels_all_xz": None,
-                            "labels_max_blob_xy": None,
-                            "labels_max_blob_xz": None,
-                        }
-
-                        # `0` is xy plane `1` is xz plane
-                        for axis in [0, 1]:
-
-                            # Sum data along axis and apply threshold and transformations
-                            thresholded_data_sum = np.sum(thresholded_data, axis=axis)
-                            thresholded_data_sum = np.where(
-                                thresholded_data_sum > 0, 1, 0
-                            )
-                            thresholded_data_sum = np.flip(
-                                thresholded_data_sum, axis=(0, 1)
-                            )
-
-                            # Measure and label blob regions
-                            labels_all = measure.label(thresholded_data_sum)
-                            regionprops = measure.regionprops(labels_all)
-
-                            # Find the blob with the maximum area
-                            blob_max_area = 0
-                            for index, blob in enumerate(regionprops):
-                                if blob.area > blob_max_area:
-                                    blob_max_area_index = index
-                                    blob_max_area = blob.area
-
-                            blob_max = regionprops[blob_max_area_index]
-
-                            # Remove other smaller blobs
-                            labels_max_blob = np.where(
-                                labels_all == blob_max.label, 1, 0
-                            )
-
-                            # Get the bounding box of the largest blob
-                            min_row, min_col, max_row, max_col = blob_max.bbox
-                            bbox_width = max_col - min_col
-                            bbox_height = max_row - min_row
-
-                            if axis == 0:
-                                data_dict["width_m"] = bbox_height * self.mesh_size
-                                data_dict["width_px"] = bbox_height
-                                data_dict["length_m"] = bbox_width * self.mesh_size
-                                data_dict["length_px"] = bbox_width
-
-                                skimage_dict["bbox_xy"] = (
-                                    min_row,
-                                    min_col,
-                                    max_row,
-                                    max_col,
-                                )
-                                skimage_dict["labels_all_xy"] = labels_all
-                                skimage_dict["labels_max_blob_xy"] = labels_max_blob
-
-                            if axis == 1:
-                                data_dict["depth_m"] = bbox_height * self.mesh_size
-                                data_dict["depth_px"] = bbox_height
-
-                                skimage_dict["bbox_xz"] = (
-                                    min_row,
-                                    min_col,
-                                    max_row,
-                                    max_col,
-                                )
-                                skimage_dict["labels_all_xz"] = labels_all
-                                skimage_dict["labels_max_blob_xz"] = labels_max_blob
-
-                        data_rows.append(data_dict)
-                        np.savez_compressed(
-                            f"measurements/melt_pool/{key}/{timestep}.npz",
-                            **skimage_dict,
-                        )
-
-            dimensions_df = pd.DataFrame(data_rows)
-
-            # Save dimensions as csv
-            dimensions_df.to_csv(f"measurements/melt_pool/{key}.csv")
+            if key != "temperature":
+                continue
+
+            table_path = f"measurements/melt_pool/{key}.parquet"
+
+            # Written to temporary file so an interrupted table is not read.
+            table_tmp_path = f"{table_path}.tmp"
+            writer = None
+
+            def tasks():
+                for start in range(0, len(results), batch_size):
+                    indices = list(range(start, min(start + batch_size, len(results))))
+                    name = f"{results.names[indices[0]]}-{results.names[indices[-1]]}"
+                    yield name, (results, indices, key, interpolate, save_masks)
+
+            def callback(name, rows):
+                nonlocal writer
+                if not len(rows):
+                    return
+
+                table = pa.Table.from_pylist(rows)
+                if writer is None:
+                    writer = pq.ParquetWriter(table_tmp_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+
+            try:
+                self.apply_bounded(
+                    self.measure_melt_pool_batch,
+                    tasks(),
+                    num_proc=num_proc,
+                    unit="batch",
+                    callback=callback,
+                )
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            # No timesteps with a melt pool.
+            if writer is None:
+                pq.write_table(
+                    pa.table({"timestep": pa.array([], pa.string())}), table_tmp_path
+                )
+
+            os.replace(table_tmp_path, table_path)
+
+    def measure_melt_pool_batch(
+        self,
+        results,
+        indices,
+        key="temperature",
+        interpolate=False,
+        save_masks=False,
+    ):
+        """
+        Measures melt pool of a batch of timesteps.
+
+        @param results: `SimulationResults` of simulation.
+        @param indices: Timestep indices within batch.
+        @param interpolate: Adds sub-voxel `*_interp_m` dimensions -> False
+        @param save_masks: Adds bitpacked `mask_*` columns -> False
+        @return: Rows of melt pool dimensions for timesteps with a melt pool.
+        """
+        threshold = COLUMNS_CONFIG[key]["clim"][0]
+
+        examples, values = [], []
+        for index in indices:
+            example = results[index]
+            values_data = np.asarray(example[key]).squeeze()
+            thresholded_data = values_data > threshold
+
+            # Skips timesteps without (or entirely) melt pool.
+            if thresholded_data.any() and not thresholded_data.all():
+                examples.append(example)
+                values.append(values_data)
+
+        if not len(examples):
+            return []
+
+        values = np.stack(values)
+        thresholded = values > threshold
+
+        # `1` (z) is xy plane `2` (y) is xz plane of `(timestep, z, y, x)`.
+        planes = {}
+        for plane, axis in [("xy", 1), ("xz", 2)]:
+            projections = np.flip(thresholded.any(axis=axis), axis=(1, 2))
+            planes[plane] = self.largest_blobs(projections)
+
+            if interpolate:
+                # Maximum along projection crosses threshold where melt does.
+                fields = np.flip(values.max(axis=axis), axis=(1, 2))
+                planes[plane]["extents"] = self.interpolated_extents(
+                    fields, planes[plane]["labels_max_blob"] > 0, threshold
+                )
+
+        data_rows = []
+        for batch_index, example in enumerate(examples):
+            bbox_xy = planes["xy"]["bbox"][batch_index]
+            bbox_xz = planes["xz"]["bbox"][batch_index]
+
+            data_rows.append(
+                {
+                    "timestep": example.name,
+                    "beam_diameter": self.beam_diameter,
+                    "mesh_size": self.mesh_size,
+                    # Change to `self.material` when implemented
+                    "material": self.template_id,
+                    "power": example["power"][0],
+                    "velocity": example["velocity"][0],
+                    "depth_m": (bbox_xz[2] - bbox_xz[0]) * self.mesh_size,
+                    "depth_px": bbox_xz[2] - bbox_xz[0],
+                    "length_m": (bbox_xy[3] - bbox_xy[1]) * self.mesh_size,
+                    "length_px": bbox_xy[3] - bbox_xy[1],
+                    "width_m": (bbox_xy[2] - bbox_xy[0]) * self.mesh_size,
+                    "width_px": bbox_xy[2] - bbox_xy[0],
+                }
+            )
+
+            if interpolate:
+                extents_xy = planes["xy"]["extents"][batch_index]
+                extents_xz = planes["xz"]["extents"][batch_index]
+                data_rows[-1]["depth_interp_m"] = extents_xz[0] * self.mesh_size
+                data_rows[-1]["length_interp_m"] = extents_xy[1] * self.mesh_size
+                data_rows[-1]["width_interp_m"] = extents_xy[0] * self.mesh_size
+
+            for plane in ["xy", "xz"]:
+                bbox = planes[plane]["bbox"][batch_index]
+                data_rows[-1][f"bbox_{plane}"] = [int(b) for b in bbox]
+
+                if save_masks:
+                    # `labels_all` is recovered by labeling `mask`.
+                    labels_max_blob = planes[plane]["labels_max_blob"][batch_index]
+                    data_rows[-1][f"mask_shape_{plane}"] = list(labels_max_blob.shape)
+                    data_rows[-1][f"mask_{plane}"] = self.pack_mask(
+                        planes[plane]["labels_all"][batch_index]
+                    )
+                    data_rows[-1][f"mask_max_blob_{plane}"] = self.pack_mask(
+                        labels_max_blob
+                    )
+
+        return data_rows
+
+    @staticmethod
+    def pack_mask(mask):
+        """
+        Bitpacks nonzero pixels of image into bytes.
+        """
+        return np.packbits(np.asarray(mask) > 0).tobytes()
+
+    @staticmethod
+    def unpack_mask(packed, shape):
+        """
+        Boolean image from `pack_mask` bytes and `mask_shape_*` column.
+        """
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8))
+        return bits[: np.prod(shape)].reshape(shape).astype(bool)
+
+    @staticmethod
+    def interpolated_extents(fields, masks, threshold):
+        """
+        Sub-voxel extent of each blob along rows and columns, between the
+        threshold crossings linearly interpolated from each boundary voxel
+        of the blob to its neighbor outside.
+
+        @param fields: `(batch, row, col)` values, i.e. temperature.
+        @param masks: `(batch, row, col)` blob masks, values above threshold.
+        @param threshold: Crossing value, i.e. liquidus temperature.
+        @return: `(batch, 2)` extents in voxels along rows and columns.
+        """
+        extents = np.zeros((len(fields), 2))
+
+        for axis in [1, 2]:
+            length = fields.shape[axis]
+            indices = np.arange(length).reshape(
+                [-1 if a == axis else 1 for a in range(3)]
+            )
+            low = np.full(len(fields), np.inf)
+            high = np.full(len(fields), -np.inf)
+
+            for step in [-1, 1]:
+                # Neighbor values and masks, edges of mesh have no neighbor.
+                neighbor_fields = np.roll(fields, -step, axis=axis)
+                neighbor_masks = np.roll(masks, -step, axis=axis)
+                edge = (indices + step < 0) | (indices + step >= length)
+
+                boundary = masks & ~neighbor_masks & ~edge
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    fraction = (fields - threshold) / (fields - neighbor_fields)
+                fraction = np.clip(np.nan_to_num(fraction), 0, 1)
+                fraction = np.where(boundary, fraction, 0)
+
+                # Blob voxels at the edge or with a neighbor outside the blob.
+                position = indices + step * fraction
+                outer = masks & (~neighbor_masks | edge)
+
+                if step < 0:
+                    low = np.minimum(
+                        low, np.where(outer, position, np.inf).min(axis=(1, 2))
+                    )
+                else:
+                    high = np.maximum(
+                        high, np.where(outer, position, -np.inf).max(axis=(1, 2))
+                    )
+
+            extents[:, axis - 1] = high - low
+
+        return extents
+
+    @staticmethod
+    def largest_blobs(projections):
+        """
+        Labels blobs of each binary image within `(batch, row, col)` stack
+        (8-connected, as `skimage.measure.label`) and finds the largest blob
+        of each image, ties going to the first labeled.
+
+        @param projections: Boolean stack, each image with at least one blob.
+        @return: Dictionary of `labels_all` numbered from 1 within each image,
+        `labels_max_blob` mask and `bbox` `(min_row, min_col, max_row, max_col)`
+        of largest blob per image.
+        """
+        # Connects pixels within each image but not across the batch axis.
+        structure = np.zeros((3, 3, 3), dtype=bool)
+        structure[1] = True
+        labels, num_labels = ndimage.label(projections, structure=structure)
+
+        label_ids = np.arange(1, num_labels + 1)
+        areas = np.bincount(labels.ravel(), minlength=num_labels + 1)[1:]
+        objects = ndimage.find_objects(labels)
+        batch = np.array([o[0].start for o in objects])
+
+        # Labels are numbered in scan order, so the first label of each image
+        # offsets its labels to start from 1.
+        first_labels = np.full(len(projections), num_labels + 1)
+        np.minimum.at(first_labels, batch, label_ids)
+
+        # Largest area first then lowest label for each image.
+        order = np.lexsort((label_ids, -areas, batch))
+        _, first = np.unique(batch[order], return_index=True)
+        max_labels = label_ids[order[first]]
+
+        bbox = np.array(
+            [
+                [
+                    objects[label - 1][1].start,
+                    objects[label - 1][2].start,
+                    objects[label - 1][1].stop,
+                    objects[label - 1][2].stop,
+                ]
+                for label in max_labels
+            ]
+        )
+
+        offsets = (first_labels - 1)[:, None, None]
+        labels_all = np.where(labels > 0, labels - offsets, 0)
+        labels_max_blob = (labels == max_labels[:, None, None]).astype(int)
+
+        return {
+            "labels_all": labels_all,
+            "labels_max_blob": labels_max_blob,
+            "bbox": bbox,
+        }
@@ -0,0 +1,242 @@
+import f90nml
+import re
+
+from f90nml import fpy
+
+# Lines opening and closing a namelist group, i.e. `&xput` and `/`.
+GROUP_START_PATTERN = re.compile(r"^\s*&(\w+)")
+GROUP_END_PATTERN = re.compile(r"^\s*/")
+
+# Assignments of a line, i.e. `tbct(1, 2)=299.15, remark='...'`.
+ASSIGNMENT_PATTERN = re.compile(
+    r"(?P<key>[A-Za-z]\w*(?:\([\d\s,]+\))?)\s*=\s*"
+    r"(?P<value>'[^']*'|\"[^\"]*\"|[^,\s/]+)"
+)
+
+# Tables of material properties following the namelist groups.
+TABLES_MARKER = "#start tables"
+
+# Keys left out of the index, diffs and overrides.
+IGNORED_KEYS = ["remark"]
+
+
+class SimulationNamelist:
+    """
+    Namelist model of a prepin file with structured edits and diffing.
+    ```
+    namelist = SimulationNamelist(simulation.prepin_file_content)
+    namelist.get("xput", "tpltd(1)")          # 5e-06
+    namelist.update({"xput": {"tpltd(1)": 1e-5, "ifvof": 6}})
+    namelist.diff(other)                      # {"xput": {"tpltd(1)": (...)}}
+    str(namelist)                             # prepin file content
+    ```
+    Edits replace the value text of an assignment in place (or add a line to
+    the group), so remarks, layout and material tables of the template are
+    kept as is and serializing is a single join. `f90nml` parses the full
+    namelist on demand to validate edits and for typed access of arrays.
+    Values are in the units of the prepin file (centimeter-gram-second).
+    """
+
+    def __init__(self, text):
+        """
+        @param text: Prepin file content.
+        """
+        self.lines = text.split("\n")
+        self.index()
+
+    def __str__(self):
+        return self.to_text()
+
+    def to_text(self):
+        """
+        Prepin file content.
+        """
+        return "\n".join(self.lines)
+
+    def index(self):
+        """
+        Finds groups and the line and value span of each assignment.
+        """
+        self.groups = {}
+        self.parsed = None
+
+        group = None
+        for line_index, line in enumerate(self.lines):
+            if line.startswith(TABLES_MARKER):
+                break
+
+            if group is None:
+                match = GROUP_START_PATTERN.match(line)
+                if match:
+                    group = match.group(1).lower()
+                    self.groups[group] = {"start": line_index, "keys": {}}
+            elif GROUP_END_PATTERN.match(line):
+                self.groups[group]["end"] = line_index
+                group = None
+            else:
+                self.index_line(group, line_index)
+
+    def index_line(self, group, line_index):
+        for match in ASSIGNMENT_PATTERN.finditer(self.lines[line_index]):
+            key = self.normalize_key(match.group("key"))
+            if key not in IGNORED_KEYS:
+                self.groups[group]["keys"][key] = (
+                    line_index,
+                    match.start("value"),
+                    match.end("value"),
+                )
+
+    @property
+    def namelist(self):
+        """
+        `f90nml.Namelist` of groups, parsed on first access after an edit.
+        """
+        if self.parsed is None:
+            text = self.to_text().split(TABLES_MARKER, 1)[0]
+            self.parsed = f90nml.reads(text)
+        return self.parsed
+
+    def validate(self):
+        """
+        Parses edited content with `f90nml`, raising if no longer valid.
+        """
+        try:
+            return self.namelist
+        except Exception as e:
+            raise Exception(f"Prepin namelist is not valid: {e}") from e
+
+    def keys(self, group):
+        return list(self.group(group)["keys"])
+
+    def group(self, group):
+        group = group.lower()
+        if group not in self.groups:
+            raise Exception(f"Group `&{group}` not in {list(self.groups)}.")
+        return self.groups[group]
+
+    def get(self, group, key, default=None):
+        """
+        Typed value of assignment, i.e. `get("mesh", "px(2)")`.
+        """
+        span = self.group(group)["keys"].get(self.normalize_key(key))
+        if span is None:
+            return default
+
+        line_index, start, end = span
+        return self.parse_value(self.lines[line_index][start:end])
+
+    def set(self, group, key, value):
+        """
+        Sets value of assignment, adding it to the end of the group if not
+        yet assigned. Values replacing an assignment keep its type (`int`
+        values may replace `float` values).
+
+        @param group: Namelist group, e.g., "xput"
+        @param key: Variable with optional index, e.g., "tpltd(1)"
+        @param value: `bool`, `int`, `float` or `str` value.
+        """
+        entry = self.group(group)
+        key = self.normalize_key(key)
+        if key in IGNORED_KEYS:
+            raise Exception(f"`{key}` can not be set.")
+
+        text = self.format_value(value)
+
+        if key in entry["keys"]:
+            current = self.get(group, key)
+            if not self.compatible(current, value):
+                raise Exception(
+                    f"`&{group.lower()} {key}` expects {type(current).__name__}, "
+                    f"got {type(value).__name__} `{value}`."
+                )
+
+            line_index, start, end = entry["keys"][key]
+            line = self.lines[line_index]
+            self.lines[line_index] = line[:start] + text + line[end:]
+
+            # Spans following the value on the same line have shifted.
+            self.index_line(group.lower(), line_index)
+            self.parsed = None
+        else:
+            self.lines.insert(entry["end"], f"    {key}={text},")
+            self.index()
+
+    def update(self, overrides):
+        """
+        Sets values of nested dictionary of groups and keys.
+        ```
+        {"xput": {"tpltd(1)": 1e-5}, "mesh": {"size": 0.001}}
+        ```
+        """
+        for group, values in overrides.items():
+            for key, value in values.items():
+                self.set(group, key, value)
+
+        return self
+
+    def diff(self, other):
+        """
+        Assignments that differ from another prepin.
+
+        @param other: `SimulationNamelist` or prepin file content.
+        @return: Dictionary of `(value, other_value)` per key per group, with
+        `None` for keys missing on either side.
+        """
+        if isinstance(other, str):
+            other = SimulationNamelist(other)
+
+        differences = {}
+        for group in sorted(set(self.groups) | set(other.groups)):
+            keys = set(self.groups.get(group, {"keys": {}})["keys"])
+            other_keys = set(other.groups.get(group, {"keys": {}})["keys"])
+            for key in sorted(keys | other_keys):
+                value = self.get(group, key) if key in keys else None
+                other_value = other.get(group, key) if key in other_keys else None
+                if value != other_value:
+                    differences.setdefault(group, {})[key] = (value, other_value)
+
+        return differences
+
+    @staticmethod
+    def normalize_key(key):
+        """
+        Lowercase key without spaces, i.e. `tbct(1, 2)` -> `tbct(1,2)`.
+        """
+        return re.sub(r"\s+", "", key).lower()
+
+    @staticmethod
+    def compatible(current, value):
+        if isinstance(current, bool) or isinstance(value, bool):
+            return isinstance(current, bool) and isinstance(value, bool)
+        if isinstance(current, float):
+            return isinstance(value, (int, float))
+        return isinstance(value, type(current))
+
+    @staticmethod
+    def parse_value(text):
+        """
+        Python value of Fortran literal.
+        """
+        if text[0] in ["'", '"']:
+            return fpy.pystr(text)
+        if text.startswith("."):
+            return fpy.pybool(text)
+        try:
+            return int(text)
+        except ValueError:
+            return fpy.pyfloat(text)
+
+    @staticmethod
+    def format_value(value):
+        """
+        Fortran literal of Python value.
+        """
+        if isinstance(value, bool):
+            return ".true." if value else ".false."
+        if isinstance(value, int):
+            return str(int(value))
+        if isinstance(value, float):
+            return repr(float(value))
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        raise Exception(f"Unsupported namelist value `{value}`.")
@@ -1,5 +1,5 @@
-import copy
-import multiprocessing
+import contextlib
+import io
 import numpy as np
 import os
 import pandas as pd
@@ -11,7 +11,30 @@ from flow_3d import data
 from importlib.resources import files
 from tqdm import tqdm
 
+from flow_3d.simulation.manifest import SimulationStageManifest
+from flow_3d.simulation.results import DEFAULT_CACHE_SIZE, SimulationResults
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
+
+# Chunk names are padded with zeros to sort properly i.e. `00000001.txt`.
+FLSLNK_CHUNK_ZFILL = 8
+
+# Keys saved as `(z, y, x)` arrays within flslnk `.npz` files.
+FLSLNK_SCALAR_KEYS = [
+    "pressure",
+    "temperature",
+    "melt_region",
+    "temperature_gradient",
+    "liquid_label",
+    "fraction_of_fluid",
+]
+
+# Keys saved as `(z, y, x, 3)` arrays from their component columns.
+FLSLNK_VECTOR_KEYS = {
+    "dtdx_dtdy_dtdz": ["dtdx", "dtdy", "dtdz"],
+    "x_y_z": ["x", "y", "z"],
+    "vx_vy_vz": ["vx", "vy", "vz"],
+}
 
 
 class SimulationPostProcessing:
@@ -19,9 +42,17 @@ class SimulationPostProcessing:
     Run methods file for simulation class.
     """
 
+    @SimulationUtilsProfile.profile_stage("guipost")
     @SimulationUtilsDecorators.change_working_directory
     def guipost(
-        self, delete_output=True, delete_source=True, zip_output=True, **kwargs
+        self,
+        delete_output=True,
+        delete_source=True,
+        zip_output=True,
+        codec="deflated",
+        compresslevel=None,
+        overwrite=False,
+        **kwargs,
     ):
         """
         Creates and zips `flslnk.tmp` file.
@@ -29,10 +60,22 @@ class SimulationPostProcessing:
         @param simulation: Simulation
         @param delete_output: Deletes raw output `flsgrf.simulation` file -> True
         @param zip_output: Zips `flsgrf.simulation` file -> True
+        @param codec: Compression codec (i.e. "stored", "deflated", "zstd")
+        @param compresslevel: Compression level of codec
+        @param overwrite: Reruns even if `flslnk` stage is completed -> False
 
         @param working_dir: Sets working directory to `simulation.name`.
         """
 
+        manifest = SimulationStageManifest("flslnk")
+        flslnk_exists = os.path.exists("flslnk.tmp") or self.find_compressed_file(
+            "flslnk"
+        )
+        if manifest.completed and flslnk_exists and not overwrite:
+            print("`flslnk` stage already completed, skipping...")
+            return self
+        manifest.reset()
+
         # Create `flsinp.simulation` file for simulation.
         resource_file_path = os.path.join("simulation", "flsinp", "default.txt")
         resource = files(data).joinpath(resource_file_path)
@@ -56,9 +99,9 @@ class SimulationPostProcessing:
                 # Allows for post processing to actually work.
                 f.write(flsinp)
 
-        # Unzip flsgrf.zip file to flsgrf.simulation
+        # Unzip flsgrf.zip (or flsgrf.zst) file to flsgrf.simulation
         if not os.path.exists("flsgrf.simulation"):
-            self.unzip_file("flsgrf.zip", "flsgrf.simulation")
+            self.decompress_file("flsgrf", "flsgrf.simulation")
 
         # Run subprocess for creating flslnk.tmp file.
         print("Creating `flslnk.tmp` file...")
@@ -71,9 +114,15 @@ class SimulationPostProcessing:
         with open("guipost_returncode.txt", "a") as f:
             f.write(f"{process.returncode}")
 
+        if os.path.exists("flslnk.tmp"):
+            # Size and modified time only, hashing would read the output again.
+            manifest.record("flslnk.tmp", "flslnk.tmp", checksum=False)
+
         # Zip output files
         if zip_output:
-            self.zip_file("flslnk.tmp", "flslnk.zip")
+            self.compress_file(
+                "flslnk.tmp", "flslnk", codec=codec, compresslevel=compresslevel
+            )
 
         # Remove output file
         if delete_output:
@@ -85,9 +134,13 @@ class SimulationPostProcessing:
             print("Deleting `flsgrf.simulation` source...")
             os.remove("flsgrf.simulation")
 
+        if len(manifest.entries):
+            manifest.complete()
+
         return self
 
     # TODO: Does not necessary need to change working directory.
+    @SimulationUtilsProfile.profile_stage("chunk_flslnk")
     @SimulationUtilsDecorators.change_working_directory
     def chunk_flslnk(
         self,
@@ -95,46 +148,38 @@ class SimulationPostProcessing:
         delete_output=True,
         delete_source=True,
         zip_output=True,
+        overwrite=False,
         **kwargs,
     ):
+        """
+        Splits `flslnk.tmp` (or `flslnk.zip`) into a chunk `.txt` file per
+        timestep, skipping chunks already recorded within the stage manifest.
+
+        @param overwrite: Rewrites all chunks even if recorded -> False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        manifest = self.start_stage(chunk_dir_path, overwrite)
+        if manifest.completed:
+            return self
 
         # Create directory for chunks
         if not os.path.exists(chunk_dir_path):
             os.makedirs(chunk_dir_path)
 
-        chunk = []
-        chunk_index = 0
-
-        # Maximum number of zeros padded in front of chunk number
-        # i.e. 000000000001.txt
-        chunk_zfill = 12
-
         # Unzip flslnk.zip file to flslnk.tmp if not already done.
-        if not os.path.exists("flslnk.tmp") and os.path.exists("flslnk.zip"):
-            self.unzip_file("flslnk.zip", "flslnk.tmp")
+        if not os.path.exists("flslnk.tmp") and self.find_compressed_file("flslnk"):
+            self.decompress_file("flslnk", "flslnk.tmp")
 
         with open("flslnk.tmp", "r") as f:
-            for line in tqdm(f):
-                # Splits chunks based on empty line
-                if line.strip():
-                    chunk.append(line)
-                else:
-                    if len(chunk):
-                        # Fills in the remaining values with 0 to sort properly.
-                        # Accounts for up to 8 digit values.
-                        output_file = f"{chunk_index}.txt".zfill(chunk_zfill)
-                        output_path = os.path.join(chunk_dir_path, output_file)
-                        with open(output_path, "w") as out_f:
-                            out_f.writelines(chunk)
-                        chunk_index += 1
-                        chunk = []
-
-            # Write the last chunk
-            if chunk:
-                output_file = f"{chunk_index}.txt".zfill(chunk_zfill)
-                output_path = os.path.join(chunk_dir_path, output_file)
+            for chunk_index, chunk in enumerate(self.iter_flslnk_chunks(tqdm(f))):
+                chunk_name = self.flslnk_chunk_name(chunk_index)
+                output_path = os.path.join(chunk_dir_path, f"{chunk_name}.txt")
+                if manifest.is_recorded(chunk_name, output_path):
+                    continue
                 with open(output_path, "w") as out_f:
                     out_f.writelines(chunk)
+                manifest.record(chunk_name, output_path)
 
         if zip_output:
             print(f"Zipping `{chunk_dir_path}` folder...")
@@ -148,11 +193,182 @@ class SimulationPostProcessing:
             print("Deleting `flslnk.tmp` source...")
             os.remove("flslnk.tmp")
 
+        manifest.complete()
+
+        return self
+
+    @SimulationUtilsProfile.profile_stage("flslnk_to_npz")
+    @SimulationUtilsDecorators.change_working_directory
+    def flslnk_to_npz(
+        self,
+        npz_dir_path="flslnk_npz",
+        chunk_dir_path="flslnk_chunks",
+        save_chunks=False,
+        delete_output=True,
+        delete_source=True,
+        zip_output=True,
+        num_proc=1,
+        max_in_flight=None,
+        overwrite=False,
+        **kwargs,
+    ):
+        """
+        Streams `flslnk.tmp` (or `flslnk.zip`) and writes each timestep chunk
+        directly to `.npz` without writing intermediate chunk text files.
+
+        @param npz_dir_path: Output folder for `.npz` files -> "flslnk_npz"
+        @param chunk_dir_path: Output folder for chunk `.txt` files
+        @param save_chunks: Also writes and zips chunk `.txt` files -> False
+        @param delete_output: Deletes `npz_dir_path` folder after zipping -> True
+        @param delete_source: Deletes `flslnk.tmp` if it exists -> True
+        @param zip_output: Zips `npz_dir_path` folder -> True
+        @param num_proc: Number of processes to parse chunks with -> 1
+        @param max_in_flight: Pending chunk limit -> defaults to `2 * num_proc`
+        @param overwrite: Reprocesses all timesteps even if recorded -> False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        manifest = self.start_stage(npz_dir_path, overwrite)
+        if manifest.completed:
+            return self
+
+        if not os.path.exists(npz_dir_path):
+            os.makedirs(npz_dir_path)
+
+        if save_chunks and not os.path.exists(chunk_dir_path):
+            os.makedirs(chunk_dir_path)
+
+        def tasks(f):
+            # Chunks are yielded one behind so that the trailing chunk is
+            # skipped in the same way as `flslnk_chunk_to_npz`.
+            previous_chunk_index, previous_chunk = None, None
+
+            for chunk_index, chunk in enumerate(self.iter_flslnk_chunks(f)):
+                if save_chunks:
+                    output_file = f"{self.flslnk_chunk_name(chunk_index)}.txt"
+                    output_path = os.path.join(chunk_dir_path, output_file)
+                    with open(output_path, "w") as out_f:
+                        out_f.writelines(chunk)
+
+                # Skips 0th chunk with metadata
+                if previous_chunk_index:
+                    chunk_name = self.flslnk_chunk_name(previous_chunk_index)
+                    npz_file_path = os.path.join(npz_dir_path, chunk_name)
+                    if not manifest.is_recorded(chunk_name, f"{npz_file_path}.npz"):
+                        yield chunk_name, (previous_chunk, npz_file_path)
+
+                previous_chunk_index, previous_chunk = chunk_index, chunk
+
+        with self.open_flslnk() as f:
+            report = self.apply_bounded(
+                self.process_chunk,
+                tasks(f),
+                num_proc=num_proc,
+                max_in_flight=max_in_flight,
+                unit="chunk",
+                callback=self.record_npz(manifest, npz_dir_path),
+            )
+
+        if save_chunks:
+            print(f"Zipping `{chunk_dir_path}` folder...")
+            shutil.make_archive(chunk_dir_path, "zip", chunk_dir_path)
+            shutil.rmtree(chunk_dir_path)
+
+        if zip_output:
+            print(f"Zipping `{npz_dir_path}` folder...")
+            shutil.make_archive(npz_dir_path, "zip", npz_dir_path)
+
+        if delete_source and len(report["failed"]):
+            print("Keeping `flslnk.tmp` source for failed chunks")
+        elif delete_source and os.path.exists("flslnk.tmp"):
+            print("Deleting `flslnk.tmp` source...")
+            os.remove("flslnk.tmp")
+
+        if delete_output:
+            print(f"Deleting `{npz_dir_path}` output folder")
+            shutil.rmtree(npz_dir_path)
+
+        if not len(report["failed"]):
+            manifest.complete()
+
         return self
 
+    def start_stage(self, output_path, overwrite=False):
+        """
+        Loads manifest of stage writing the `output_path` folder. Manifests
+        are cleared with `overwrite` or if the stage outputs were removed,
+        otherwise the zipped outputs of a partial stage are unzipped so that
+        the stage resumes after the outputs already recorded.
+
+        @param output_path: Stage output folder, e.g., "flslnk_npz"
+        @param overwrite: Clears manifest to rerun stage from start -> False
+        """
+        manifest = SimulationStageManifest(output_path)
+        output_exists = os.path.isdir(output_path) or os.path.exists(
+            f"{output_path}.zip"
+        )
+
+        if overwrite or not output_exists:
+            manifest.reset()
+
+        if manifest.completed:
+            print(f"`{output_path}` stage already completed, skipping...")
+        elif len(manifest.entries):
+            print(f"Resuming `{output_path}` after {len(manifest.entries)} output(s)")
+            self.unzip_folder(f"{output_path}.zip", output_path)
+
+        return manifest
+
+    @staticmethod
+    def record_npz(manifest, npz_dir_path):
+        """
+        Callback recording each saved `.npz` file within stage manifest.
+        """
+
+        def callback(name, result):
+            manifest.record(name, os.path.join(npz_dir_path, f"{name}.npz"))
+
+        return callback
+
+    @contextlib.contextmanager
+    def open_flslnk(self, source="flslnk.tmp", name="flslnk"):
+        """
+        Opens `flslnk.tmp` as text, reading straight from `flslnk.zip` (or
+        `flslnk.zst`) when the unzipped file does not exist.
+        """
+        if os.path.exists(source):
+            with open(source, "r") as f:
+                yield f
+        else:
+            with self.open_compressed_file(name) as f:
+                yield io.TextIOWrapper(f)
+
+    @staticmethod
+    def iter_flslnk_chunks(lines):
+        """
+        Yields each chunk of lines from `flslnk.tmp` split on empty lines.
+        """
+        chunk = []
+        for line in lines:
+            if line.strip():
+                chunk.append(line)
+            elif len(chunk):
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def flslnk_chunk_name(chunk_index):
+        """
+        Fills in the chunk index with leading zeros so that files sort properly
+        i.e. `00000001`.
+        """
+        return f"{chunk_index}".zfill(FLSLNK_CHUNK_ZFILL)
+
     # TODO: Does not necessary need to change working directory.
-    # TODO: Make method that does this multiprocessing per chunk rather than by
-    # simulation
+    @SimulationUtilsProfile.profile_stage("flslnk_chunk_to_npz")
     @SimulationUtilsDecorators.change_working_directory
     def flslnk_chunk_to_npz(
         self,
@@ -162,8 +378,25 @@ class SimulationPostProcessing:
         delete_source=True,
         zip_output=True,
         num_proc=1,
+        max_in_flight=None,
+        overwrite=False,
         **kwargs,
     ):
+        """
+        Converts chunk `.txt` files into `.npz` files, per chunk across
+        `num_proc` processes. Chunks already recorded within the stage
+        manifest are skipped.
+
+        @param num_proc: Number of processes to use -> 1
+        @param max_in_flight: Pending chunk limit -> defaults to `2 * num_proc`
+        @param overwrite: Reprocesses all chunks even if recorded -> False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        manifest = self.start_stage(npz_dir_path, overwrite)
+        if manifest.completed:
+            return self
+
         # Unzip chunks
         self.unzip_folder(f"{chunk_dir_path}.zip", chunk_dir_path)
 
@@ -174,33 +407,27 @@ class SimulationPostProcessing:
 
         # Skips 0th chunk with metadata
         chunk_data_listdir = sorted(os.listdir(chunk_dir_path))[1:-1]
+        if manifest.total != len(chunk_data_listdir):
+            manifest.set_total(len(chunk_data_listdir))
 
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for chunk_file in tqdm(chunk_data_listdir):
-                    chunk_file_path = os.path.join(chunk_dir_path, chunk_file)
-                    chunk_file_name = chunk_file.split(".")[0]
-                    npz_file_path = os.path.join(npz_dir_path, chunk_file_name)
-                    self.process_chunk_file(chunk_file_path, npz_file_path)
-
-                    pool.apply_async(
-                        self.process_chunk_file,
-                        kwds={
-                            **kwargs,
-                            "chunk_dir_path": chunk_dir_path,
-                            "chunk_file": chunk_file,
-                        },
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for chunk_file in tqdm(chunk_data_listdir):
-                # Pulls column headers from the 9th line in each file
+        def tasks():
+            for chunk_file in chunk_data_listdir:
                 chunk_file_path = os.path.join(chunk_dir_path, chunk_file)
                 chunk_file_name = chunk_file.split(".")[0]
                 npz_file_path = os.path.join(npz_dir_path, chunk_file_name)
-                self.process_chunk_file(chunk_file_path, npz_file_path)
+                if manifest.is_recorded(chunk_file_name, f"{npz_file_path}.npz"):
+                    continue
+                yield chunk_file_name, (chunk_file_path, npz_file_path)
+
+        # Chunk files are read within each process rather than sent to it.
+        report = self.apply_bounded(
+            self.process_chunk_file,
+            tasks(),
+            num_proc=num_proc,
+            max_in_flight=max_in_flight,
+            unit="chunk",
+            callback=self.record_npz(manifest, npz_dir_path),
+        )
 
         # # Write chunks to txt file
         # for chunk_file in tqdm(chunk_data_listdir):
@@ -251,7 +478,9 @@ class SimulationPostProcessing:
             print(f"Zipping `{npz_dir_path}` folder...")
             shutil.make_archive(npz_dir_path, "zip", npz_dir_path)
 
-        if delete_source:
+        if delete_source and len(report["failed"]):
+            print(f"Keeping `{chunk_dir_path}` source folder for failed chunks")
+        elif delete_source:
             print(f"Deleting `{chunk_dir_path}` source folder")
             shutil.rmtree(chunk_dir_path)
 
@@ -259,9 +488,24 @@ class SimulationPostProcessing:
             print(f"Deleting `{npz_dir_path}` output folder")
             shutil.rmtree(npz_dir_path)
 
+        if not len(report["failed"]):
+            manifest.complete()
+
         return self
 
     def process_chunk_file(self, chunk_file_path, npz_file_path):
+        with open(chunk_file_path, "r") as f:
+            chunk = f.readlines()
+
+        self.process_chunk(chunk, npz_file_path)
+
+    def process_chunk(self, chunk, npz_file_path):
+        """
+        Parses lines of a single flslnk timestep chunk and saves as `.npz`.
+
+        @param chunk: List of lines from a chunk of `flslnk.tmp`
+        @param npz_file_path: Output `.npz` file path
+        """
         keys = {
             "p": "pressure",
             "tn": "temperature",
@@ -281,14 +525,12 @@ class SimulationPostProcessing:
         # Parses header text in values.
         #  printing tn, scl4 and nfs       t=5.52563142E-06  ix=2 to  127   jy=2 to  32  kz=2 to  33
         # 2        2      5.526E-06      5.526E-06        2      127        2       32        2       33
-        metadata_df = pd.read_csv(
-            chunk_file_path, skiprows=2, nrows=1, sep=r"\s+", header=None
-        )
+        metadata_df = pd.read_csv(io.StringIO(chunk[2]), sep=r"\s+", header=None)
         t_series = metadata_df.iloc[:, 3]
         t = float(t_series.iloc[0])
 
         # Load and annotate data
-        data_df = pd.read_csv(chunk_file_path, skiprows=3, sep=r"\s+", dtype=float)
+        data_df = pd.read_csv(io.StringIO("".join(chunk[3:])), sep=r"\s+", dtype=float)
         data_df["t"] = t
 
         data_renamed_df = data_df.rename(columns=keys)
@@ -304,112 +546,63 @@ class SimulationPostProcessing:
 
         np.savez_compressed(npz_file_path, **row_dict)
 
-    # TODO: Clean this up
-    # @staticmethod
-    def df_to_numpy(self, df):
-        dtdx_dtdy_dtdz_timestep = []
-        dtdx_dtdy_dtdz_z = []
-        dtdx_dtdy_dtdz_y = []
-
-        x_y_z_timestep = []
-        x_y_z_z = []
-        x_y_z_y = []
-
-        vx_vy_vz_timestep = []
-        vx_vy_vz_z = []
-        vx_vy_vz_y = []
-
-        keys = [
-            "pressure",
-            "temperature",
-            "melt_region",
-            "temperature_gradient",
-            "liquid_label",
-            "fraction_of_fluid",
-        ]
-
-        values = {
-            "timestep": [],
-            "z": [],
-            "y": [],
-        }
-
-        key_values = {}
-        for key in keys:
-            key_values[key] = copy.deepcopy(values)
-
-        prev_z = None
-        prev_y = None
-
-        for i in range(len(df)):
-            row = df.iloc[i]
-
-            z, y = row["z"], row["y"]
-
-            if y != prev_y and prev_y is not None:
-
-                dtdx_dtdy_dtdz_z.append(dtdx_dtdy_dtdz_y)
-                dtdx_dtdy_dtdz_y = []
-
-                x_y_z_z.append(x_y_z_y)
-                x_y_z_y = []
-
-                vx_vy_vz_z.append(vx_vy_vz_y)
-                vx_vy_vz_y = []
-
-                for key in keys:
-                    # print(key, key_values[key]["y"])
-                    key_values[key]["z"].append(key_values[key]["y"])
-                    key_values[key]["y"] = []
-
-            if z != prev_z and prev_z is not None:
-
-                dtdx_dtdy_dtdz_timestep.append(dtdx_dtdy_dtdz_z)
-                dtdx_dtdy_dtdz_z = []
-
-                x_y_z_timestep.append(x_y_z_z)
-                x_y_z_z = []
-
-                vx_vy_vz_timestep.append(vx_vy_vz_z)
-                vx_vy_vz_z = []
+    def load_results(
+        self,
+        npz_dir_path="flslnk_npz",
+        store_dir_path="flslnk_store",
+        cache_size=DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Lazy accessor of flslnk timesteps, i.e. `results[0]["temperature"]`.
+        Assumes that the working directory is the changed to the simulation.
 
-                for key in keys:
-                    # print(key, len(key_values[key]["z"]))
-                    key_values[key]["timestep"].append(key_values[key]["z"])
-                    key_values[key]["z"] = []
+        @param npz_dir_path: Folder (or `.zip`) of flslnk `.npz` files
+        @param store_dir_path: Folder of uncompressed flslnk store
+        @param cache_size: Maximum bytes of decoded arrays kept in memory
+        """
+        return SimulationResults(
+            npz_dir_path=npz_dir_path,
+            store_dir_path=store_dir_path,
+            cache_size=cache_size,
+        )
 
-            dtdx_dtdy_dtdz_y.append([row["dtdx"], row["dtdy"], row["dtdz"]])
-            x_y_z_y.append([row["x"], row["y"], row["z"]])
-            vx_vy_vz_y.append([row["vx"], row["vy"], row["vz"]])
+    @staticmethod
+    def df_to_numpy(df):
+        """
+        Reshapes columns of flslnk chunk dataframe into `(z, y, x)` arrays.
 
-            for key in keys:
-                key_values[key]["y"].append(row[key])
+        `guipost` writes rows with `x` varying fastest, then `y`, then `z` so
+        the grid shape is found from where `y` and `z` values change and each
+        column is reshaped in a single step.
 
-            prev_z = z
-            prev_y = y
+        @param df: Chunk dataframe with renamed columns (i.e. `temperature`)
+        @return: Single item lists of `(z, y, x)` arrays for scalar keys and
+        `(z, y, x, 3)` arrays for vector keys.
+        """
+        z = df["z"].to_numpy()
+        y = df["y"].to_numpy()
 
-        # Adds last value
-        dtdx_dtdy_dtdz_y.append([row["dtdx"], row["dtdy"], row["dtdz"]])
-        x_y_z_y.append([row["x"], row["y"], row["z"]])
-        vx_vy_vz_y.append([row["vx"], row["vy"], row["vz"]])
-        dtdx_dtdy_dtdz_z.append(dtdx_dtdy_dtdz_y)
+        # Number of rows within the first `z` plane.
+        z_changes = np.flatnonzero(z[1:] != z[:-1])
+        z_plane_length = z_changes[0] + 1 if len(z_changes) else len(z)
 
-        x_y_z_z.append(x_y_z_y)
-        vx_vy_vz_z.append(vx_vy_vz_y)
+        z_length = len(z_changes) + 1
+        y_length = np.count_nonzero(y[1:z_plane_length] != y[: z_plane_length - 1]) + 1
+        x_length = z_plane_length // y_length
+        shape = (z_length, y_length, x_length)
 
-        for key in keys:
-            key_values[key]["y"].append(row[key])
-            key_values[key]["z"].append(key_values[key]["y"])
+        if z_length * y_length * x_length != len(df):
+            raise Exception(f"{len(df)} rows do not fit (z, y, x) grid {shape}.")
 
+        # Last `z` plane is left out to match previously generated `.npz` files.
         timestep = {}
-        for key in keys:
-            timestep[key] = [np.array(key_values[key]["timestep"])]
+        for key in FLSLNK_SCALAR_KEYS:
+            timestep[key] = [df[key].to_numpy().reshape(shape)[:-1]]
 
-        other = {
-            "dtdx_dtdy_dtdz": [np.array(dtdx_dtdy_dtdz_timestep)],
-            "x_y_z": [np.array(x_y_z_timestep)],
-            "vx_vy_vz": [np.array(vx_vy_vz_timestep)],
-        }
+        other = {}
+        for key, columns in FLSLNK_VECTOR_KEYS.items():
+            values = np.stack([df[column].to_numpy() for column in columns], axis=-1)
+            other[key] = [values.reshape((*shape, len(columns)))[:-1]]
 
         return {
             **timestep,
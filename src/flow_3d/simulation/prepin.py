@@ -1,8 +1,11 @@
 import os
+import re
 import textwrap
 import warnings
 
 from flow_3d import data
+from flow_3d.simulation.namelist import SimulationNamelist
+from flow_3d.simulation.parameters import DEFAULT_PARAMETERS, SimulationParameters
 from importlib.resources import files
 
 # TODO: Move these constants to a better place
@@ -20,39 +23,120 @@ TEMPLATE_IDS = [
 DEFAULT_TEMPLATE_ID = "S31603"
 DEFAULT_TEMPLATE_ID_TYPE = "UNS"
 
+# Placeholders within prepin templates, i.e. `<MESH_SIZE>` for `mesh_size`.
+PLACEHOLDER_PATTERN = re.compile(r"<([A-Z][A-Z0-9_]*)>")
 
-class SimulationPrepin:
+# Templates compiled within this process, keyed by `(template_id_type,
+# template_id)`.
+PREPIN_TEMPLATES = {}
+
+
+class SimulationPrepinTemplate:
     """
-    Base class for creating prepin files given process parameters.
+    Prepin template parsed once into literal segments and the parameter of
+    each placeholder between them, so that rendering is a single join.
+    ```
+    "... DELZ=<MESH_SIZE>, ... POWER=<POWER>, ..."
+    -> segments: ["... DELZ=", ", ... POWER=", ", ..."]
+    -> keys: ["mesh_size", "power"]
+    ```
     """
 
+    def __init__(self, text, name="template"):
+        """
+        @param text: Template file content.
+        @param name: Template name used within errors.
+        """
+        self.name = name
+        self.segments = []
+        self.keys = []
+        self.offsets = []
+
+        start = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.segments.append(text[start : match.start()])
+            self.keys.append(match.group(1).lower())
+            self.offsets.append(match.start())
+            start = match.end()
+        self.segments.append(text[start:])
+
+        self.placeholders = set(self.keys)
+
+        unknown = self.placeholders - set(DEFAULT_PARAMETERS)
+        if unknown:
+            raise Exception(
+                f"Template {name} has unknown placeholders "
+                f"{sorted(f'<{key.upper()}>' for key in unknown)}."
+            )
+
     @staticmethod
-    def update_prepin_file_content(func):
+    def load(template_id_type, template_id):
+        """
+        Compiled template, read from package resources once per process.
         """
-        Decorator for updating prepin file content when process parameters have
-        changed.
+        if (template_id_type, template_id) in PREPIN_TEMPLATES:
+            return PREPIN_TEMPLATES[(template_id_type, template_id)]
+
+        # Load Template File
+        template_filename = f"{template_id_type}_{template_id}.txt"
 
-        @param func: Method where process parameters have changed within class.
+        if template_id_type in ["UNS"]:
+            # Use the 'material' template folder
+            template_file_path = os.path.join(
+                "simulation", "prepin", "material", template_filename
+            )
+            template_resource = files(data).joinpath(template_file_path)
+        else:
+            warnings.warn(f"Not yet supported")
+
+        if not template_resource.is_file():
+            raise Exception(f"Template {template_filename} does not exist.")
+
+        with template_resource.open() as file:
+            template = SimulationPrepinTemplate(file.read(), template_filename)
+
+        PREPIN_TEMPLATES[(template_id_type, template_id)] = template
+        return template
+
+    def render(self, values):
         """
+        Fills placeholders with values.
 
-        def wrapper(self, *args, **kwargs):
-            result = func(self, *args, **kwargs)
+        @param values: Dictionary of cgs value (or its text) per parameter.
+        @return: Prepin file text content.
+        """
+        unfilled = self.placeholders - set(values)
+        if unfilled:
+            raise Exception(
+                f"Template {self.name} placeholders "
+                f"{sorted(f'<{key.upper()}>' for key in unfilled)} are unfilled."
+            )
 
-            # Update self.prepin_file_content
-            if self.use_template:
-                self.build_from_template()
+        parts = [self.segments[0]]
+        for key, segment in zip(self.keys, self.segments[1:]):
+            parts.append(str(values[key]))
+            parts.append(segment)
 
-            return result
+        return "".join(parts)
 
-        return wrapper
+
+class SimulationPrepin:
+    """
+    Base class for creating prepin files given process parameters.
+    """
 
     def __init__(
         self,
         template_id=DEFAULT_TEMPLATE_ID,
         template_id_type=DEFAULT_TEMPLATE_ID_TYPE,
         use_template=True,  # Placeholder for future functionality.
+        prepin_overrides=None,
         **kwargs,
     ):
+        """
+        @param prepin_overrides: Namelist values (cgs) set on top of the
+        template, e.g., `{"xput": {"tpltd(1)": 1e-5}}` -> None
+        """
         # Check template id
         if template_id not in TEMPLATE_IDS:
             raise Exception(
@@ -79,36 +163,114 @@ class SimulationPrepin:
         self.template_id_type = template_id_type
         self.use_template = use_template
 
-        self.prepin_file_content = self.build_from_template()
+        self.prepin_overrides = prepin_overrides or {}
+
+        # Compiled here so that missing or invalid templates fail on creation.
+        SimulationPrepinTemplate.load(template_id_type, template_id)
+
+        if self.prepin_overrides:
+            self.build_from_template()
+
+    @property
+    def prepin_namelist(self):
+        """
+        `SimulationNamelist` of prepin file content.
+        """
+        return SimulationNamelist(self.prepin_file_content)
+
+    @property
+    def prepin_file_content(self):
+        """
+        Prepin file text content rendered from current process parameters,
+        left out of the pickled simulation.
+        """
+        return self.build_from_template()
 
     def build_from_template(self):
         """
         Create prepin file text content given template configurations.
         """
+        template = SimulationPrepinTemplate.load(
+            self.template_id_type, self.template_id
+        )
 
-        # Load Template File
-        template_filename = f"{self.template_id_type}_{self.template_id}.txt"
+        # Replaces values in template file with cgs parameter values.
+        values = {key: self.cgs(key) for key in template.placeholders}
+        if self.verbose:
+            for key, value in values.items():
+                print(f"Replacing <{key.upper()}> with {value}")
 
-        if self.template_id_type in ["UNS"]:
-            # Use the 'material' template folder
-            template_file_path = os.path.join(
-                "simulation", "prepin", "material", template_filename
-            )
-            template_resource = files(data).joinpath(template_file_path)
-        else:
-            warnings.warn(f"Not yet supported")
+        content = template.render(values)
 
-        if not template_resource.is_file():
-            raise Exception(f"Template {template_filename} does not exist.")
+        # Simulations pickled before overrides were added have none.
+        prepin_overrides = getattr(self, "prepin_overrides", {})
+        if prepin_overrides:
+            content = self.apply_prepin_overrides(content, prepin_overrides)
 
-        with template_resource.open() as file:
-            t = file.read()
+        return content
 
-        # Replaces values in template file with cgs parameter values.
-        for key in self.default_parameters.keys():
-            if self.verbose:
-                print(f"Replacing <{key.upper()}> with {str(self.cgs(key))}")
+    @staticmethod
+    def apply_prepin_overrides(content, prepin_overrides):
+        """
+        Sets namelist values of prepin file content.
+
+        @param content: Prepin file text content.
+        @param prepin_overrides: Dictionary of values per key per group.
+        @return: Prepin file text content.
+        """
+        namelist = SimulationNamelist(content).update(prepin_overrides)
+        namelist.validate()
+        return namelist.to_text()
 
-            t = t.replace(f"<{key.upper()}>", str(self.cgs(key)))
+    @staticmethod
+    def build_prepins(
+        parameters,
+        template_id=DEFAULT_TEMPLATE_ID,
+        template_id_type=DEFAULT_TEMPLATE_ID_TYPE,
+        prepin_overrides=None,
+    ):
+        """
+        Renders prepin file content for each set of process parameters
+        without creating simulations, i.e. for a sweep over a parameter grid.
+        ```
+        grid = [{"power": p, "velocity": v} for p in powers for v in velocities]
+        for content in SimulationPrepin.build_prepins(grid):
+            ...
+        ```
+
+        @param parameters: Iterable of dictionaries of process parameters
+        (mgs), unset parameters use their defaults.
+        @param template_id: Template id -> "S31603"
+        @param template_id_type: Template id type -> "UNS"
+        @param prepin_overrides: Namelist values (cgs) set within each prepin,
+        e.g., `{"xput": {"tpltd(1)": 1e-5}}` -> None
+        @return: Generator of prepin file text content.
+        """
+        template = SimulationPrepinTemplate.load(template_id_type, template_id)
+
+        # Placeholders left at their default only convert once.
+        defaults = {
+            key: str(SimulationParameters.cgs_value(key, DEFAULT_PARAMETERS[key]))
+            for key in template.placeholders
+        }
+
+        for overrides in parameters:
+            unknown = set(overrides) - set(DEFAULT_PARAMETERS)
+            if unknown:
+                raise Exception(
+                    f"Unknown process parameters {sorted(unknown)}, "
+                    f"expected any of {list(DEFAULT_PARAMETERS)}."
+                )
+
+            values = dict(defaults)
+            for key, value in overrides.items():
+                if key in template.placeholders:
+                    values[key] = SimulationParameters.cgs_value(key, value)
+
+            content = template.render(values)
+            if prepin_overrides:
+                content = SimulationPrepin.apply_prepin_overrides(
+                    content, prepin_overrides
+                )
 
-        return t
+            yield content
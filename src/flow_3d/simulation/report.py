@@ -0,0 +1,344 @@
+import json
+import os
+import re
+import time
+
+# Bytes read from the end of `report.simulation` for the final summary.
+REPORT_TAIL_BYTES = 8192
+
+# Units of output file sizes within report.
+REPORT_SIZE_UNITS = {
+    "b": 1,
+    "kb": 1024,
+    "mb": 1024**2,
+    "gb": 1024**3,
+    "tb": 1024**4,
+}
+
+# Float as written by the solver, i.e. `1.00001E-03`.
+FLOAT = r"[-+]?\d*\.?\d+(?:[EeDd][-+]?\d+)?"
+
+# Final summary lines of report.
+REPORT_SUMMARY_PATTERNS = {
+    "end": re.compile(
+        rf"end of calculation at\s+t\s*=\s*({FLOAT}),\s*cycle\s*=\s*(\d+)"
+    ),
+    "size": re.compile(r"(\S+) file size:\s*(" + FLOAT + r")\s*([kmgt]?b)", re.I),
+    "elapsed": re.compile(rf"elapsed time\s*=\s*({FLOAT})"),
+    "cpu": re.compile(rf"cpu time\s*=\s*({FLOAT})"),
+}
+
+# Progress lines of report and `runhyd` stdout, last match of each is kept.
+REPORT_PROGRESS_PATTERNS = {
+    "time": re.compile(rf"\bt\s*=\s*({FLOAT})"),
+    "cycle": re.compile(r"\bcycle\s*=\s*(\d+)"),
+    "timestep": re.compile(rf"\bdt\s*=\s*({FLOAT})"),
+    "elapsed": REPORT_SUMMARY_PATTERNS["elapsed"],
+    "cpu": REPORT_SUMMARY_PATTERNS["cpu"],
+}
+
+# Line written for each spatial output frame.
+REPORT_FRAME_PATTERN = re.compile(
+    rf"spatial data available at\s+t\s*=\s*({FLOAT})", re.I
+)
+
+# Performance record of run written within simulation folder.
+PERFORMANCE_FILENAME = "performance.json"
+
+# First `(wall clock, simulated time)` sample of run, written by `runhyd` at
+# solver start (or on first read), so that progress read from another
+# process has a rate for its ETA.
+PROGRESS_SAMPLE_FILENAME = "progress_sample.json"
+
+
+class SimulationReport:
+    """
+    Reads `report.simulation` written by the solver, i.e. the final summary.
+    ```
+    end of calculation at   t =    1.00001E-03,     cycle =   44577
+     normal completion
+
+    flsgrf.simulation file size:   29 gb
+
+    elapsed time =    5.67105E+03 seconds, or
+                      0 days :  1 hours : 34 minutes : 31 seconds
+
+        cpu time =    1.79030E+05 seconds
+    ```
+    """
+
+    @staticmethod
+    def read_summary(report_path, tail_bytes=REPORT_TAIL_BYTES):
+        """
+        Final summary of report, reading only its last bytes.
+
+        @param report_path: Path to `report.simulation`
+        @param tail_bytes: Bytes read from end of report -> 8192
+        @return: Dictionary of `time`, `cycle`, `elapsed`, `cpu`,
+        `output_bytes` and `completed`, `None` where not yet written.
+        """
+        with open(report_path, "rb") as f:
+            f.seek(max(os.path.getsize(report_path) - tail_bytes, 0))
+            tail = f.read().decode("utf-8", errors="replace")
+
+        return SimulationReport.parse_summary(tail)
+
+    @staticmethod
+    def parse_summary(text):
+        summary = {
+            "time": None,
+            "cycle": None,
+            "elapsed": None,
+            "cpu": None,
+            "output_file": None,
+            "output_bytes": None,
+            "completed": "normal completion" in text,
+        }
+
+        match = REPORT_SUMMARY_PATTERNS["end"].search(text)
+        if match:
+            summary["time"] = SimulationReport.parse_float(match.group(1))
+            summary["cycle"] = int(match.group(2))
+
+        match = REPORT_SUMMARY_PATTERNS["size"].search(text)
+        if match:
+            summary["output_file"] = match.group(1)
+            summary["output_bytes"] = int(
+                SimulationReport.parse_float(match.group(2))
+                * REPORT_SIZE_UNITS[match.group(3).lower()]
+            )
+
+        for key in ["elapsed", "cpu"]:
+            match = REPORT_SUMMARY_PATTERNS[key].search(text)
+            if match:
+                summary[key] = SimulationReport.parse_float(match.group(1))
+
+        return summary
+
+    @staticmethod
+    def parse_float(text):
+        return float(text.replace("D", "E").replace("d", "e"))
+
+    @staticmethod
+    def read_progress(
+        report_path, finish_time=None, tail_bytes=REPORT_TAIL_BYTES, sample_path=None
+    ):
+        """
+        Progress of run from the last bytes of report, i.e. for runs solved
+        by another process.
+
+        @param report_path: Path to `report.simulation`
+        @param finish_time: Simulation finish time (s) -> None
+        @param tail_bytes: Bytes read from end of report -> 8192
+        @param sample_path: `progress_sample.json` of first sample of run,
+        rate of ETA is taken from first sample to now -> None
+        @return: `SimulationReportFollower.progress` dictionary.
+        """
+        follower = SimulationReportFollower(report_path, finish_time=finish_time)
+        follower.offset = max(os.path.getsize(report_path) - tail_bytes, 0)
+        # First line is likely partial after seeking.
+        follower.skip_partial = follower.offset > 0
+
+        first = None
+        if sample_path is not None and os.path.exists(sample_path):
+            with open(sample_path, "r") as f:
+                first = tuple(json.load(f)["first"])
+            follower.first = first
+
+        follower.poll()
+
+        if sample_path is not None and follower.last is not None:
+            # Sample from a previous run is replaced once simulation restarted.
+            if first is None or first[1] > follower.last[1]:
+                follower.first = follower.last
+                SimulationReport.write_sample(sample_path, follower.first)
+
+        return follower.progress()
+
+    @staticmethod
+    def write_sample(sample_path, sample):
+        """
+        Writes first `(wall clock, simulated time)` sample of run.
+        """
+        with open(sample_path, "w") as f:
+            json.dump({"first": list(sample)}, f)
+
+
+class SimulationReportFollower:
+    """
+    Follows `report.simulation` (and `runhyd` stdout lines) as the solver
+    writes them, reading only bytes appended since the last poll.
+    ```
+    follower = SimulationReportFollower("report.simulation", finish_time=1e-3)
+    while running:
+        follower.poll()
+        follower.progress()  # {"time": 4.1e-4, "percent": 41.0, "eta": 3300.2, ...}
+    follower.record()        # final performance record
+    ```
+    """
+
+    def __init__(self, report_path, finish_time=None, output_path=None):
+        """
+        @param report_path: Path to `report.simulation`
+        @param finish_time: Simulation finish time (s), `twfin` -> None
+        @param output_path: Output file whose size is tracked -> None
+        """
+        self.report_path = report_path
+        self.finish_time = finish_time
+        self.output_path = output_path
+
+        self.offset = 0
+        self.buffer = b""
+        self.skip_partial = False
+        self.frame_time = None
+
+        self.state = {
+            "time": None,
+            "cycle": None,
+            "timestep": None,
+            "elapsed": None,
+            "cpu": None,
+            "frames": 0,
+            "output_file": None,
+            "output_bytes": None,
+            "completed": False,
+        }
+
+        # Wall clock and simulated time of first and last progress, for ETA.
+        self.start_wall = time.time()
+        self.first = None
+        self.last = None
+
+    def poll(self):
+        """
+        Parses lines appended to report since last poll.
+
+        @return: Number of bytes read.
+        """
+        if not os.path.exists(self.report_path):
+            return 0
+
+        size = os.path.getsize(self.report_path)
+        if size < self.offset:
+            # Report was rewritten, i.e. simulation restarted.
+            self.offset = 0
+            self.buffer = b""
+
+        if size == self.offset:
+            return 0
+
+        with open(self.report_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        lines = (self.buffer + data).split(b"\n")
+        # Last line is kept until completed by a later write.
+        self.buffer = lines.pop()
+        if self.skip_partial and len(lines):
+            lines = lines[1:]
+            self.skip_partial = False
+
+        # Sampled once per poll, as lines read together carry no timing.
+        for line in lines:
+            self.feed(line.decode("utf-8", errors="replace"), sample=False)
+        self.sample()
+
+        return len(data)
+
+    def feed(self, line, sample=True):
+        """
+        Parses line of report or `runhyd` stdout.
+
+        @param sample: Samples simulated time against wall clock -> True
+        """
+        # Frames counted once by time, as stdout and report both list them.
+        match = REPORT_FRAME_PATTERN.search(line)
+        if match:
+            frame_time = SimulationReport.parse_float(match.group(1))
+            if self.frame_time is None or frame_time > self.frame_time:
+                self.state["frames"] += 1
+                self.frame_time = frame_time
+
+        if "normal completion" in line:
+            self.state["completed"] = True
+
+        for key, pattern in REPORT_PROGRESS_PATTERNS.items():
+            match = pattern.search(line)
+            if match:
+                value = SimulationReport.parse_float(match.group(1))
+                self.state[key] = int(value) if key == "cycle" else value
+
+        match = REPORT_SUMMARY_PATTERNS["size"].search(line)
+        if match:
+            summary = SimulationReport.parse_summary(line)
+            self.state["output_file"] = summary["output_file"]
+            self.state["output_bytes"] = summary["output_bytes"]
+
+        if sample:
+            self.sample()
+
+    def sample(self):
+        if self.state["time"] is not None:
+            sample = (time.time(), self.state["time"])
+            if self.first is None:
+                self.first = sample
+            self.last = sample
+
+    def progress(self):
+        """
+        Latest values with `percent` of finish time and `eta` seconds.
+        """
+        progress = dict(self.state)
+
+        if self.output_path is not None and os.path.exists(self.output_path):
+            progress["output_bytes"] = os.path.getsize(self.output_path)
+
+        progress["percent"] = None
+        progress["eta"] = None
+        if self.finish_time and progress["time"] is not None:
+            progress["percent"] = min(100 * progress["time"] / self.finish_time, 100)
+            remaining = max(self.finish_time - progress["time"], 0)
+
+            # Rate of simulated time while followed, else over solver elapsed.
+            if (
+                self.first is not None
+                and self.last[1] > self.first[1]
+                and self.last[0] > self.first[0]
+            ):
+                rate = (self.last[1] - self.first[1]) / (self.last[0] - self.first[0])
+                progress["eta"] = remaining / rate
+            elif progress["elapsed"] and progress["time"] > 0:
+                progress["eta"] = remaining * progress["elapsed"] / progress["time"]
+
+        return progress
+
+    def record(self, **kwargs):
+        """
+        Performance record of run with throughput metrics.
+
+        @return: Dictionary of progress values, `wall` seconds followed,
+        `cycles_per_second`, `simulated_per_hour`, `mean_timestep` and
+        `cpu_utilization`, along with any passed keyword arguments.
+        """
+        record = {**kwargs, **self.progress(), "wall": time.time() - self.start_wall}
+
+        elapsed = record["elapsed"] or record["wall"]
+        record["cycles_per_second"] = (
+            record["cycle"] / elapsed if record["cycle"] and elapsed else None
+        )
+        record["simulated_per_hour"] = (
+            record["time"] * 3600 / elapsed if record["time"] and elapsed else None
+        )
+        record["mean_timestep"] = (
+            record["time"] / record["cycle"]
+            if record["time"] and record["cycle"]
+            else None
+        )
+        record["cpu_utilization"] = (
+            record["cpu"] / record["elapsed"]
+            if record["cpu"] and record["elapsed"]
+            else None
+        )
+
+        return record
@@ -0,0 +1,155 @@
+import io
+import numpy as np
+import os
+import zipfile
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from flow_3d.simulation.store import SimulationStore
+
+# Default limit of decoded arrays kept in memory (1 GiB).
+DEFAULT_CACHE_SIZE = 1024**3
+
+
+class SimulationResults:
+    """
+    Lazy accessor of flslnk timesteps, i.e. `results[0]["temperature"]`.
+
+    Reads from the uncompressed `flslnk_store` when built, otherwise from the
+    `flslnk_npz` folder or `flslnk_npz.zip`. Fields are only decoded on first
+    access and kept within a size bounded least recently used cache.
+    Values keep the single item list shape of the `.npz` files, i.e.
+    `results[0]["temperature"][0]` is the `(z, y, x)` array.
+    """
+
+    def __init__(
+        self,
+        npz_dir_path="flslnk_npz",
+        store_dir_path="flslnk_store",
+        cache_size=DEFAULT_CACHE_SIZE,
+    ):
+        """
+        @param npz_dir_path: Folder (or `.zip`) of flslnk `.npz` files
+        @param store_dir_path: Folder of uncompressed flslnk store
+        @param cache_size: Maximum bytes of decoded arrays kept in memory
+        """
+        self.npz_dir_path = os.path.abspath(npz_dir_path)
+        self.store_dir_path = os.path.abspath(store_dir_path)
+        self.cache_size = cache_size
+
+        self.manifest = SimulationStore.load_flslnk_store_manifest(self.store_dir_path)
+
+        if self.manifest is not None:
+            self.source = "store"
+            self.names = self.manifest["timesteps"]
+        else:
+            self.source = "npz" if os.path.isdir(self.npz_dir_path) else "zip"
+            self.names = SimulationStore.flslnk_npz_names(self.npz_dir_path)
+
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+
+        # Compressed bytes of last timestep read from `flslnk_npz.zip`.
+        self.zip_member = (None, None)
+
+    def __getstate__(self):
+        # Cache is left out so that results are cheap to send to processes.
+        state = self.__dict__.copy()
+        state["cache"] = OrderedDict()
+        state["cache_bytes"] = 0
+        state["zip_member"] = (None, None)
+        return state
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        for index in range(len(self.names)):
+            yield self[index]
+
+    def __getitem__(self, timestep):
+        """
+        @param timestep: Index or name (i.e. `00000001`) of timestep.
+        """
+        if isinstance(timestep, str):
+            index = self.names.index(timestep)
+        else:
+            index = range(len(self.names))[timestep]
+
+        return SimulationResultsTimestep(self, index)
+
+    def keys(self):
+        """
+        Field names available for each timestep.
+        """
+        if self.source == "store":
+            return list(self.manifest["fields"].keys())
+
+        with self.load_npz(0) as npz_data:
+            return list(npz_data.files)
+
+    def load_npz(self, index):
+        name = self.names[index]
+
+        if self.source == "npz":
+            return np.load(os.path.join(self.npz_dir_path, f"{name}.npz"))
+
+        # Reads timestep from `flslnk_npz.zip` without extracting the folder.
+        if self.zip_member[0] != index:
+            with zipfile.ZipFile(f"{self.npz_dir_path}.zip") as zip_ref:
+                npz_file = next(
+                    f
+                    for f in zip_ref.namelist()
+                    if os.path.basename(f) == f"{name}.npz"
+                )
+                self.zip_member = (index, zip_ref.read(npz_file))
+
+        return np.load(io.BytesIO(self.zip_member[1]))
+
+    def get(self, index, key):
+        """
+        Decoded field of timestep, loaded on first access.
+        """
+        # Memory mapped slices are only read when indexed, so not cached.
+        if self.source == "store":
+            field = SimulationStore.load_flslnk_store(key, self.store_dir_path)
+            return field[index : index + 1]
+
+        cache_key = (index, key)
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+            return self.cache[cache_key]
+
+        with self.load_npz(index) as npz_data:
+            value = npz_data[key]
+
+        self.cache[cache_key] = value
+        self.cache_bytes += value.nbytes
+
+        # Removes least recently used arrays until within cache size.
+        while self.cache_bytes > self.cache_size and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= evicted.nbytes
+
+        return value
+
+
+class SimulationResultsTimestep(Mapping):
+    """
+    Fields of a single timestep, decoded on access.
+    """
+
+    def __init__(self, results, index):
+        self.results = results
+        self.index = index
+        self.name = results.names[index]
+
+    def __getitem__(self, key):
+        return self.results.get(self.index, key)
+
+    def __iter__(self):
+        return iter(self.results.keys())
+
+    def __len__(self):
+        return len(self.results.keys())
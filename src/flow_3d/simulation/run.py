@@ -1,7 +1,22 @@
+import json
 import os
 import subprocess
+import time
 
+from tqdm import tqdm
+
+from flow_3d.simulation.report import (
+    PERFORMANCE_FILENAME,
+    PROGRESS_SAMPLE_FILENAME,
+    SimulationReport,
+    SimulationReportFollower,
+)
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
+
+
+# Seconds between reads of `report.simulation` while solver runs.
+REPORT_POLL_INTERVAL = 5.0
 
 
 class SimulationRun:
@@ -9,13 +24,23 @@ class SimulationRun:
     Run methods file for simulation class.
     """
 
+    @SimulationUtilsProfile.profile_stage("runhyd")
     @SimulationUtilsDecorators.change_working_directory
-    def runhyd(self, delete_output=True, zip_output=True, **kwargs):
+    def runhyd(
+        self,
+        delete_output=True,
+        zip_output=True,
+        codec="deflated",
+        compresslevel=None,
+        **kwargs,
+    ):
         """
         Open `runhyd` subprocess and zip output
 
         @param delete_output: Deletes raw output `flsgrf.simulation` file
         @param zip_output: Zips `flsgrf.simulation` file
+        @param codec: Compression codec (i.e. "stored", "deflated", "zstd")
+        @param compresslevel: Compression level of codec
 
         @param working_dir: Sets working directory to `simulation.name`.
         """
@@ -27,8 +52,22 @@ class SimulationRun:
             # success, skip or failure.
             return "skipped"
 
+        # Progress is parsed from stdout and appended report lines.
+        follower = SimulationReportFollower(
+            f"report.{self.filename}",
+            finish_time=self.simulation_finish_time,
+            output_path=f"flsgrf.{self.filename}",
+        )
+        progress = tqdm(total=100, desc=self.name, unit="%")
+
+        # Solver starts from `t = 0`, for ETA of progress read elsewhere.
+        SimulationReport.write_sample(
+            PROGRESS_SAMPLE_FILENAME, (follower.start_wall, 0.0)
+        )
+
         # Open Subprocess
         print(f"Running {self.name}...")
+        process = None
         try:
             with open("runhyd.txt", "w") as f:
                 process = subprocess.Popen(
@@ -38,8 +77,15 @@ class SimulationRun:
                     text=True,
                 )
 
+                polled = time.time()
                 for line in process.stdout:
                     f.write(line)
+                    follower.feed(line)
+
+                    if time.time() - polled > REPORT_POLL_INTERVAL:
+                        follower.poll()
+                        polled = time.time()
+                        self.update_run_progress(progress, follower.progress())
 
                 process.stdout.close()
                 process.wait()
@@ -48,12 +94,45 @@ class SimulationRun:
             print(f"Error running `runhyd` for simulation: {self.name}")
             return "error"
 
+        finally:
+            follower.poll()
+            self.update_run_progress(progress, follower.progress())
+            progress.close()
+
+            record = follower.record(
+                name=self.name,
+                returncode=process.returncode if process is not None else None,
+            )
+            with open(PERFORMANCE_FILENAME, "w") as file:
+                json.dump(record, file, indent=2)
+
         # Zip `flsgrf.simulation` File
         if zip_output:
-            self.zip_file(f"flsgrf.{self.filename}", "flsgrf.zip")
+            self.compress_file(
+                f"flsgrf.{self.filename}",
+                "flsgrf",
+                codec=codec,
+                compresslevel=compresslevel,
+            )
 
         # Remove Large File
         if delete_output:
             os.remove(f"flsgrf.{self.filename}")
 
         return "success"
+
+    @staticmethod
+    def update_run_progress(progress, run_progress):
+        if run_progress["percent"] is not None:
+            progress.n = round(run_progress["percent"], 1)
+        progress.set_postfix(
+            t=run_progress["time"],
+            cycle=run_progress["cycle"],
+            eta=(
+                f"{run_progress['eta'] / 60:.0f} min"
+                if run_progress["eta"] is not None
+                else None
+            ),
+            refresh=False,
+        )
+        progress.refresh()
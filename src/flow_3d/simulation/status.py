@@ -1,14 +1,29 @@
 import os
 
+from flow_3d.simulation.manifest import SimulationStageManifest
+from flow_3d.simulation.report import SimulationReport
+from flow_3d.simulation.utils.compression import SimulationUtilsCompression
+
+# Post processing stages with manifests, named after their outputs.
+POST_PROCESS_STAGES = {
+    "flslnk": "post_process_create_flslnk_completed",
+    "flslnk_chunks": "post_process_create_chunks_completed",
+    "flslnk_npz": "post_process_create_npz_completed",
+}
+
 
 class SimulationStatus:
     """
     Static methods for determining simulation status
     """
 
-    def check_status(self, simulation_dir_path):
+    @staticmethod
+    def check_status(simulation_dir_path):
         """
-        Provides status object of simulation.
+        Provides status object of simulation folder (without loading the
+        simulation, i.e. for the workspace index), with `progress` of each post
+        processing stage read from its manifest, i.e.
+        `{"flslnk_npz": {"completed": 120, "total": None, "done": False}}`.
         """
         # Check if simulation is done by reading `report.simulation`
         # Last lines of `report.simulation` should look something like this.
@@ -34,47 +49,45 @@ class SimulationStatus:
             "post_process_create_flslnk_completed": False,
             "post_process_create_chunks_completed": False,
             "post_process_create_npz_completed": False,
+            "progress": {},
         }
 
         # Check generated report file.
         report_file_path = os.path.join(simulation_dir_path, "report.simulation")
 
-        # if os.path.exists(report_file_path):
-
-        #     with open(report_file_path, "r") as f:
-        #         last_line = f.readlines()[-1].strip()
-
-        #     if "cpu time" in last_line.lower():
-        #         # Last line should be cpu time if simulation is completed
-        #         status["completed"] = True
+        # Only the end of the (multi MB) report is read.
+        if os.path.exists(report_file_path):
+            summary = SimulationReport.read_summary(report_file_path)
+            status["completed"] = summary["completed"] and summary["cpu"] is not None
 
         # Check execution times files to see if finished zipping flsgrf file.
         # execution_times_file_path = os.path.join(simulation_dir_path, "execution_times.txt")
-        chunks_dir_path = os.path.join(simulation_dir_path, "chunks")
-        chunks_zip_path = os.path.join(simulation_dir_path, "chunks.zip")
+        chunks_dir_path = os.path.join(simulation_dir_path, "flslnk_chunks")
+        chunks_zip_path = os.path.join(simulation_dir_path, "flslnk_chunks.zip")
 
-        npz_dir_path = os.path.join(simulation_dir_path, "npz")
-        npz_zip_path = os.path.join(simulation_dir_path, "npz.zip")
+        npz_dir_path = os.path.join(simulation_dir_path, "flslnk_npz")
+        npz_zip_path = os.path.join(simulation_dir_path, "flslnk_npz.zip")
 
         if os.path.exists(simulation_dir_path):
+            status["exists"] = True
 
             # with open(execution_times_file_path, "r") as f:
             #     execution_times = f.read()
 
             # flsgrf_file_path can exist during simulation
             # flsgrf_file_path = os.path.join(simulation_dir_path, "flsgrf.simulation")
-            flsgrf_zip_file_path = os.path.join(simulation_dir_path, "flsgrf.zip")
-            if os.path.exists(flsgrf_zip_file_path):
+            flsgrf_name = os.path.join(simulation_dir_path, "flsgrf")
+            if SimulationUtilsCompression.find_compressed_file(flsgrf_name):
                 # Indicates that job method for running simulation is done.
                 status["run_simulation_completed"] = True
 
             # Can't trust execution times.
             # if "post_process_create_flslnk" in execution_times:
             flslnk_tmp_file_path = os.path.join(simulation_dir_path, "flslnk.tmp")
-            flslnk_zip_file_path = os.path.join(simulation_dir_path, "flslnk.zip")
-            if os.path.exists(flslnk_tmp_file_path) or os.path.exists(
-                flslnk_zip_file_path
-            ):
+            flslnk_name = os.path.join(simulation_dir_path, "flslnk")
+            if os.path.exists(
+                flslnk_tmp_file_path
+            ) or SimulationUtilsCompression.find_compressed_file(flslnk_name):
                 # Indicates that flslnk file has been created.
                 status["post_process_create_flslnk_completed"] = True
 
@@ -90,4 +103,14 @@ class SimulationStatus:
                 # Indicates that npz from chuncks has been created.
                 status["post_process_create_npz_completed"] = True
 
+            # Manifests take precedence over file existence when written, as
+            # partially processed outputs also exist.
+            for stage, key in POST_PROCESS_STAGES.items():
+                manifest = SimulationStageManifest(
+                    os.path.join(simulation_dir_path, stage)
+                )
+                if manifest.exists:
+                    status[key] = manifest.completed
+                    status["progress"][stage] = manifest.progress()
+
         return status
@@ -0,0 +1,148 @@
+import io
+import json
+import numpy as np
+import os
+import shutil
+import zipfile
+
+from tqdm import tqdm
+
+from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+# Written last so that a store with a manifest is complete.
+STORE_MANIFEST_FILENAME = "manifest.json"
+
+
+class SimulationStore:
+    """
+    Methods for an uncompressed flslnk store with one `.npy` file per field
+    and a leading timestep axis, allowing single fields or slices to be read
+    with `np.load(mmap_mode="r")`.
+    ```
+    simulation/
+    ├─ flslnk_store/
+    │  ├─ manifest.json
+    │  ├─ temperature.npy     # (timestep, z, y, x)
+    │  ├─ x_y_z.npy           # (timestep, z, y, x, 3)
+    │  ├─ timestep.npy        # (timestep,)
+    ...
+    ```
+    """
+
+    @staticmethod
+    def flslnk_npz_names(npz_dir_path="flslnk_npz"):
+        """
+        Sorted timestep names (i.e. `00000001`) from the npz folder, or from
+        `{npz_dir_path}.zip` if the folder does not exist.
+        """
+        if os.path.isdir(npz_dir_path):
+            npz_files = os.listdir(npz_dir_path)
+        elif os.path.exists(f"{npz_dir_path}.zip"):
+            with zipfile.ZipFile(f"{npz_dir_path}.zip") as zip_ref:
+                npz_files = [os.path.basename(name) for name in zip_ref.namelist()]
+        else:
+            raise FileNotFoundError(f"`{npz_dir_path}` or `.zip` not found")
+
+        return sorted([f.split(".")[0] for f in npz_files if f.endswith(".npz")])
+
+    def iter_flslnk_npz(self, npz_dir_path="flslnk_npz"):
+        """
+        Yields `(name, npz_data)` for each timestep from the npz folder, or
+        straight from `{npz_dir_path}.zip` without extracting it.
+        """
+        if os.path.isdir(npz_dir_path):
+            for name in self.flslnk_npz_names(npz_dir_path):
+                yield name, np.load(os.path.join(npz_dir_path, f"{name}.npz"))
+        else:
+            for npz_file, f in self.iter_zip_folder(f"{npz_dir_path}.zip", ".npz"):
+                name = os.path.basename(npz_file).split(".")[0]
+                yield name, np.load(io.BytesIO(f.read()))
+
+    @SimulationUtilsDecorators.change_working_directory
+    def build_flslnk_store(
+        self,
+        npz_dir_path="flslnk_npz",
+        store_dir_path="flslnk_store",
+        delete_source=False,
+        **kwargs,
+    ):
+        """
+        Writes each field of the flslnk `.npz` files into a single uncompressed
+        `.npy` file with a leading timestep axis and a JSON manifest.
+
+        @param npz_dir_path: Folder (or `.zip`) of flslnk `.npz` files
+        @param store_dir_path: Output folder -> "flslnk_store"
+        @param delete_source: Deletes `npz_dir_path` folder after -> False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        names = self.flslnk_npz_names(npz_dir_path)
+
+        # Rebuilds from scratch so that an interrupted store has no manifest.
+        if os.path.isdir(store_dir_path):
+            shutil.rmtree(store_dir_path)
+        os.makedirs(store_dir_path)
+
+        fields = {}
+        for index, (name, npz_data) in tqdm(
+            enumerate(self.iter_flslnk_npz(npz_dir_path)), total=len(names)
+        ):
+            for key in npz_data.files:
+                # Values are saved as single item lists within `.npz` files.
+                value = npz_data[key][0]
+
+                if key not in fields:
+                    fields[key] = np.lib.format.open_memmap(
+                        os.path.join(store_dir_path, f"{key}.npy"),
+                        mode="w+",
+                        dtype=np.asarray(value).dtype,
+                        shape=(len(names), *np.shape(value)),
+                    )
+
+                fields[key][index] = value
+
+        manifest = {
+            "timesteps": names,
+            "fields": {},
+        }
+        for key, field in fields.items():
+            field.flush()
+            manifest["fields"][key] = {
+                "filename": f"{key}.npy",
+                "shape": list(field.shape),
+                "dtype": str(field.dtype),
+            }
+
+        manifest_path = os.path.join(store_dir_path, STORE_MANIFEST_FILENAME)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if delete_source and os.path.isdir(npz_dir_path):
+            print(f"Deleting `{npz_dir_path}` source folder")
+            shutil.rmtree(npz_dir_path)
+
+        return manifest
+
+    @staticmethod
+    def load_flslnk_store_manifest(store_dir_path="flslnk_store"):
+        """
+        Loads store manifest, returns `None` if store is missing or incomplete.
+        """
+        manifest_path = os.path.join(store_dir_path, STORE_MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def load_flslnk_store(key, store_dir_path="flslnk_store", mmap_mode="r"):
+        """
+        Memory maps a single field (i.e. `temperature`) of the store so that
+        only the slices indexed are read from disk.
+
+        @param key: Field name, e.g., "temperature"
+        @param mmap_mode: `np.load` memory map mode -> "r"
+        @return: Array with leading timestep axis, e.g., `(timestep, z, y, x)`
+        """
+        return np.load(os.path.join(store_dir_path, f"{key}.npy"), mmap_mode=mmap_mode)
@@ -1,8 +1,33 @@
+import contextlib
+import io
 import os
+import shutil
 import zipfile
 
 from tqdm import tqdm
 
+# Optional multi-threaded codec (`pip install FLOW-3D[compression]`).
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Codecs written within a `.zip` container.
+ZIP_CODECS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Codecs written as a single compressed stream with their own file extension.
+STREAM_CODECS = {
+    "zstd": "zst",
+}
+
+# Read size used when streaming between files (16 MiB).
+CHUNK_SIZE = 16 * 1024**2
+
 
 class SimulationUtilsCompression:
     """
@@ -26,13 +51,29 @@ class SimulationUtilsCompression:
                 raise FileNotFoundError(f"`{source}` source file not found")
 
     @staticmethod
-    def unzip_file(source, destination, chunk_size=1024**3):
+    def iter_zip_folder(source, suffix=None):
+        """
+        Yields `(name, file)` for each file of a zipped folder in sorted order
+        without extracting the folder to disk first.
+
+        @param source: Path to the zip file, e.g., "flslnk_npz.zip"
+        @param suffix: Only yields files ending with suffix, e.g., ".npz"
+        """
+        with zipfile.ZipFile(source, "r") as zip_ref:
+            for name in sorted(zip_ref.namelist()):
+                if name.endswith("/") or (suffix and not name.endswith(suffix)):
+                    continue
+                with zip_ref.open(name) as f:
+                    yield name, f
+
+    @staticmethod
+    def unzip_file(source, destination, chunk_size=CHUNK_SIZE):
         """
         Method for unzipping multiple files with the same name into one combined file.
 
         @param source: Path to the zip file, e.g., "flslnk.zip"
         @param destination: Path to the output file, e.g., "flsgrf.simulation"
-        @param chunk_size: Size of each chunk to read (defaults to 10 MB)
+        @param chunk_size: Size of each chunk to read (defaults to 16 MiB)
         """
         print(f"Unzipping `{source}` to `{destination}`...")
 
@@ -51,25 +92,145 @@ class SimulationUtilsCompression:
 
                     # Open each file inside the zip archive
                     with zip_ref.open(file_name) as source_file:
-                        # Initialize tqdm progress bar
-                        # with tqdm(total=uncompressed_size, unit="B", unit_scale=True, desc=f"Extracting {file_name}", position=0, leave=True) as pbar:
-                        while True:
-                            # Read a chunk of data from the source file
-                            chunk = source_file.read(chunk_size)
-                            if not chunk:
-                                break  # Stop when no more data is read
+                        shutil.copyfileobj(source_file, dest_file, chunk_size)
+
+        print(f"All matching files have been combined into `{destination}`.")
 
-                            # Append the chunk to the destination file
-                            dest_file.write(chunk)
+    @staticmethod
+    def zip_file(source, destination, codec="deflated", compresslevel=None):
+        """
+        Zips a single file with one of `ZIP_CODECS`.
+
+        @param source: Path to the file, e.g., "flslnk.tmp"
+        @param destination: Path to the zip file, e.g., "flslnk.zip"
+        @param codec: One of `ZIP_CODECS` -> "deflated"
+        @param compresslevel: Codec compression level, (i.e. 1 for fastest zlib)
+        """
+        print(f"Zipping `{source}` file to `{destination}` ({codec})...")
+        if codec not in ZIP_CODECS:
+            raise Exception(f"'{codec}' is not one of `{list(ZIP_CODECS)}`.")
 
-                            # Update the progress bar
-                            # pbar.update(len(chunk))
+        with zipfile.ZipFile(
+            destination, "w", ZIP_CODECS[codec], compresslevel=compresslevel
+        ) as zip:
+            zip.write(source)
 
-        print(f"All matching files have been combined into `{destination}`.")
+    @staticmethod
+    def compressed_file_path(name, codec="deflated"):
+        """
+        Path of compressed file for `name` (i.e. "flsgrf") written with codec.
+        """
+        if codec in STREAM_CODECS:
+            return f"{name}.{STREAM_CODECS[codec]}"
+        return f"{name}.zip"
+
+    @staticmethod
+    def find_compressed_file(name):
+        """
+        Existing compressed file path for `name` (i.e. "flsgrf") or `None`.
+        """
+        for extension in ["zip", *STREAM_CODECS.values()]:
+            if os.path.exists(f"{name}.{extension}"):
+                return f"{name}.{extension}"
+        return None
+
+    def compress_file(
+        self, source, name, codec="deflated", compresslevel=None, num_threads=-1
+    ):
+        """
+        Compresses a single file with the selected codec.
+
+        @param source: Path to the file, e.g., "flsgrf.simulation"
+        @param name: Compressed file path without extension, e.g., "flsgrf"
+        @param codec: One of `ZIP_CODECS` or `STREAM_CODECS` -> "deflated"
+        @param compresslevel: Codec compression level
+        @param num_threads: Threads for "zstd" codec -> -1 (all cores)
+        @return: Path of compressed file, e.g., "flsgrf.zip"
+        """
+        destination = self.compressed_file_path(name, codec)
+
+        if codec == "zstd":
+            if zstandard is None:
+                raise ImportError(
+                    "`zstd` codec requires `zstandard`, "
+                    "install with `pip install FLOW-3D[compression]`."
+                )
+
+            print(f"Compressing `{source}` file to `{destination}` ({codec})...")
+            compressor = zstandard.ZstdCompressor(
+                level=compresslevel if compresslevel is not None else 3,
+                threads=num_threads,
+            )
+            with open(source, "rb") as src, open(destination, "wb") as dest:
+                compressor.copy_stream(src, dest, read_size=CHUNK_SIZE)
+        else:
+            self.zip_file(source, destination, codec, compresslevel)
+
+        return destination
 
     @staticmethod
-    def zip_file(source, destination):
-        print(f"Zipping `{source}` file to `{destination}`...")
-        zip = zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED)
-        zip.write(source)
-        zip.close()
+    @contextlib.contextmanager
+    def open_compressed_file(name):
+        """
+        Opens compressed file for `name` (i.e. "flslnk") as a binary stream
+        without extracting it to disk. Members of `.zip` files are read one
+        after another as a single combined file.
+
+        @param name: Compressed file path without extension, e.g., "flslnk"
+        """
+        if os.path.exists(f"{name}.zip"):
+            with zipfile.ZipFile(f"{name}.zip") as zip_ref:
+                members = [zip_ref.open(member) for member in zip_ref.namelist()]
+                try:
+                    yield io.BufferedReader(ZipMembersReader(members), CHUNK_SIZE)
+                finally:
+                    for member in members:
+                        member.close()
+
+        elif os.path.exists(f"{name}.zst"):
+            if zstandard is None:
+                raise ImportError(
+                    f"Reading `{name}.zst` requires `zstandard`, "
+                    "install with `pip install FLOW-3D[compression]`."
+                )
+            with open(f"{name}.zst", "rb") as f:
+                reader = zstandard.ZstdDecompressor().stream_reader(f)
+                with io.BufferedReader(reader, CHUNK_SIZE) as stream:
+                    yield stream
+
+        else:
+            raise FileNotFoundError(f"Compressed file for `{name}` not found")
+
+    def decompress_file(self, name, destination, chunk_size=CHUNK_SIZE):
+        """
+        Decompresses compressed file for `name` into `destination`.
+
+        @param name: Compressed file path without extension, e.g., "flsgrf"
+        @param destination: Path to the output file, e.g., "flsgrf.simulation"
+        """
+        print(f"Decompressing `{name}` to `{destination}`...")
+        with (
+            self.open_compressed_file(name) as src,
+            open(destination, "wb") as dest,
+        ):
+            shutil.copyfileobj(src, dest, chunk_size)
+
+
+class ZipMembersReader(io.RawIOBase):
+    """
+    Reads opened zip members one after another as a single stream.
+    """
+
+    def __init__(self, members):
+        self.members = list(members)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self.members:
+            size = self.members[0].readinto(buffer)
+            if size:
+                return size
+            self.members.pop(0)
+        return 0
@@ -1,5 +1,4 @@
 import numpy as np
-import os
 
 
 class SimulationUtilsMesh:
@@ -15,16 +14,10 @@ class SimulationUtilsMesh:
         indicating the equivalent distance of each voxel (tick) in cm.
         """
 
-        # Unzip npz files if not already unzipped
-        self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
+        results = self.load_results(npz_dir_path=npz_dir_path)
 
-        npz_files = os.listdir(npz_dir_path)
-
-        if len(npz_files):
-            first_npz_filename = npz_files[0]
-
-            row_dict = np.load(f"{npz_dir_path}/{first_npz_filename}")
-            mesh_x_y_z = row_dict["x_y_z"][0]
+        if len(results):
+            mesh_x_y_z = results[0]["x_y_z"][0]
             mesh_x_y_z_shape = np.array(mesh_x_y_z).shape
 
             mesh_z_length = mesh_x_y_z_shape[0]
@@ -1,6 +1,11 @@
 import logging
+import multiprocessing
+import threading
+import time
 import traceback
 
+from tqdm import tqdm
+
 
 class SimulationUtilsMultiprocessing:
     """
@@ -14,3 +19,98 @@ class SimulationUtilsMultiprocessing:
         """
         logging.error(e)
         logging.error(traceback.format_exc())
+
+    @staticmethod
+    def apply_bounded(
+        func, tasks, num_proc=1, max_in_flight=None, unit="task", callback=None
+    ):
+        """
+        Applies `func` to each `(name, args)` task across a process pool.
+        At most `max_in_flight` tasks are pending at once so that tasks
+        generated from a stream are not all held in memory.
+
+        @param func: Picklable callable run for each task.
+        @param tasks: Iterable of `(name, args)` tuples.
+        @param num_proc: Number of processes, runs in process if `1`.
+        @param max_in_flight: Pending task limit -> defaults to `2 * num_proc`
+        @param unit: Label used for progress and throughput output.
+        @param callback: Called with `(name, result)` within this process after
+        each task succeeds, i.e. to record finished tasks.
+        @return: Dictionary of `completed` names, `failed` names to errors,
+        `elapsed` seconds and `throughput` tasks per second.
+        """
+        completed = []
+        failed = {}
+        start_time = time.perf_counter()
+
+        progress = tqdm(unit=unit)
+
+        def succeed(name, result):
+            try:
+                if callback is not None:
+                    callback(name, result)
+                completed.append(name)
+            except Exception:
+                failed[name] = traceback.format_exc()
+
+        if num_proc > 1:
+            if max_in_flight is None:
+                max_in_flight = 2 * num_proc
+
+            semaphore = threading.Semaphore(max_in_flight)
+            lock = threading.Lock()
+
+            def callbacks(name):
+                def on_success(result):
+                    with lock:
+                        succeed(name, result)
+                        progress.update()
+                    semaphore.release()
+
+                def on_error(e):
+                    with lock:
+                        failed[name] = "".join(traceback.format_exception(e))
+                        progress.update()
+                    semaphore.release()
+
+                return on_success, on_error
+
+            with multiprocessing.Pool(processes=num_proc) as pool:
+                for name, args in tasks:
+                    semaphore.acquire()
+                    on_success, on_error = callbacks(name)
+                    pool.apply_async(
+                        func, args=args, callback=on_success, error_callback=on_error
+                    )
+                pool.close()
+                pool.join()
+
+        else:
+            for name, args in tasks:
+                try:
+                    result = func(*args)
+                except Exception:
+                    failed[name] = traceback.format_exc()
+                else:
+                    succeed(name, result)
+                progress.update()
+
+        progress.close()
+
+        elapsed = time.perf_counter() - start_time
+        count = len(completed) + len(failed)
+        throughput = count / elapsed if elapsed > 0 else 0.0
+
+        print(
+            f"Processed {count} {unit}(s) in {elapsed:.2f} s "
+            f"({throughput:.2f} {unit}/s) with {len(failed)} failure(s)."
+        )
+        for name, error in sorted(failed.items()):
+            logging.error(f"`{name}` failed:\n{error}")
+
+        return {
+            "completed": sorted(completed),
+            "failed": failed,
+            "elapsed": elapsed,
+            "throughput": throughput,
+        }
@@ -0,0 +1,181 @@
+import functools
+import json
+import os
+import socket
+import sys
+import time
+
+# Unix only, usage other than wall time is left as `None` elsewhere.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Environment variable set to the profile log path (i.e. by
+# `manage.py --profile`), inherited by solver and worker processes.
+PROFILE_ENV = "FLOW_3D_PROFILE"
+
+# Profile log written within the workspace folder.
+PROFILE_FILENAME = "profile.jsonl"
+
+# `ru_maxrss` is in kilobytes on Linux and bytes on macOS.
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# Writing `5` resets the peak RSS (`VmHWM`) of the process (Linux only), so
+# that reused pool and scheduler workers report the peak of each stage.
+CLEAR_REFS_PATH = "/proc/self/clear_refs"
+STATUS_PATH = "/proc/self/status"
+
+# Peak RSS of profiled stages running within this process, innermost last,
+# so that stages within stages carry their peak to the outer stage.
+PROFILE_PEAKS = []
+
+
+class SimulationUtilsProfile:
+    """
+    Records wall time, CPU time, peak RSS and bytes read and written of each
+    simulation stage (i.e. `guipost`) as a line within the profile log.
+    ```
+    {"name": "0100_1.0_...", "stage": "guipost", "status": "success",
+     "wall": 812.4, "cpu_user": 640.1, "cpu_system": 95.3,
+     "peak_rss": 2147483648, "read_bytes": 96636764160, ...}
+    ```
+    CPU time and bytes include solver subprocesses and pool workers that
+    finished within the stage. Peak RSS is the high water mark of the
+    process within the stage (reset at stage start, Linux only), or of its
+    largest child if that grew within the stage, `None` where unknown.
+    """
+
+    @staticmethod
+    def profile_stage(stage):
+        """
+        Decorator recording usage of method when `FLOW_3D_PROFILE` is set.
+
+        @param stage: Stage name, e.g., "guipost"
+        """
+
+        def decorator(func):
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                profile_path = os.environ.get(PROFILE_ENV)
+                if not profile_path:
+                    return func(self, *args, **kwargs)
+
+                PROFILE_PEAKS.append(SimulationUtilsProfile.profile_reset_peak())
+                start_usage = SimulationUtilsProfile.profile_usage()
+                status = "error"
+                try:
+                    output = func(self, *args, **kwargs)
+                    status = "success"
+                    return output
+                finally:
+                    SimulationUtilsProfile.profile_record(
+                        profile_path, self.name, stage, status, start_usage
+                    )
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def profile_reset_peak():
+        """
+        Resets peak RSS of process, `0` if reset else `None`.
+        """
+        try:
+            with open(CLEAR_REFS_PATH, "w") as f:
+                f.write("5")
+            return 0
+        except OSError:
+            return None
+
+    @staticmethod
+    def profile_peak_rss():
+        """
+        Peak RSS (bytes) of process since last reset from `VmHWM`.
+        """
+        with open(STATUS_PATH, "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+        return None
+
+    @staticmethod
+    def profile_usage():
+        """
+        Snapshot of usage counters of this process and its waited children.
+        """
+        usage = {
+            "time": time.time(),
+            "wall": time.perf_counter(),
+            "cpu_user": None,
+            "cpu_system": None,
+            "children_rss": None,
+            "read_bytes": None,
+            "write_bytes": None,
+        }
+
+        if resource is not None:
+            usage["cpu_user"], usage["cpu_system"] = 0.0, 0.0
+            for who in [resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN]:
+                rusage = resource.getrusage(who)
+                usage["cpu_user"] += rusage.ru_utime
+                usage["cpu_system"] += rusage.ru_stime
+
+            # Largest peak of any waited child over the process lifetime.
+            children = resource.getrusage(resource.RUSAGE_CHILDREN)
+            usage["children_rss"] = children.ru_maxrss * MAXRSS_UNIT
+
+        # Bytes passed through `read` and `write` calls (Linux only).
+        if os.path.exists("/proc/self/io"):
+            with open("/proc/self/io", "r") as f:
+                io = dict(line.split(": ") for line in f.read().splitlines())
+            usage["read_bytes"] = int(io["rchar"])
+            usage["write_bytes"] = int(io["wchar"])
+
+        return usage
+
+    @staticmethod
+    def profile_record(profile_path, name, stage, status, start_usage):
+        """
+        Appends usage of stage since `start_usage` to profile log.
+        """
+        end_usage = SimulationUtilsProfile.profile_usage()
+
+        # Peak of process since reset at stage start and of stages within.
+        peak_rss = PROFILE_PEAKS.pop() if len(PROFILE_PEAKS) else None
+        if peak_rss is not None:
+            peak_rss = max(peak_rss, SimulationUtilsProfile.profile_peak_rss() or 0)
+
+        # Lifetime peak of children only belongs to stage when it grew.
+        if (
+            end_usage["children_rss"] is not None
+            and end_usage["children_rss"] > start_usage["children_rss"]
+        ):
+            peak_rss = max(peak_rss or 0, end_usage["children_rss"])
+
+        if len(PROFILE_PEAKS) and PROFILE_PEAKS[-1] is not None:
+            PROFILE_PEAKS[-1] = max(PROFILE_PEAKS[-1], peak_rss or 0)
+
+        record = {
+            "name": name,
+            "stage": stage,
+            "status": status,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "start": start_usage["time"],
+            "end": end_usage["time"],
+            "wall": end_usage["wall"] - start_usage["wall"],
+            "peak_rss": peak_rss,
+        }
+
+        for key in ["cpu_user", "cpu_system", "read_bytes", "write_bytes"]:
+            if end_usage[key] is None:
+                record[key] = None
+            else:
+                record[key] = end_usage[key] - start_usage[key]
+
+        # Single append per line so that processes do not interleave lines.
+        with open(profile_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
@@ -1,10 +1,8 @@
-import multiprocessing
 import numpy as np
 import os
 
-from tqdm import tqdm
-
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
 
 # TODO: Handle with class (maybe parameters)
 COLUMNS_CONFIG = {
@@ -24,6 +22,23 @@ COLUMNS_CONFIG = {
     "liquid_label": {"cmap": "viridis", "clim": [0, 100], "title": "Liquid Label"},
 }
 
+# Mesh axis each cross section view is sliced along.
+VIEW_AXES = {
+    "cross_section_xy": "z",
+    "cross_section_xz": "y",
+    "cross_section_yz": "x",
+}
+
+# Default slice position of each cross section view.
+DEFAULT_SLICES = {
+    "cross_section_xy": "top_of_fluid",
+    "cross_section_xz": "midpoint",
+    "cross_section_yz": "midpoint",
+}
+
+# Distance (m) behind and ahead of laser kept by `beam_window` view.
+BEAM_WINDOW = (5e-4, 2e-4)  # 500 µm, 200 µm
+
 
 class SimulationView:
     """
@@ -67,129 +82,213 @@ class SimulationView:
         if not os.path.exists(f"mesh_x_y_z.npz") or regenerate_mesh_x_y_z:
             self.generate_mesh_x_y_z(npz_dir_path=npz_dir_path)
 
+    @SimulationUtilsProfile.profile_stage("views")
     @SimulationUtilsDecorators.change_working_directory
     def generate_views(
         self,
         views=["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
         npz_dir_path="flslnk_npz",
         num_proc=1,
+        slices=None,
+        beam_window=BEAM_WINDOW,
         **kwargs,
     ):
         """
-        Generates the `.npz` files for a specific view (i.e. `cross_section_x`)
-        for all simulation timesteps.
+        Generates the `.npz` files of each view (i.e. `cross_section_xz`) for
+        all simulation timesteps. Each timestep is loaded once and every view
+        is written from it in the same pass.
+
+        `cross_section_yz` follows the laser with `{"cross_section_yz": "beam"}`
+        and the `beam_window` view saves a cropped window of each column
+        around the laser, moving along with it.
+
+        @param views: Views to generate for each timestep.
+        @param slices: Slice position per cross section view, overriding
+        `DEFAULT_SLICES`, e.g., {"cross_section_xz": 10, "cross_section_yz": 0.1}
+        @param beam_window: Distance (m) behind and ahead of laser -> BEAM_WINDOW
+        @param num_proc: Number of processes to use -> 1
         """
 
-        for view in views:
+        results = self.load_results(npz_dir_path=npz_dir_path)
 
-            # View method for visualization.
-            view_method = getattr(self, f"view_{view}")
-
-            # TODO: Add checks
-            if num_proc > 1:
-                with multiprocessing.Pool(processes=num_proc) as pool:
-
-                    for index, npz_file in tqdm(
-                        enumerate(sorted(os.listdir(npz_dir_path)))
-                    ):
-                        npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                        example = {key: npz_data[key] for key in npz_data.keys()}
-                        pool.apply_async(
-                            view_method,
-                            args=(example, index),
-                            error_callback=self.error_callback,
-                        )
-                    pool.close()
-                    pool.join()
+        # Slice indices are found once from the mesh rather than per timestep.
+        view_slices = self.view_slice_indices(views, slices, beam_window)
 
-            else:
-                for index, npz_file in tqdm(
-                    enumerate(sorted(os.listdir(npz_dir_path)))
-                ):
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
-                    view_method(example, index)
+        def tasks():
+            for index, example in enumerate(results):
+                yield example.name, (example, index, views, view_slices)
 
-    def view_cross_section_xz(self, example, index):
+        # Timesteps are sent lazily and only decode the fields used within
+        # each process.
+        self.apply_bounded(
+            self.view_timestep, tasks(), num_proc=num_proc, unit="timestep"
+        )
+
+    def view_slice_indices(self, views, slices=None, beam_window=BEAM_WINDOW):
         """
-        Generates the cross_section along the x axis, cut with xz plane, using y
-        axis midpoint. Assumes that the working directory is the changed to the
-        simulation
+        Mesh index of slice for each cross section view, or "beam" for slices
+        following the laser. Includes `beam` lookup (see `beam_lookup`) when
+        a view follows the laser.
+
+        @param slices: Slice position per view, overriding `DEFAULT_SLICES`
+        @param beam_window: Distance (m) behind and ahead of laser
         """
         mesh_x_y_z = np.load("mesh_x_y_z.npz")
-        mesh_y = mesh_x_y_z["y"]
-        midpoint = len(mesh_y) // 2
+        positions = {**DEFAULT_SLICES, **(slices or {})}
 
-        for key, configs in COLUMNS_CONFIG.items():
-            values = np.array(example[key][0])
+        view_slices = {}
+        for view in views:
+            if view in VIEW_AXES and positions[view] == "beam":
+                if VIEW_AXES[view] != "x":
+                    raise Exception(f"`{view}` can not follow laser along x axis.")
+                view_slices[view] = "beam"
+            elif view in VIEW_AXES:
+                mesh = mesh_x_y_z[VIEW_AXES[view]]
+                view_slices[view] = self.slice_index(positions[view], mesh)
 
-            cropped_array = self.crop_3d_array(values, crop_y=(midpoint, midpoint + 1))
+        if "beam_window" in views or "beam" in view_slices.values():
+            view_slices["beam"] = self.beam_lookup(mesh_x_y_z["x"], beam_window)
 
-            index_string = f"{index}".zfill(4)
-            rotated_array = cropped_array.squeeze()[::-1, ::-1]
+        return view_slices
 
-            np.savez_compressed(
-                f"views/cross_section_xz/{key}/{index_string}.npz", data=rotated_array
-            )
+    def beam_lookup(self, mesh_x, beam_window=BEAM_WINDOW):
+        """
+        Values needed to find laser position within mesh for any timestep.
 
-    def view_cross_section_yz(self, example, index):
+        @param mesh_x: Coordinates of mesh x axis (cm).
+        @param beam_window: Distance (m) behind and ahead of laser
         """
-        Generates the cross_section along the y axis, cut with the yz plane,
-        using x axis midpoint. Assumes that the working directory is the
-        changed to the simulation
+        return {
+            "mesh_x": [float(x) for x in mesh_x],
+            "velocity": float(self.velocity),
+            "laser_start_x": self.cgs("beam_x"),
+            "window": [distance * 100 for distance in beam_window],
+        }
+
+    def beam_indices(self, timestep, beam):
         """
-        mesh_x_y_z = np.load("mesh_x_y_z.npz")
-        mesh_x = mesh_x_y_z["x"]
+        Mesh x index of laser and the `[start, end)` indices of the window
+        around it at timestep.
 
-        midpoint = len(mesh_x) // 2
-
-        for key, configs in COLUMNS_CONFIG.items():
-            cropped_array = self.crop_3d_array(
-                np.array(example[key][0]), crop_x=(midpoint, midpoint + 1)
-            )
+        @param timestep: Simulation time (s)
+        @param beam: Lookup from `beam_lookup`
+        """
+        mesh_x = beam["mesh_x"]
+        x = self.x_distance(timestep, beam["velocity"], beam["laser_start_x"])
+        behind, ahead = beam["window"]
 
-            index_string = f"{index}".zfill(4)
-            rotated_array = cropped_array.squeeze()[::-1, ::-1]
+        return (
+            self.find_index(x, mesh_x),
+            self.find_index(x - behind, mesh_x),
+            self.find_index(x + ahead, mesh_x) + 1,
+        )
 
-            np.savez_compressed(
-                f"views/cross_section_yz/{key}/{index_string}.npz", data=rotated_array
-            )
+    def slice_index(self, position, mesh):
+        """
+        Index within mesh axis for slice position.
 
-    def view_cross_section_xy(self, example, index):
+        @param position: "midpoint", "top_of_fluid", an index (int) or a
+        distance along the mesh axis (float in cm, i.e. `mesh_x_y_z.npz`).
+        @param mesh: Coordinates of mesh axis (cm).
         """
-        Generates the cross_section along the x axis, cut with the xy plane,
-        from `fluid_region_z_end`.
-        Assumes that the working directory is the changed to the simulation
+        if position == "midpoint":
+            return len(mesh) // 2
+        elif position == "top_of_fluid":
+            return int(self.fluid_region_z_end // self.mesh_size) - 1
+        elif isinstance(position, (int, np.integer)):
+            if not -len(mesh) <= position < len(mesh):
+                raise Exception(f"Slice index {position} outside of {len(mesh)}.")
+            return int(position) % len(mesh)
+        elif isinstance(position, (float, np.floating)):
+            return self.find_index(position, list(mesh))
+        else:
+            raise Exception(f"Invalid slice position `{position}`.")
+
+    def view_timestep(self, example, index, views, view_slices):
         """
-        top_of_fluid = int(self.fluid_region_z_end // self.mesh_size) - 1
-
-        for key, configs in COLUMNS_CONFIG.items():
-            values = np.array(example[key][0])
-            # print(f"values.shape: {values.shape}")
-            cropped_array = self.crop_3d_array(
-                values, crop_z=(top_of_fluid, top_of_fluid + 1)
-            )
-            # print(f"cropped_array.shape: {cropped_array.shape}")
+        Writes every view of a single timestep, loading each column once.
+        Fields are sliced before being copied, so that memory mapped store
+        fields only read the slices of each view from disk.
+        Assumes that the working directory is the changed to the simulation.
+        """
+        values = {}
+        for key in COLUMNS_CONFIG.keys():
+            if key == "temperature" or any(view != "isometric" for view in views):
+                values[key] = example[key][0]
 
-            index_string = f"{index}".zfill(4)
-            rotated_array = cropped_array.squeeze()[::-1, ::-1]
+        index_string = f"{index}".zfill(4)
 
-            np.savez_compressed(
-                f"views/cross_section_xy/{key}/{index_string}.npz", data=rotated_array
+        if "beam" in view_slices:
+            timestep = float(example["timestep"][0])
+            beam_index, window_start, window_end = self.beam_indices(
+                timestep, view_slices["beam"]
             )
 
-    def view_isometric(self, example, index, **kwargs):
+        for view in views:
+            if view == "isometric":
+                # Transpose to match voxel orientation
+                mesh = np.transpose(np.array(values["temperature"]), (2, 1, 0))
+                np.savez_compressed(
+                    f"views/isometric/temperature/{index_string}.npz", data=mesh
+                )
+                continue
+
+            if view == "beam_window":
+                # Window keeps its x offset so that it can be placed in mesh.
+                for key in COLUMNS_CONFIG.keys():
+                    window = np.array(
+                        self.crop_3d_array(
+                            values[key], crop_x=(window_start, window_end)
+                        )
+                    )
+                    np.savez_compressed(
+                        f"views/beam_window/{key}/{index_string}.npz",
+                        data=window,
+                        x_start=window_start,
+                        x_index=beam_index,
+                    )
+                continue
 
-        for key, configs in COLUMNS_CONFIG.items():
-            if key == "temperature":
+            slice_index = view_slices[view]
+            if slice_index == "beam":
+                slice_index = beam_index
 
-                values = np.array(example[key][0])
-                mesh = np.transpose(
-                    values, (2, 1, 0)
-                )  # Transpose to match voxel orientation
+            crop = {f"crop_{VIEW_AXES[view]}": (slice_index, slice_index + 1)}
 
-                index_string = f"{index}".zfill(4)
+            for key in COLUMNS_CONFIG.keys():
+                cropped_array = np.array(self.crop_3d_array(values[key], **crop))
+                rotated_array = cropped_array.squeeze()[::-1, ::-1]
 
                 np.savez_compressed(
-                    f"views/isometric/{key}/{index_string}.npz", data=mesh
+                    f"views/{view}/{key}/{index_string}.npz", data=rotated_array
                 )
+
+    def view_cross_section_xz(self, example, index):
+        """
+        Generates the cross_section along the x axis, cut with xz plane, using y
+        axis midpoint. Assumes that the working directory is the changed to the
+        simulation
+        """
+        views = ["cross_section_xz"]
+        self.view_timestep(example, index, views, self.view_slice_indices(views))
+
+    def view_cross_section_yz(self, example, index):
+        """
+        Generates the cross_section along the y axis, cut with the yz plane,
+        using x axis midpoint. Assumes that the working directory is the
+        changed to the simulation
+        """
+        views = ["cross_section_yz"]
+        self.view_timestep(example, index, views, self.view_slice_indices(views))
+
+    def view_cross_section_xy(self, example, index):
+        """
+        Generates the cross_section along the x axis, cut with the xy plane,
+        from `fluid_region_z_end`.
+        Assumes that the working directory is the changed to the simulation
+        """
+        views = ["cross_section_xy"]
+        self.view_timestep(example, index, views, self.view_slice_indices(views))
+
+    def view_isometric(self, example, index, **kwargs):
+        self.view_timestep(example, index, ["isometric"], {})
@@ -1,14 +1,16 @@
 import imageio
-import matplotlib.pyplot as plt
-import multiprocessing
 import numpy as np
 import os
 
-from matplotlib.colors import Normalize
-from matplotlib.cm import get_cmap, ScalarMappable
 from tqdm import tqdm
 
+from flow_3d.simulation.encoder import SimulationFrameEncoder
+from flow_3d.simulation.frames import (
+    SimulationFrameRenderer,
+    SimulationIsometricRenderer,
+)
 from flow_3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow_3d.simulation.utils.profile import SimulationUtilsProfile
 
 # TODO: Handle with class (maybe parameters)
 COLUMNS_CONFIG = {
@@ -70,14 +72,34 @@ class SimulationVisualizations:
             self.generate_mesh_x_y_z(npz_dir_path=npz_dir_path)
 
     # TODO: Consider renaming this to `generate_view_visualizations`.
+    @SimulationUtilsProfile.profile_stage("visualizations")
     @SimulationUtilsDecorators.change_working_directory
     def generate_views_visualizations(
         self,
         views=["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
         npz_dir_path="flslnk_npz",
         num_proc=1,
+        fps=10,
+        save_frames=False,
+        animation_format="gif",
+        codec=None,
+        quality=None,
+        encoder_process=False,
         **kwargs,
     ):
+        """
+        Compiles views into `visualizations/{view}/{key}.{animation_format}`
+        animations. Frames are rendered straight from view arrays and appended
+        to an open encoder as they are produced.
+
+        @param num_proc: Number of processes rendering isometric frames -> 1
+        @param fps: Frames per second of animations -> 10
+        @param save_frames: Also saves each frame as `.png` -> False
+        @param animation_format: "gif", "mp4" or "webm" -> "gif"
+        @param codec: ffmpeg codec of "mp4" or "webm" -> `ANIMATION_FORMATS`
+        @param quality: ffmpeg quality from 0 to 10 -> None
+        @param encoder_process: Encodes within a separate process -> False
+        """
         print(
             f"""\n
 ################################################################################
@@ -85,63 +107,139 @@ Visualize Views: `{self.name}`
 ################################################################################
 """
         )
+        results = self.load_results(npz_dir_path=npz_dir_path)
+
+        encoder_kwargs = {
+            "fps": fps,
+            "codec": codec,
+            "quality": quality,
+            "in_process": not encoder_process,
+        }
+
         for view in views:
+            view_folder = f"visualizations/{view}"
 
-            # View method for visualization.
-            if view in ["cross_section_xy", "cross_section_xz", "cross_section_yz"]:
-                view_method = getattr(self, f"view_visualization_cross_section")
-            else:
-                view_method = getattr(self, f"view_visualization_isometric")
-
-            # TODO: Add checks
-            if num_proc > 1:
-                with multiprocessing.Pool(processes=num_proc) as pool:
-
-                    for index, npz_file in tqdm(
-                        enumerate(sorted(os.listdir(npz_dir_path)))
-                    ):
-                        npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                        example = {key: npz_data[key] for key in npz_data.keys()}
-                        pool.apply_async(
-                            view_method,
-                            args=(view, example, index),
-                            error_callback=self.error_callback,
-                        )
-                    pool.close()
-                    pool.join()
+            if view != "isometric":
+                self.render_view_frames(
+                    view,
+                    results,
+                    save_frames=save_frames,
+                    animation_format=animation_format,
+                    **encoder_kwargs,
+                )
+                continue
+
+            # Strips of renderer are drawn once and sent along with each task.
+            configs = COLUMNS_CONFIG["temperature"]
+            renderer = SimulationIsometricRenderer(
+                configs["cmap"], configs["clim"], label="temperature"
+            )
+
+            def tasks():
+                for index, example in enumerate(results):
+                    yield example.name, (view, example, index, renderer, save_frames)
+
+            encoder = None
+            pending = {}
+            next_index = 0
+
+            def append(frame):
+                nonlocal encoder
+                if frame is None:
+                    return
+                if encoder is None:
+                    encoder = SimulationFrameEncoder(
+                        f"{view_folder}/temperature.{animation_format}",
+                        **encoder_kwargs,
+                    )
+                encoder.append(frame)
+
+            # Frames finish out of order across processes and are held until
+            # the frames before them are appended.
+            def callback(name, frame):
+                nonlocal next_index
+                pending[results.names.index(name)] = frame
+                while next_index in pending:
+                    append(pending.pop(next_index))
+                    next_index += 1
+
+            try:
+                self.apply_bounded(
+                    self.view_visualization_isometric,
+                    tasks(),
+                    num_proc=num_proc,
+                    unit="timestep",
+                    callback=callback,
+                )
+
+                # Frames held behind failed timesteps.
+                for index in sorted(pending):
+                    append(pending.pop(index))
+            finally:
+                if encoder is not None:
+                    encoder.close()
+
+    def render_view_frames(
+        self,
+        view,
+        results,
+        fps=10,
+        save_frames=False,
+        animation_format="gif",
+        **kwargs,
+    ):
+        """
+        Renders frames of 2D view (i.e. `cross_section_xy`) with fixed `clim`
+        and streams them into `visualizations/{view}/{key}.{animation_format}`.
+        Assumes that the working directory is the changed to the simulation.
+
+        @param results: `SimulationResults` of simulation.
+        @param fps: Frames per second of animations -> 10
+        @param save_frames: Also saves each frame as `.png` -> False
+        @param animation_format: "gif", "mp4" or "webm" -> "gif"
+        @param kwargs: `SimulationFrameEncoder` options, i.e. `codec`.
+        """
+        view_folder = f"visualizations/{view}"
 
-            else:
-                for index, npz_file in tqdm(
-                    enumerate(sorted(os.listdir(npz_dir_path)))
-                ):
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
-                    view_method(view, example, index)
+        for key, configs in tqdm(COLUMNS_CONFIG.items()):
+            renderer = SimulationFrameRenderer(
+                configs["cmap"], configs["clim"], label=key
+            )
 
-            print("Compiling images to `.gif`...")
+            encoder = None
+            try:
+                for index, example in enumerate(results):
+                    index_string = f"{index}".zfill(4)
 
-            view_folder = f"visualizations/{view}"
-            column_folders = sorted(os.listdir(f"{view_folder}"))
-
-            # Iterates through column folders within images
-            # i.e. "pressure", "temperature", "fraction_of_fluid", etc.
-            for column_folder in tqdm(column_folders):
-                column_folder_path = f"{view_folder}/{column_folder}"
-
-                if os.path.isdir(column_folder_path):
-                    frames = []
-                    for image_file in sorted(os.listdir(column_folder_path)):
-                        image = imageio.imread(f"{column_folder_path}/{image_file}")
-                        frames.append(image)
-
-                    # Only compile .gif for folders with images.
-                    if len(frames) > 0:
-                        imageio.mimsave(
-                            f"{view_folder}/{column_folder}.gif", frames, fps=10, loop=0
+                    view_file = f"views/{view}/{key}/{index_string}.npz"
+                    if not os.path.exists(view_file):
+                        continue
+
+                    with np.load(view_file) as view_data:
+                        data = view_data["data"]
+
+                    power, velocity = example["power"][0], example["velocity"][0]
+                    title = f"{configs['title']} ({power} W, {velocity} m/s)"
+                    frame = renderer.render(data, title)
+
+                    if save_frames:
+                        imageio.imwrite(
+                            f"{view_folder}/{key}/{index_string}.png", frame
+                        )
+
+                    # Only compile animation for keys with views.
+                    if encoder is None:
+                        encoder = SimulationFrameEncoder(
+                            f"{view_folder}/{key}.{animation_format}",
+                            fps=fps,
+                            **kwargs,
                         )
+                    encoder.append(frame)
+            finally:
+                if encoder is not None:
+                    encoder.close()
 
     # TODO: Include more information in visualization
-    # TODO: Make colorbar consistent throughout frames.
     def view_visualization_cross_section(self, view, example, index):
         """
         Generates visualization of 2D cross section view.
@@ -153,86 +251,53 @@ Visualize Views: `{self.name}`
 
             view_file = f"views/{view}/{key}/{index_string}.npz"
             if os.path.exists(view_file):
-                view_data = np.load(view_file)
-
-                plt.figure()
-                plt.imshow(view_data["data"], cmap=configs["cmap"])
-                plt.title(f"{configs['title']} ({power} W, {velocity} m/s)")
-                plt.colorbar()
-                plt.savefig(f"visualizations/{view}/{key}/{index_string}.png")
-                plt.close()
-
-    def view_visualization_isometric(self, view, example, index, **kwargs):
-        for key, configs in COLUMNS_CONFIG.items():
-            if key == "temperature":
-                power, velocity = example["power"][0], example["velocity"][0]
-                title = f"{configs['title']} ({power} W, {velocity} m/s)"
-
-                # Prepare the grid data for plotting
-                values = np.array(example[key][0])
-                mesh = np.transpose(
-                    values, (2, 1, 0)
-                )  # Transpose to match voxel orientation
-
-                index_string = f"{index}".zfill(4)
-
-                view_file = f"views/{view}/{key}/{index_string}.npz"
-                if os.path.exists(view_file):
-                    view_data = np.load(view_file)
+                with np.load(view_file) as view_data:
                     data = view_data["data"]
 
-                    threshold = configs["clim"][0]
-                    voxels = (
-                        data > threshold
-                    )  # Apply threshold to create a binary voxel structure
-
-                    norm = Normalize(vmin=configs["clim"][0], vmax=configs["clim"][1])
-                    cmap = get_cmap(configs["cmap"])
-
-                    normalized_colors = cmap(norm(mesh))
-
-                    # Plot using Matplotlib's voxels
-                    fig = plt.figure(figsize=(10, 10))
-                    ax = fig.add_subplot(projection="3d")
-                    ax.voxels(
-                        voxels,
-                        facecolors=normalized_colors,
-                        edgecolors=np.clip(2 * normalized_colors - 0.5, 0, 1),
-                        linewidth=0.5,
-                    )
+                renderer = SimulationFrameRenderer(
+                    configs["cmap"], configs["clim"], label=key
+                )
+                title = f"{configs['title']} ({power} W, {velocity} m/s)"
+                imageio.imwrite(
+                    f"visualizations/{view}/{key}/{index_string}.png",
+                    renderer.render(data, title),
+                )
 
-                    x_dim, y_dim, z_dim = voxels.shape  # Dimensions of the voxel grid
+    def view_visualization_isometric(
+        self, view, example, index, renderer=None, save_frames=True, **kwargs
+    ):
+        """
+        Renders isometric frame of the thresholded temperature surface from
+        the `(x, y, z)` isometric view.
+        Assumes that the working directory is the changed to the simulation.
 
-                    ax.set_xlim([0, x_dim])
-                    ax.set_ylim([0, y_dim])
-                    ax.set_zlim([0, z_dim])
+        @param renderer: `SimulationIsometricRenderer` shared across timesteps.
+        @param save_frames: Saves frame as `.png` -> True
+        @return: RGB frame, `None` if view is missing.
+        """
+        configs = COLUMNS_CONFIG["temperature"]
+        power, velocity = example["power"][0], example["velocity"][0]
+        title = f"{configs['title']} ({power} W, {velocity} m/s)"
 
-                    # Set tick markers every 10 units
-                    ax.set_xticks(np.arange(0, x_dim + 1, 10))
-                    ax.set_yticks(np.arange(0, y_dim + 1, 10))
-                    ax.set_zticks(np.arange(0, z_dim + 1, 10))
+        index_string = f"{index}".zfill(4)
 
-                    ax.set(xlabel="X", ylabel="Y", zlabel="Z")
-                    ax.set_title(title)
+        view_file = f"views/{view}/temperature/{index_string}.npz"
+        if not os.path.exists(view_file):
+            return None
 
-                    # Calculate the maximum extent for equal aspect ratio
-                    max_extent = max(x_dim, y_dim, z_dim)
+        with np.load(view_file) as view_data:
+            data = view_data["data"]
 
-                    # Center and scale each axis to have equal aspect ratio
-                    ax.set_box_aspect(
-                        (x_dim / max_extent, y_dim / max_extent, z_dim / max_extent)
-                    )
-                    # ax.set_aspect('auto')
+        if renderer is None:
+            renderer = SimulationIsometricRenderer(
+                configs["cmap"], configs["clim"], label="temperature"
+            )
 
-                    # Add color bar
-                    # Create a ScalarMappable to use with the color bar
-                    mappable = ScalarMappable(norm=norm, cmap=cmap)
-                    mappable.set_array([])  # This line is necessary to avoid errors
+        frame = renderer.render(data, title)
 
-                    # Add the color bar to the figure
-                    cbar = fig.colorbar(mappable, ax=ax, shrink=0.5, aspect=10)
-                    cbar.set_label(key)
+        if save_frames:
+            imageio.imwrite(
+                f"visualizations/isometric/temperature/{index_string}.png", frame
+            )
 
-                    # Save or display each plot
-                    plt.savefig(f"visualizations/isometric/{key}/{index_string}.png")
-                    plt.close(fig)
+        return frame
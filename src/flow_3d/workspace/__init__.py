@@ -1,5 +1,9 @@
 from .base import WorkspaceBase
+from .cost import WorkspaceCost
+from .executor import WorkspaceExecutor
 from .huggingface import WorkspaceHuggingFace
+from .index import WorkspaceIndex
+from .profile import WorkspaceProfile
 from .simulation.base import WorkspaceSimulationBase
 from .simulation.clear import WorkspaceSimulationClear
 from .simulation.build import WorkspaceSimulationBuild
@@ -7,6 +11,7 @@ from .simulation.huggingface import WorkspaceSimulationHuggingFace
 from .simulation.measure import WorkspaceSimulationMeasure
 from .simulation.post import WorkspaceSimulationPost
 from .simulation.run import WorkspaceSimulationRun
+from .simulation.sweep import WorkspaceSimulationSweep
 from .simulation.view import WorkspaceSimulationView
 from .simulation.visualize import WorkspaceSimulationVisualize
 from .utils import WorkspaceUtils
@@ -14,7 +19,11 @@ from .utils import WorkspaceUtils
 
 class Workspace(
     WorkspaceBase,
+    WorkspaceCost,
+    WorkspaceExecutor,
     WorkspaceHuggingFace,
+    WorkspaceIndex,
+    WorkspaceProfile,
     WorkspaceSimulationBase,
     WorkspaceSimulationClear,
     WorkspaceSimulationBuild,
@@ -22,6 +31,7 @@ class Workspace(
     WorkspaceSimulationMeasure,
     WorkspaceSimulationPost,
     WorkspaceSimulationRun,
+    WorkspaceSimulationSweep,
     WorkspaceSimulationView,
     WorkspaceSimulationVisualize,
     WorkspaceUtils,
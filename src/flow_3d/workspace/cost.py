@@ -0,0 +1,95 @@
+import json
+import os
+
+from flow_3d.simulation.cost import DEFAULT_COST_COEFFICIENTS, SimulationCost
+from flow_3d.workspace.utils import WorkspaceUtils
+
+# Calibrated coefficients written within the workspace folder.
+COST_MODEL_FILENAME = "cost_model.json"
+
+
+class WorkspaceCost:
+    """
+    Calibrates the simulation cost model against completed runs of the
+    workspace and estimates runtime and output size of simulations.
+    """
+
+    @property
+    def cost_model_path(self):
+        return os.path.join(self.workspace_path, COST_MODEL_FILENAME)
+
+    def load_cost_coefficients(self):
+        """
+        Calibrated coefficients, `DEFAULT_COST_COEFFICIENTS` if not calibrated.
+        """
+        if not os.path.exists(self.cost_model_path):
+            return dict(DEFAULT_COST_COEFFICIENTS)
+
+        with open(self.cost_model_path, "r") as f:
+            return {**DEFAULT_COST_COEFFICIENTS, **json.load(f)["coefficients"]}
+
+    @WorkspaceUtils.with_simulations
+    def cost_calibrate(self, **kwargs):
+        """
+        Fits cost model to `report.simulation` of completed runs and saves
+        coefficients to `cost_model.json`.
+
+        @return: Dictionary of `coefficients` and `observed` runs.
+        """
+        simulations = kwargs.pop("simulations")
+
+        observed = []
+        for simulation in simulations:
+            s_dir_path = os.path.join(self.workspace_path, simulation.name)
+            record = simulation.cost_observed(working_dir=s_dir_path)
+            if record is not None:
+                observed.append(record)
+
+        if not len(observed):
+            raise Exception("No completed runs with `report.simulation` found.")
+
+        model = {
+            "coefficients": SimulationCost.cost_coefficients(observed),
+            "observed": observed,
+        }
+
+        cost_model_tmp_path = f"{self.cost_model_path}.tmp"
+        with open(cost_model_tmp_path, "w") as f:
+            json.dump(model, f, indent=2)
+        os.replace(cost_model_tmp_path, self.cost_model_path)
+
+        print(f"Calibrated cost model from {len(observed)} completed run(s).")
+        return model
+
+    @WorkspaceUtils.with_simulations
+    def cost_estimate_all(self, **kwargs):
+        """
+        Estimated runtime and output size of simulations, longest first.
+
+        @return: List of `cost_estimate` records.
+        """
+        simulations = kwargs.pop("simulations")
+        coefficients = self.load_cost_coefficients()
+
+        estimates = [
+            simulation.cost_estimate(coefficients) for simulation in simulations
+        ]
+        estimates = sorted(estimates, key=lambda estimate: -estimate["elapsed"])
+
+        print(
+            f"{'name':<40}{'cells':>12}{'frames':>8}{'elapsed (h)':>13}{'output':>11}"
+        )
+        for estimate in estimates:
+            print(
+                f"{estimate['name']:<40}{estimate['cells']:>12}"
+                f"{estimate['frames']:>8}{estimate['elapsed'] / 3600:>13.2f}"
+                f"{self.format_bytes(estimate['output_bytes']):>11}"
+            )
+        total_elapsed = sum(estimate["elapsed"] for estimate in estimates)
+        total_bytes = sum(estimate["output_bytes"] for estimate in estimates)
+        print(
+            f"Total: {total_elapsed / 3600:.1f} h of solver time, "
+            f"{self.format_bytes(total_bytes)} of output."
+        )
+
+        return estimates
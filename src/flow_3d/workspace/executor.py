@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import pickle
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from tqdm import tqdm
+
+# Simulations unpickled within a worker process, reused by later tasks while
+# `simulation.pkl` is unchanged.
+WORKER_SIMULATIONS = {}
+
+
+def run_simulation_task(workspace_path, name, method, args=(), kwargs=None):
+    """
+    Runs simulation method from a task descriptor within a worker process.
+
+    @param workspace_path: Path of workspace folder.
+    @param name: Simulation folder within workspace.
+    @param method: Simulation method name, e.g., "guipost"
+    @return: Summary of simulation method output, see `task_result`.
+    """
+    s_dir_path = os.path.join(workspace_path, name)
+    s_pkl_path = os.path.join(s_dir_path, "simulation.pkl")
+
+    modified = os.path.getmtime(s_pkl_path)
+    if WORKER_SIMULATIONS.get(s_pkl_path, (None,))[0] != modified:
+        with open(s_pkl_path, "rb") as file:
+            WORKER_SIMULATIONS[s_pkl_path] = (modified, pickle.load(file))
+
+    simulation = WORKER_SIMULATIONS[s_pkl_path][1]
+
+    result = getattr(simulation, method)(
+        *args, working_dir=s_dir_path, **(kwargs or {})
+    )
+    return task_result(result)
+
+
+def task_result(result):
+    """
+    Output of simulation method kept as task result, only `None`, status
+    strings or JSON serializable summaries so that simulations (`self`) and
+    datasets are not pickled back from workers and held by the parent.
+    """
+    if result is None or isinstance(result, (str, int, float, bool)):
+        return result
+
+    try:
+        json.dumps(result)
+    except (TypeError, ValueError):
+        return None
+
+    return result
+
+
+class WorkspaceExecutor:
+    """
+    Process pool owned by the workspace and reused across `*_all_*` methods.
+    Tasks are sent as `(workspace_path, name, method)` descriptors rather
+    than pickled simulations, and result summaries and errors are gathered
+    per simulation.
+    """
+
+    executor_pool = None
+    executor_num_proc = None
+
+    def __getstate__(self):
+        # Pool is left out so that workspace methods can be sent to processes.
+        state = self.__dict__.copy()
+        state.pop("executor_pool", None)
+        state.pop("executor_num_proc", None)
+        return state
+
+    def get_executor(self, num_proc):
+        """
+        Process pool of `num_proc` workers, started on first use.
+        """
+        if self.executor_pool is None or self.executor_num_proc != num_proc:
+            self.executor_shutdown()
+            self.executor_pool = ProcessPoolExecutor(max_workers=num_proc)
+            self.executor_num_proc = num_proc
+
+        return self.executor_pool
+
+    def executor_shutdown(self):
+        if self.executor_pool is not None:
+            self.executor_pool.shutdown(wait=True)
+
+        self.executor_pool = None
+        self.executor_num_proc = None
+
+    def map_simulations(self, method, simulations, num_proc=1, args=(), **kwargs):
+        """
+        Runs simulation method for each simulation, within the workspace pool
+        if `num_proc > 1`.
+
+        @param method: Simulation method name, e.g., "guipost"
+        @param simulations: Simulations to run method on.
+        @param num_proc: Number of processes, runs in process if `1`.
+        @param args: Positional arguments of simulation method.
+        @return: Dictionary of `results` summaries (`task_result`) and
+        `failed` errors per simulation name with `elapsed` seconds.
+        """
+        results = {}
+        failed = {}
+        start_time = time.perf_counter()
+
+        progress = tqdm(total=len(simulations), desc=method, unit="simulation")
+
+        if num_proc > 1:
+            executor = self.get_executor(num_proc)
+            futures = {
+                executor.submit(
+                    run_simulation_task,
+                    self.workspace_path,
+                    simulation.name,
+                    method,
+                    args,
+                    kwargs,
+                ): simulation.name
+                for simulation in simulations
+            }
+
+            broken = False
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except BrokenProcessPool as e:
+                    broken = True
+                    failed[name] = "".join(traceback.format_exception(e))
+                except Exception as e:
+                    failed[name] = "".join(traceback.format_exception(e))
+                progress.update()
+
+            # Pool is restarted on next call after a worker died.
+            if broken:
+                self.executor_shutdown()
+
+        else:
+            for simulation in simulations:
+                s_dir_path = os.path.join(self.workspace_path, simulation.name)
+                try:
+                    results[simulation.name] = task_result(
+                        getattr(simulation, method)(
+                            *args, working_dir=s_dir_path, **kwargs
+                        )
+                    )
+                except Exception:
+                    failed[simulation.name] = traceback.format_exc()
+                progress.update()
+
+        progress.close()
+
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"`{method}` completed for {len(results)} simulation(s) in "
+            f"{elapsed:.2f} s with {len(failed)} failure(s)."
+        )
+        for name, error in sorted(failed.items()):
+            logging.error(f"`{name}` failed at `{method}`:\n{error}")
+
+        return {
+            "results": results,
+            "failed": failed,
+            "elapsed": elapsed,
+        }
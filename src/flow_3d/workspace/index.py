@@ -0,0 +1,239 @@
+import ast
+import json
+import operator
+import os
+import pickle
+import re
+
+from flow_3d.simulation.manifest import STAGE_MANIFEST_SUFFIX
+from flow_3d.simulation.status import POST_PROCESS_STAGES, SimulationStatus
+
+# Written to the workspace folder alongside `manage.py`.
+INDEX_FILENAME = "index.json"
+
+# Ordered from the furthest stage, first completed stage sets the status.
+STATUS_LABELS = [
+    ("post_process_create_npz_completed", "npz_done"),
+    ("post_process_create_chunks_completed", "chunks_done"),
+    ("post_process_create_flslnk_completed", "flslnk_done"),
+    ("run_simulation_completed", "run_done"),
+]
+
+# Paths within simulation folder read by `check_status`, status is refreshed
+# only when one of these (or the folder itself) is modified.
+STATUS_PATHS = [
+    "report.simulation",
+    "flslnk_chunks",
+    "flslnk_npz",
+    *[f"{stage}{STAGE_MANIFEST_SUFFIX}" for stage in POST_PROCESS_STAGES],
+]
+
+# Comparisons allowed within `where` filters, longest operators first.
+WHERE_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    "=": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+
+class WorkspaceIndex:
+    """
+    Workspace index of simulation names, paths, parameters and status kept
+    in `index.json` so that simulations can be filtered without unpickling
+    every `simulation.pkl`.
+    ```
+    {
+      "0100_1.0_299.15_1E-04_2E-05": {
+        "name": "0100_1.0_299.15_1E-04_2E-05",
+        "path": "0100_1.0_299.15_1E-04_2E-05",
+        "status": "npz_done",
+        "modified": 1718035200123456789,
+        "parameters": {"power": 100, "velocity": 1.0, ...}
+      },
+      ...
+    }
+    ```
+    """
+
+    @property
+    def index_path(self):
+        return os.path.join(self.workspace_path, INDEX_FILENAME)
+
+    def load_index(self):
+        """
+        Loads workspace index, empty if not yet created.
+        """
+        if not os.path.exists(self.index_path):
+            return {}
+
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def save_index(self, index):
+        # Replaced in one step so that readers never see a partial index.
+        index_tmp_path = f"{self.index_path}.tmp"
+        with open(index_tmp_path, "w") as f:
+            json.dump(dict(sorted(index.items())), f, indent=2, default=str)
+        os.replace(index_tmp_path, self.index_path)
+
+    def index_entry(self, simulation):
+        """
+        Index entry of simulation with its current status.
+        """
+        parameters = {
+            key: getattr(simulation, key)
+            for key in simulation.default_parameters.keys()
+        }
+
+        # Read before status so that changes while checking are not missed.
+        modified = self.index_modified(simulation.name)
+
+        return {
+            "name": simulation.name,
+            "path": simulation.name,
+            "status": self.index_status(simulation.name),
+            "modified": modified,
+            "parameters": parameters,
+        }
+
+    def index_modified(self, path):
+        """
+        Latest modified time (ns) of simulation folder and `STATUS_PATHS`.
+        """
+        simulation_path = os.path.join(self.workspace_path, path)
+
+        modified = 0
+        for status_path in ["", *STATUS_PATHS]:
+            try:
+                stat = os.stat(os.path.join(simulation_path, status_path))
+            except FileNotFoundError:
+                continue
+            modified = max(modified, stat.st_mtime_ns)
+
+        return modified
+
+    def index_status(self, path):
+        """
+        Status label of simulation folder, i.e. "npz_done".
+        """
+        simulation_path = os.path.join(self.workspace_path, path)
+        status = SimulationStatus.check_status(simulation_path)
+
+        for key, label in STATUS_LABELS:
+            if status[key]:
+                return label
+
+        if os.path.exists(os.path.join(simulation_path, "prepin.simulation")):
+            return "built"
+
+        return "initialized"
+
+    def index_simulation(self, simulation):
+        """
+        Adds or updates simulation within workspace index.
+        """
+        index = self.load_index()
+        index[simulation.name] = self.index_entry(simulation)
+        self.save_index(index)
+
+    def index_sync(self):
+        """
+        Syncs index with simulation folders, only unpickling simulations not
+        yet indexed. Removed folders are dropped and statuses refreshed for
+        folders modified since last indexed.
+
+        @return: Workspace index
+        """
+        index = self.load_index()
+
+        simulation_folders = []
+        for entry in os.scandir(self.workspace_path):
+            # Skips over stray folders without a `simulation.pkl` file.
+            s_pkl_path = os.path.join(entry.path, "simulation.pkl")
+            if entry.is_dir() and os.path.exists(s_pkl_path):
+                simulation_folders.append(entry.name)
+
+        changed = False
+        for name in list(index.keys()):
+            if index[name]["path"] not in simulation_folders:
+                del index[name]
+                changed = True
+
+        indexed_paths = [entry["path"] for entry in index.values()]
+        for simulation_folder in simulation_folders:
+            if simulation_folder not in indexed_paths:
+                simulation = self.load_indexed_simulation({"path": simulation_folder})
+                index[simulation.name] = self.index_entry(simulation)
+                changed = True
+
+        for entry in index.values():
+            # Only folders modified since last sync are checked again.
+            modified = self.index_modified(entry["path"])
+            if entry.get("modified") != modified:
+                entry["status"] = self.index_status(entry["path"])
+                entry["modified"] = modified
+                changed = True
+
+        if changed:
+            self.save_index(index)
+
+        return index
+
+    def index_select(self, where=None):
+        """
+        Index entries matching `where` filter sorted by name.
+
+        @param where: Filter such as "power>200 and status=npz_done"
+        """
+        conditions = self.parse_where(where) if where else []
+
+        entries = []
+        for name, entry in sorted(self.index_sync().items()):
+            if all(self.match_condition(entry, *c) for c in conditions):
+                entries.append(entry)
+
+        return entries
+
+    def load_indexed_simulation(self, entry):
+        s_pkl_path = os.path.join(self.workspace_path, entry["path"], "simulation.pkl")
+        with open(s_pkl_path, "rb") as file:
+            return pickle.load(file)
+
+    @staticmethod
+    def parse_where(where):
+        """
+        Parses filter into `(key, operator, value)` conditions joined by `and`.
+        """
+        conditions = []
+        for clause in re.split(r"\s+and\s+", where.strip(), flags=re.IGNORECASE):
+            for symbol, compare in WHERE_OPERATORS.items():
+                if symbol in clause:
+                    key, value = [part.strip() for part in clause.split(symbol, 1)]
+                    try:
+                        value = ast.literal_eval(value)
+                    except (ValueError, SyntaxError):
+                        pass
+                    conditions.append((key, compare, value))
+                    break
+            else:
+                raise Exception(f"Invalid condition `{clause}` in `{where}`.")
+
+        return conditions
+
+    @staticmethod
+    def match_condition(entry, key, compare, value):
+        if key in entry:
+            entry_value = entry[key]
+        elif key in entry["parameters"]:
+            entry_value = entry["parameters"][key]
+        else:
+            return False
+
+        try:
+            return compare(entry_value, value)
+        except TypeError:
+            return False
@@ -0,0 +1,114 @@
+import json
+import os
+
+from flow_3d.simulation.utils.profile import PROFILE_FILENAME
+
+
+class WorkspaceProfile:
+    """
+    Summarizes the profile log of stages recorded with `manage.py --profile`.
+    """
+
+    @property
+    def profile_path(self):
+        return os.path.join(self.workspace_path, PROFILE_FILENAME)
+
+    def load_profile(self, profile_path=None):
+        """
+        Profile records, skipping a partially written last line.
+        """
+        if profile_path is None:
+            profile_path = self.profile_path
+
+        if not os.path.exists(profile_path):
+            raise FileNotFoundError(
+                f"`{profile_path}` not found, run with `manage.py --profile`."
+            )
+
+        records = []
+        with open(profile_path, "r") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+        return records
+
+    def profile_summary(self, profile_path=None, top=5):
+        """
+        Prints and returns usage per stage ordered by total wall time, along
+        with the slowest stage runs.
+
+        @param profile_path: Profile log -> `{workspace}/profile.jsonl`
+        @param top: Number of slowest stage runs listed -> 5
+        @return: Dictionary of `stages` summaries and `slowest` records.
+        """
+        records = self.load_profile(profile_path)
+
+        stages = {}
+        for record in records:
+            summary = stages.setdefault(
+                record["stage"],
+                {
+                    "count": 0,
+                    "failed": 0,
+                    "wall": 0.0,
+                    "wall_max": 0.0,
+                    "cpu": 0.0,
+                    "peak_rss": 0,
+                    "read_bytes": 0,
+                    "write_bytes": 0,
+                },
+            )
+            summary["count"] += 1
+            summary["failed"] += record["status"] != "success"
+            summary["wall"] += record["wall"]
+            summary["wall_max"] = max(summary["wall_max"], record["wall"])
+            summary["cpu"] += (record["cpu_user"] or 0) + (record["cpu_system"] or 0)
+            summary["peak_rss"] = max(summary["peak_rss"], record["peak_rss"] or 0)
+            summary["read_bytes"] += record["read_bytes"] or 0
+            summary["write_bytes"] += record["write_bytes"] or 0
+
+        for summary in stages.values():
+            summary["wall_mean"] = summary["wall"] / summary["count"]
+            # Above 1 when stage keeps several cores busy.
+            summary["cpu_utilization"] = (
+                summary["cpu"] / summary["wall"] if summary["wall"] > 0 else 0.0
+            )
+
+        stages = dict(sorted(stages.items(), key=lambda item: -item[1]["wall"]))
+        total_wall = sum(summary["wall"] for summary in stages.values())
+
+        print(
+            f"{'stage':<24}{'runs':>6}{'wall (s)':>12}{'share':>8}{'mean (s)':>10}"
+            f"{'cpu/wall':>10}{'peak rss':>11}{'read':>11}{'written':>11}"
+        )
+        for stage, summary in stages.items():
+            share = summary["wall"] / total_wall if total_wall > 0 else 0.0
+            print(
+                f"{stage:<24}{summary['count']:>6}{summary['wall']:>12.1f}"
+                f"{share:>8.1%}{summary['wall_mean']:>10.1f}"
+                f"{summary['cpu_utilization']:>10.2f}"
+                f"{self.format_bytes(summary['peak_rss']):>11}"
+                f"{self.format_bytes(summary['read_bytes']):>11}"
+                f"{self.format_bytes(summary['write_bytes']):>11}"
+            )
+
+        slowest = sorted(records, key=lambda record: -record["wall"])[:top]
+        print("\nSlowest:")
+        for record in slowest:
+            print(f"  {record['wall']:>10.1f} s  {record['stage']:<24}{record['name']}")
+
+        return {
+            "stages": stages,
+            "slowest": slowest,
+        }
+
+    @staticmethod
+    def format_bytes(value):
+        for unit in ["B", "KiB", "MiB", "GiB"]:
+            if abs(value) < 1024:
+                return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+            value /= 1024
+        return f"{value:.1f} TiB"
@@ -0,0 +1,263 @@
+import json
+import logging
+import shutil
+import time
+import traceback
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Stages in order, each simulation moves to the next stage once finished.
+STAGES = ["solver", "guipost", "convert", "visualize", "upload"]
+
+# Concurrent jobs per stage, solver is kept at 1 to respect licensed cores.
+STAGE_CONCURRENCY = {
+    "solver": 1,
+    "guipost": 1,
+    "convert": 2,
+    "visualize": 2,
+    "upload": 1,
+}
+
+# Disk and memory (bytes) reserved for each running job of a stage, i.e.
+# `guipost` unzips `flsgrf.simulation` and writes `flslnk.tmp` side by side.
+STAGE_RESOURCES = {
+    "solver": {"disk": 0, "memory": 0},
+    "guipost": {"disk": 64 * 1024**3, "memory": 2 * 1024**3},
+    "convert": {"disk": 8 * 1024**3, "memory": 4 * 1024**3},
+    "visualize": {"disk": 2 * 1024**3, "memory": 4 * 1024**3},
+    "upload": {"disk": 8 * 1024**3, "memory": 2 * 1024**3},
+}
+
+# Stages whose disk stays reserved once finished until the next stage of the
+# simulation starts, i.e. `flsgrf.simulation` written by the solver is held
+# until `guipost` reserves disk for it.
+HELD_STAGES = ["solver"]
+
+# Written to workspace folder after `simulation_run_all`.
+TIMINGS_FILENAME = "run_all_timings.json"
+
+
+class WorkspaceRunScheduler:
+    """
+    Pipelines simulations through solver, guipost, conversion, visualization
+    and upload stages. Each stage has its own process pool and queue so that
+    the solver keeps running while earlier simulations drain through the
+    downstream stages. Jobs only start once their reserved disk and memory
+    fit within the budgets.
+    """
+
+    def __init__(
+        self,
+        stage_methods,
+        stage_concurrency=None,
+        stage_resources=None,
+        disk_budget=None,
+        memory_budget=None,
+        disk_path=".",
+        job_resources=None,
+    ):
+        """
+        @param stage_methods: Picklable callable per stage called with `name`.
+        @param stage_concurrency: Overrides of `STAGE_CONCURRENCY`
+        @param stage_resources: Overrides of `STAGE_RESOURCES`
+        @param disk_budget: Maximum disk bytes reserved at once -> free disk
+        @param memory_budget: Maximum memory bytes reserved at once -> None
+        @param disk_path: Path used to check free disk space.
+        @param job_resources: Overrides of stage resources per simulation,
+        e.g., `{name: {"solver": {"disk": 4e9}, "guipost": {"disk": 8e9}}}`
+        from estimated output size.
+        """
+        self.stage_methods = stage_methods
+        self.stages = [stage for stage in STAGES if stage in stage_methods]
+
+        self.stage_concurrency = {**STAGE_CONCURRENCY, **(stage_concurrency or {})}
+        self.stage_resources = {
+            stage: {**STAGE_RESOURCES[stage], **(stage_resources or {}).get(stage, {})}
+            for stage in STAGES
+        }
+
+        self.disk_budget = disk_budget
+        self.memory_budget = memory_budget
+        self.disk_path = disk_path
+        self.job_resources = job_resources or {}
+
+        self.queues = {stage: deque() for stage in self.stages}
+        self.reserved = {"disk": 0, "memory": 0}
+        # Disk held per simulation between `HELD_STAGES` and next stage.
+        self.held = {}
+        self.timings = []
+        self.failed = {}
+
+    def resources(self, stage, name=None):
+        """
+        Disk and memory reserved by job of simulation at stage.
+        """
+        return {
+            **self.stage_resources[stage],
+            **self.job_resources.get(name, {}).get(stage, {}),
+        }
+
+    def fits(self, stage, name=None):
+        """
+        Checks that a job of stage fits within disk and memory budgets.
+        """
+        resources = self.resources(stage, name)
+
+        # Disk held for simulation is released once the job starts.
+        held = self.held.get(name, 0)
+        reserved_disk = self.reserved["disk"] - held
+
+        disk = reserved_disk + resources["disk"]
+        memory = self.reserved["memory"] + resources["memory"]
+
+        # Jobs always start when no running job reserves anything to avoid
+        # stalling, as held disk is only released by later stages.
+        running_disk = self.reserved["disk"] - sum(self.held.values())
+        if not running_disk and not self.reserved["memory"]:
+            return True
+
+        if self.disk_budget is not None and disk > self.disk_budget:
+            return False
+
+        if resources["disk"] - held > shutil.disk_usage(self.disk_path).free:
+            return False
+
+        if self.memory_budget is not None and memory > self.memory_budget:
+            return False
+
+        return True
+
+    def next_stage(self, stage):
+        index = self.stages.index(stage)
+        if index + 1 < len(self.stages):
+            return self.stages[index + 1]
+        return None
+
+    def run(self, names):
+        """
+        Runs each simulation through all stages.
+
+        @param names: Simulation names, in the order they are solved.
+        @return: Dictionary of `timings` per job, per stage `summary` and
+        `failed` jobs to errors.
+        """
+        self.queues[self.stages[0]].extend(names)
+
+        executors = {
+            stage: ProcessPoolExecutor(max_workers=self.stage_concurrency[stage])
+            for stage in self.stages
+        }
+        running = {}
+        counts = {stage: 0 for stage in self.stages}
+
+        try:
+            while running or any(self.queues.values()):
+
+                # Downstream stages are started first so they drain before
+                # more solver outputs are queued behind them.
+                for stage in reversed(self.stages):
+                    queue = self.queues[stage]
+                    while (
+                        queue
+                        and counts[stage] < self.stage_concurrency[stage]
+                        and self.fits(stage, queue[0])
+                    ):
+                        name = queue.popleft()
+                        future = executors[stage].submit(
+                            self.stage_methods[stage], name
+                        )
+                        running[future] = (stage, name, time.time())
+                        counts[stage] += 1
+                        self.reserved["disk"] -= self.held.pop(name, 0)
+                        for key in self.reserved:
+                            self.reserved[key] += self.resources(stage, name)[key]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage, name, start_time = running.pop(future)
+                    end_time = time.time()
+                    counts[stage] -= 1
+                    for key in self.reserved:
+                        self.reserved[key] -= self.resources(stage, name)[key]
+
+                    try:
+                        # Solver returns "success", "skipped" or "error".
+                        result = future.result()
+                        status = "success"
+                        if result in ["skipped", "error"]:
+                            status = result
+                        if result == "error":
+                            self.failed[f"{name}/{stage}"] = f"`{stage}` returned error"
+                            logging.error(f"`{name}` failed at `{stage}`.")
+                    except Exception as e:
+                        error = "".join(traceback.format_exception(e))
+                        self.failed[f"{name}/{stage}"] = error
+                        logging.error(f"`{name}` failed at `{stage}`:\n{error}")
+                        status = "error"
+
+                    self.timings.append(
+                        {
+                            "name": name,
+                            "stage": stage,
+                            "status": status,
+                            "start": start_time,
+                            "end": end_time,
+                            "elapsed": end_time - start_time,
+                        }
+                    )
+
+                    # Skipped solver runs (`runhyd.txt` exists) are not
+                    # post processed again.
+                    next_stage = self.next_stage(stage)
+                    if next_stage is not None and status == "success":
+                        self.queues[next_stage].append(name)
+
+                        if stage in HELD_STAGES:
+                            disk = self.resources(stage, name)["disk"]
+                            self.held[name] = disk
+                            self.reserved["disk"] += disk
+
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+
+        summary = self.summary()
+        for stage, stage_summary in summary.items():
+            print(
+                f"{stage}: {stage_summary['count']} job(s) in "
+                f"{stage_summary['total']:.2f} s ({stage_summary['mean']:.2f} s/job)"
+            )
+
+        return {
+            "timings": self.timings,
+            "summary": summary,
+            "failed": self.failed,
+        }
+
+    def summary(self):
+        """
+        Number of jobs, total and mean seconds per stage.
+        """
+        summary = {}
+        for stage in self.stages:
+            elapsed = [t["elapsed"] for t in self.timings if t["stage"] == stage]
+            summary[stage] = {
+                "count": len(elapsed),
+                "total": sum(elapsed),
+                "mean": sum(elapsed) / len(elapsed) if elapsed else 0.0,
+            }
+        return summary
+
+    def save_timings(self, path):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "timings": self.timings,
+                    "summary": self.summary(),
+                    "failed": self.failed,
+                },
+                f,
+                indent=2,
+            )
@@ -56,7 +56,17 @@ class WorkspaceSimulationBase:
         with open(simulation_pkl_path, "wb") as file:
             pickle.dump(simulation, file)
 
+        self.index_simulation(simulation)
+
         return simulation
 
     # Alias
     simulation_init = simulation_initialize
+
+    def simulation_load(self, name):
+        """
+        Loads simulation object from `simulation.pkl` within simulation folder.
+        """
+        simulation_pkl_path = os.path.join(self.workspace_path, name, "simulation.pkl")
+        with open(simulation_pkl_path, "rb") as file:
+            return pickle.load(file)
@@ -1,6 +1,8 @@
 import os
 import pickle
 
+from flow_3d.simulation.namelist import SimulationNamelist
+
 
 class WorkspaceSimulationBuild:
     """
@@ -10,7 +12,10 @@ class WorkspaceSimulationBuild:
 
     def simulation_build(self, name, config_file="simulation.yml", **kwargs):
         """
-        Creates prepin file from simulation.yml
+        Creates prepin file from simulation.yml, left untouched when its
+        content has not changed.
+
+        @return: `True` if prepin file was written.
         """
 
         simulation_path = os.path.join(self.workspace_path, name)
@@ -26,9 +31,24 @@ class WorkspaceSimulationBuild:
             simulation_path, simulation_prepin_filename
         )
 
+        prepin_file_content = simulation.prepin_file_content
+
+        rebuild = True
+        if os.path.exists(simulation_prepin_path):
+            with open(simulation_prepin_path, "r") as file:
+                current_prepin_file_content = file.read()
+            rebuild = current_prepin_file_content != prepin_file_content
+
+            if rebuild and self.verbose:
+                changes = SimulationNamelist(current_prepin_file_content).diff(
+                    prepin_file_content
+                )
+                print(f"Rebuilding `{name}` prepin file: {changes}")
+
         # Write prepin file as "prepin.simulation"
-        with open(simulation_prepin_path, "w") as file:
-            file.write(simulation.prepin_file_content)
+        if rebuild:
+            with open(simulation_prepin_path, "w") as file:
+                file.write(prepin_file_content)
 
         # Save simulation class object to pickle file
         simulation_pkl_path = os.path.join(
@@ -37,11 +57,45 @@ class WorkspaceSimulationBuild:
         with open(simulation_pkl_path, "wb") as file:
             pickle.dump(simulation, file)
 
+        self.index_simulation(simulation)
+
+        return rebuild
+
     def simulation_build_all(self, **kwargs):
         """
-        Builds all simulations within the workspace.
+        Builds all simulations within the workspace, only rewriting prepin
+        files that changed.
+
+        @return: List of simulations with rewritten prepin files.
         """
+        rebuilt = []
         for root, _, files in os.walk(self.workspace_path):
             if "simulation.pkl" in files:
                 simulation_folder = os.path.basename(root)
-                self.simulation_build(simulation_folder)
+                if self.simulation_build(simulation_folder):
+                    rebuilt.append(simulation_folder)
+
+        print(f"Rebuilt {len(rebuilt)} prepin file(s).")
+        return rebuilt
+
+    def simulation_prepin_diff(self, name, other_name):
+        """
+        Namelist values that differ between prepin files of two simulations.
+
+        @param name: Simulation folder within workspace.
+        @param other_name: Simulation folder to compare with.
+        @return: Dictionary of `(value, other_value)` per key per group.
+        """
+        namelists = []
+        for simulation_name in [name, other_name]:
+            prepin_path = os.path.join(
+                self.workspace_path, simulation_name, "prepin.simulation"
+            )
+            if os.path.exists(prepin_path):
+                with open(prepin_path, "r") as file:
+                    namelists.append(SimulationNamelist(file.read()))
+            else:
+                simulation = self.simulation_load(simulation_name)
+                namelists.append(simulation.prepin_namelist)
+
+        return namelists[0].diff(namelists[1])
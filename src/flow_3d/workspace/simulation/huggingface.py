@@ -1,4 +1,3 @@
-import multiprocessing
 import os
 import time
 import pickle
@@ -61,28 +60,11 @@ class WorkspaceSimulationHuggingFace:
         skip_checks=False,
         **kwargs,
     ):
-        simulations = kwargs["simulations"]
-
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.create_flslnk_dataset,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
+        simulations = kwargs.pop("simulations")
 
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.create_flslnk_dataset(working_dir=s_dir_path, **kwargs)
+        return self.map_simulations(
+            "create_flslnk_dataset", simulations, num_proc=num_proc, **kwargs
+        )
 
     @WorkspaceUtils.with_simulations
     def huggingface_all_upload_flslnk_dataset(
@@ -92,34 +74,18 @@ class WorkspaceSimulationHuggingFace:
         skip_checks=False,
         **kwargs,
     ):
-        simulations = kwargs["simulations"]
+        simulations = kwargs.pop("simulations")
 
         if dataset_id == None:
             dataset_id = f"FLOW-3D/{self.filename}"
 
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.upload_flslnk_dataset,
-                        args=[dataset_id],
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.upload_flslnk_dataset(
-                    dataset_id, working_dir=s_dir_path, **kwargs
-                )
+        return self.map_simulations(
+            "upload_flslnk_dataset",
+            simulations,
+            num_proc=num_proc,
+            args=(dataset_id,),
+            **kwargs,
+        )
 
     # TODO: Make method to upload just the FLOW-3D metadata for cases when
     # folders such as `visualize` is updated. Thus, you don't have to upload
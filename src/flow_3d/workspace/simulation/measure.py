@@ -1,8 +1,10 @@
-import multiprocessing
 import os
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from tqdm import tqdm
 
+from flow_3d.simulation.measurements import MASK_COLUMNS
 from flow_3d.workspace.utils import WorkspaceUtils
 
 
@@ -21,30 +23,11 @@ class WorkspaceSimulationMeasure:
         @param num_proc: Number of processes to use.
         """
 
-        simulations = kwargs["simulations"]
+        simulations = kwargs.pop("simulations")
 
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.prepare_melt_pool_measurements,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.prepare_melt_pool_measurements(
-                    working_dir=s_dir_path, **kwargs
-                )
+        return self.map_simulations(
+            "prepare_melt_pool_measurements", simulations, num_proc=num_proc, **kwargs
+        )
 
     @WorkspaceUtils.with_simulations
     def measure_all_generate_melt_pool_measurements(
@@ -55,27 +38,63 @@ class WorkspaceSimulationMeasure:
 
         @param num_proc: Number of processes to use.
         """
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations(
+            "generate_melt_pool_measurements", simulations, num_proc=num_proc, **kwargs
+        )
+
+    @WorkspaceUtils.with_simulations
+    def measure_all_aggregate_melt_pool_measurements(
+        self, key="temperature", include_masks=False, **kwargs
+    ):
+        """
+        Merges melt pool measurement tables of simulations into a single
+        `measurements/melt_pool/{key}.parquet` table within the workspace
+        with a `name` column of the simulation.
+
+        @param key: Measured output -> "temperature"
+        @param include_masks: Keeps bitpacked `mask_*` columns -> False
+        @return: Path of workspace table
+        """
         simulations = kwargs["simulations"]
 
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.generate_melt_pool_measurements,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.generate_melt_pool_measurements(
-                    working_dir=s_dir_path, **kwargs
+        tables = []
+        for simulation in tqdm(simulations):
+            table_path = os.path.join(
+                self.workspace_path,
+                simulation.name,
+                "measurements",
+                "melt_pool",
+                f"{key}.parquet",
+            )
+
+            # Skips simulations not yet measured.
+            if not os.path.exists(table_path):
+                continue
+
+            table = pq.read_table(table_path)
+            if not include_masks:
+                table = table.drop_columns(
+                    [c for c in table.column_names if c in MASK_COLUMNS]
                 )
+
+            name = pa.array([simulation.name] * len(table), pa.string())
+            tables.append(table.add_column(0, "name", name))
+
+        if not len(tables):
+            raise FileNotFoundError(f"No `{key}.parquet` measurements found")
+
+        # Tables with and without `*_interp_m` columns are merged with nulls.
+        table = pa.concat_tables(tables, promote_options="permissive")
+
+        measurements_path = os.path.join(
+            self.workspace_path, "measurements", "melt_pool"
+        )
+        if not os.path.exists(measurements_path):
+            os.makedirs(measurements_path)
+
+        output_path = os.path.join(measurements_path, f"{key}.parquet")
+        pq.write_table(table, output_path)
+
+        return output_path
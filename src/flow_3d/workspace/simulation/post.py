@@ -1,9 +1,6 @@
-import multiprocessing
 import os
 import pickle
 
-from tqdm import tqdm
-
 from flow_3d.workspace.utils import WorkspaceUtils
 
 
@@ -23,8 +20,7 @@ class WorkspaceSimulationPost:
             simulation = pickle.load(file)
 
         simulation.guipost(working_dir=simulation_folder)
-        simulation.chunk_flslnk(working_dir=simulation_folder, delete_output=False)
-        simulation.flslnk_chunk_to_npz(
+        simulation.flslnk_to_npz(
             working_dir=simulation_folder,
             num_proc=num_proc,
             delete_output=delete_output,
@@ -38,28 +34,9 @@ class WorkspaceSimulationPost:
         @param num_proc: Number of processes to use.
         """
 
-        simulations = kwargs["simulations"]
-
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.guipost,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.guipost(working_dir=s_dir_path, **kwargs)
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations("guipost", simulations, num_proc=num_proc, **kwargs)
 
     @WorkspaceUtils.with_simulations
     def post_all_flslnk_to_chunks(self, num_proc=1, skip_checks=False, **kwargs):
@@ -69,28 +46,11 @@ class WorkspaceSimulationPost:
         @param num_proc: Number of processes to use.
         """
 
-        simulations = kwargs["simulations"]
-
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.chunk_flslnk,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.chunk_flslnk(working_dir=s_dir_path, **kwargs)
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations(
+            "chunk_flslnk", simulations, num_proc=num_proc, **kwargs
+        )
 
     @WorkspaceUtils.with_simulations
     def post_all_flslnk_chunks_to_npz(self, num_proc=1, skip_checks=False, **kwargs):
@@ -100,25 +60,37 @@ class WorkspaceSimulationPost:
         @param num_proc: Number of processes to use.
         """
 
-        simulations = kwargs["simulations"]
-
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.flslnk_chunk_to_npz,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
-
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.flslnk_chunk_to_npz(working_dir=s_dir_path, **kwargs)
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations(
+            "flslnk_chunk_to_npz", simulations, num_proc=num_proc, **kwargs
+        )
+
+    @WorkspaceUtils.with_simulations
+    def post_all_flslnk_to_npz(self, num_proc=1, skip_checks=False, **kwargs):
+        """
+        Method to stream flslnk into npz for simulations within a job folder.
+
+        @param num_proc: Number of processes to use.
+        """
+
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations(
+            "flslnk_to_npz", simulations, num_proc=num_proc, **kwargs
+        )
+
+    @WorkspaceUtils.with_simulations
+    def post_all_build_flslnk_store(self, num_proc=1, skip_checks=False, **kwargs):
+        """
+        Method to build uncompressed flslnk store for simulations within a job
+        folder.
+
+        @param num_proc: Number of processes to use.
+        """
+
+        simulations = kwargs.pop("simulations")
+
+        return self.map_simulations(
+            "build_flslnk_store", simulations, num_proc=num_proc, **kwargs
+        )
@@ -2,9 +2,16 @@ import os
 import pickle
 import re
 
-from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from huggingface_hub import upload_folder
-from tqdm import tqdm
+
+from flow_3d.simulation.report import PROGRESS_SAMPLE_FILENAME, SimulationReport
+
+from flow_3d.workspace.scheduler import TIMINGS_FILENAME, WorkspaceRunScheduler
+
+# Disk reserved by `guipost` as a multiple of estimated `flsgrf.simulation`
+# size, for the unzipped output and `flslnk.tmp` written alongside.
+GUIPOST_DISK_FACTOR = 2.0
 
 
 class WorkspaceSimulationRun:
@@ -26,7 +33,7 @@ class WorkspaceSimulationRun:
             s = pickle.load(file)
 
         # Run simulation
-        status = s.runhyd(working_dir=s_dir_path)
+        status = s.runhyd(working_dir=s_dir_path, **kwargs)
 
         if status == "success":
             if postprocess:
@@ -42,39 +49,121 @@ class WorkspaceSimulationRun:
         return status
 
     def simulation_run_all(
-        self, postprocess=True, visualize=True, upload=False, num_proc=1, **kwargs
+        self,
+        postprocess=True,
+        visualize=True,
+        upload=False,
+        num_proc=1,
+        where=None,
+        stage_concurrency=None,
+        stage_resources=None,
+        disk_budget=None,
+        memory_budget=None,
+        use_cost_model=False,
+        **kwargs,
     ):
         """
-        Runs all simulation within workspace folder sequentially,
-        but handles postprocessing, visualization, and upload asynchronously.
+        Runs all simulations within workspace through a pipeline of solver,
+        guipost, conversion, visualization and upload stages. Solver runs are
+        kept back to back while finished simulations are post processed in
+        the background under the disk and memory budgets.
+
+        @param num_proc: Number of processes used within conversion and views.
+        @param where: Filter on workspace index, e.g., "power>200"
+        @param stage_concurrency: Jobs per stage, e.g., {"convert": 4}
+        @param stage_resources: Bytes reserved per job, e.g.,
+        {"guipost": {"disk": 32e9, "memory": 2e9}}
+        @param disk_budget: Maximum disk bytes reserved by running jobs.
+        @param memory_budget: Maximum memory bytes reserved by running jobs.
+        @param use_cost_model: Solves shortest estimated runs first and
+        reserves solver and guipost disk from estimated output size -> False
+        @return: Per stage timings, also saved to `run_all_timings.json`.
+        """
+        names = [entry["name"] for entry in self.index_select(where)]
+
+        job_resources = None
+        if use_cost_model:
+            coefficients = self.load_cost_coefficients()
+            estimates = {
+                name: self.simulation_load(name).cost_estimate(coefficients)
+                for name in names
+            }
+            names = sorted(names, key=lambda name: estimates[name]["elapsed"])
+
+            # Solver writes `flsgrf.simulation`, held until `guipost` which
+            # holds `flsgrf.simulation` and `flslnk.tmp` side by side.
+            job_resources = {
+                name: {
+                    "solver": {"disk": int(estimate["output_bytes"])},
+                    "guipost": {
+                        "disk": int(GUIPOST_DISK_FACTOR * estimate["output_bytes"])
+                    },
+                }
+                for name, estimate in estimates.items()
+            }
+
+        stage_methods = {
+            "solver": partial(self.simulation_run, postprocess=False, **kwargs),
+        }
+        if postprocess:
+            stage_methods["guipost"] = self.simulation_run_guipost
+            stage_methods["convert"] = partial(
+                self.simulation_run_convert, num_proc=num_proc
+            )
+            if visualize:
+                stage_methods["visualize"] = partial(
+                    self.simulation_run_visualize, num_proc=num_proc
+                )
+            if upload:
+                stage_methods["upload"] = self.simulation_run_upload
+
+        scheduler = WorkspaceRunScheduler(
+            stage_methods,
+            stage_concurrency=stage_concurrency,
+            stage_resources=stage_resources,
+            disk_budget=disk_budget,
+            memory_budget=memory_budget,
+            disk_path=self.workspace_path,
+            job_resources=job_resources,
+        )
+        report = scheduler.run(names)
+        scheduler.save_timings(os.path.join(self.workspace_path, TIMINGS_FILENAME))
+
+        return report
+
+    def simulation_progress_all(self, where=None, **kwargs):
         """
-        with ProcessPoolExecutor() as executor:
-            futures = []
-            for root, _, files in tqdm(sorted(os.walk(self.workspace_path))):
-                if "simulation.pkl" in files:
-                    simulation_name = os.path.basename(root)
-
-                    # Run simulation synchronously to respect licensed cores.
-                    status = self.simulation_run(
-                        simulation_name, postprocess=False, **kwargs
-                    )
-
-                    if status == "success":
-                        if postprocess:
-                            # Queue postprocessing in background
-                            futures.append(
-                                executor.submit(
-                                    self.simulation_run_post,
-                                    simulation_name,
-                                    visualize,
-                                    upload,
-                                    num_proc,
-                                )
-                            )
-
-            # Optional: Wait for all background jobs to complete
-            for future in futures:
-                future.result()  # You could also catch exceptions here
+        Live progress of runs with a `report.simulation`, read from the end
+        of each report.
+
+        @param where: Filter on workspace index, e.g., "status=built"
+        @return: Dictionary of progress per simulation name.
+        """
+        progress = {}
+        for entry in self.index_select(where):
+            s_dir_path = os.path.join(self.workspace_path, entry["path"])
+            report_path = os.path.join(s_dir_path, "report.simulation")
+            if not os.path.exists(report_path):
+                continue
+
+            progress[entry["name"]] = SimulationReport.read_progress(
+                report_path,
+                finish_time=entry["parameters"].get("simulation_finish_time"),
+                sample_path=os.path.join(s_dir_path, PROGRESS_SAMPLE_FILENAME),
+            )
+
+        print(f"{'name':<40}{'t (s)':>13}{'cycle':>10}{'percent':>9}{'eta (min)':>11}")
+        for name, run_progress in progress.items():
+            percent = run_progress["percent"]
+            eta = run_progress["eta"]
+            print(
+                f"{name:<40}{run_progress['time'] or 0:>13.5e}"
+                f"{run_progress['cycle'] or 0:>10}"
+                f"{percent if percent is not None else 0:>8.1f}%"
+                f"{eta / 60 if eta is not None else float('nan'):>11.1f}"
+            )
+
+        return progress
 
     def simulation_run_post(
         self, name, visualize=True, upload=False, num_proc=1, **kwargs
@@ -83,43 +172,57 @@ class WorkspaceSimulationRun:
         Initializes simulation class and runs post processing steps
         """
         print(f"Starting post processing for {name}...")
+        self.simulation_run_guipost(name)
+        self.simulation_run_convert(name, num_proc=num_proc)
+        if visualize:
+            self.simulation_run_visualize(name, num_proc=num_proc)
+        if upload:
+            self.simulation_run_upload(name, **kwargs)
+
+    def simulation_run_guipost(self, name, **kwargs):
         simulation_folder = os.path.join(self.workspace_path, name)
+        simulation = self.simulation_load(name)
+        simulation.guipost(working_dir=simulation_folder)
 
-        s_dir_path = os.path.join(self.workspace_path, simulation_folder)
-        s_pkl_path = os.path.join(s_dir_path, f"simulation.pkl")
-        with open(s_pkl_path, "rb") as file:
-            simulation = pickle.load(file)
+    def simulation_run_convert(self, name, num_proc=1, **kwargs):
+        simulation_folder = os.path.join(self.workspace_path, name)
+        simulation = self.simulation_load(name)
+        simulation.flslnk_to_npz(working_dir=simulation_folder, num_proc=num_proc)
 
-        simulation.guipost(working_dir=simulation_folder)
-        simulation.chunk_flslnk(working_dir=simulation_folder)
-        simulation.flslnk_chunk_to_npz(working_dir=simulation_folder)
-        if visualize:
-            simulation.prepare_views(working_dir=simulation_folder)
-            simulation.generate_views(working_dir=simulation_folder, num_proc=num_proc)
+    def simulation_run_visualize(self, name, num_proc=1, **kwargs):
+        simulation_folder = os.path.join(self.workspace_path, name)
+        simulation = self.simulation_load(name)
 
-            simulation.prepare_view_visualizations(working_dir=simulation_folder)
-            simulation.generate_views_visualizations(
-                working_dir=simulation_folder, num_proc=num_proc
-            )
-        if upload:
-            simulation.create_flslnk_dataset(working_dir=simulation_folder, **kwargs)
-            dataset_id = simulation.filename
-            response = simulation.upload_flslnk_dataset(
-                dataset_id, working_dir=simulation_folder, **kwargs
-            )
+        simulation.prepare_views(working_dir=simulation_folder)
+        simulation.generate_views(working_dir=simulation_folder, num_proc=num_proc)
 
-            # Use regex to extract the dataset path
-            match = re.search(r"datasets/([^/]+/[^/]+)", response)
-            if match:
-                repo_id = match.group(1)
-                print(f"Uploading source files to repo with id: {repo_id}")
-            else:
-                print("Dataset path not found.")
-
-            path_in_repo = os.path.join("source", simulation.name)
-            upload_folder(
-                repo_id=repo_id,
-                folder_path=simulation_folder,
-                path_in_repo=path_in_repo,
-                repo_type="dataset",
-            )
+        simulation.prepare_view_visualizations(working_dir=simulation_folder)
+        simulation.generate_views_visualizations(
+            working_dir=simulation_folder, num_proc=num_proc
+        )
+
+    def simulation_run_upload(self, name, **kwargs):
+        simulation_folder = os.path.join(self.workspace_path, name)
+        simulation = self.simulation_load(name)
+
+        simulation.create_flslnk_dataset(working_dir=simulation_folder, **kwargs)
+        dataset_id = simulation.filename
+        response = simulation.upload_flslnk_dataset(
+            dataset_id, working_dir=simulation_folder, **kwargs
+        )
+
+        # Use regex to extract the dataset path
+        match = re.search(r"datasets/([^/]+/[^/]+)", response)
+        if match:
+            repo_id = match.group(1)
+            print(f"Uploading source files to repo with id: {repo_id}")
+        else:
+            print("Dataset path not found.")
+
+        path_in_repo = os.path.join("source", simulation.name)
+        upload_folder(
+            repo_id=repo_id,
+            folder_path=simulation_folder,
+            path_in_repo=path_in_repo,
+            repo_type="dataset",
+        )
@@ -0,0 +1,358 @@
+import hashlib
+import itertools
+import json
+import numpy as np
+import os
+import pickle
+import time
+import yaml
+
+from decimal import Decimal
+from importlib.resources import files
+from scipy.stats import qmc
+from tqdm import tqdm
+
+from flow_3d import data
+from flow_3d.simulation import Simulation
+from flow_3d.simulation.parameters import DEFAULT_PARAMETERS
+from flow_3d.simulation.prepin import DEFAULT_TEMPLATE_ID, DEFAULT_TEMPLATE_ID_TYPE
+
+# Sampling strategies of `sweep_initialize`.
+SWEEP_SAMPLINGS = ["grid", "lhs", "sobol"]
+
+# Sampled values are rounded to the resolution of simulation names so that
+# samples which would share a name are deduplicated, as decimal places
+# (`int`) or significant figures (`str`).
+SWEEP_ROUNDING = {
+    "power": 0,
+    "velocity": 2,
+    "temperature_initial": 2,
+    "beam_diameter": "2",
+    "mesh_size": "2",
+}
+
+# Hex digits of the hash suffix of names of simulations sweeping parameters
+# not encoded within simulation names, i.e. `lens_radius`.
+SWEEP_HASH_LENGTH = 8
+
+# Parameters outside `DEFAULT_PARAMETERS` hashed into names when not default.
+SWEEP_HASH_DEFAULTS = {
+    "template_id": DEFAULT_TEMPLATE_ID,
+    "template_id_type": DEFAULT_TEMPLATE_ID_TYPE,
+}
+
+# Nested sections of `simulation.yml`, i.e. `mesh: {size: 2.0e-5}`.
+CONFIG_SECTIONS = ["mesh", "fluid_region", "beam"]
+
+# Simulations sent to a worker process at once.
+SWEEP_CHUNK_SIZE = 64
+
+
+def initialize_sweep_simulation(workspace_path, name, parameters, config, build):
+    """
+    Creates simulation folder with `simulation.yml`, `simulation.pkl` and
+    optionally `prepin.simulation` within a worker process.
+
+    @return: Workspace index entry of simulation.
+    """
+    simulation = Simulation(name=name, **parameters)
+
+    simulation_path = os.path.join(workspace_path, name)
+    os.makedirs(simulation_path, exist_ok=True)
+
+    with open(os.path.join(simulation_path, "simulation.yml"), "w") as f:
+        yaml.dump(config, f, sort_keys=False)
+
+    status = "initialized"
+    if build:
+        prepin_path = os.path.join(simulation_path, f"prepin.{simulation.filename}")
+        with open(prepin_path, "w") as f:
+            f.write(simulation.prepin_file_content)
+        status = "built"
+
+    with open(os.path.join(simulation_path, f"{simulation.filename}.pkl"), "wb") as f:
+        pickle.dump(simulation, f)
+
+    return {
+        "name": name,
+        "path": name,
+        "status": status,
+        "parameters": {key: getattr(simulation, key) for key in DEFAULT_PARAMETERS},
+    }
+
+
+class WorkspaceSimulationSweep:
+    """
+    Workspace class providing methods to initialize parameter sweeps.
+    """
+
+    def sweep_initialize(
+        self,
+        parameters,
+        sampling="grid",
+        samples=None,
+        seed=None,
+        config=None,
+        build=True,
+        num_proc=1,
+        **kwargs,
+    ):
+        """
+        Initializes simulations sampled from parameter ranges, skipping
+        simulations already within the workspace. Names of simulations with
+        parameters not encoded within the name (i.e. `lens_radius`) end with
+        a hash of their values.
+        ```
+        workspace.sweep_initialize(
+            {"power": (100, 400), "velocity": (0.5, 1.5), "material": ["S31603"]},
+            sampling="lhs",
+            samples=1000,
+            num_proc=8,
+        )
+        ```
+
+        @param parameters: Dictionary of `(low, high)` ranges, lists of values,
+        or fixed values per parameter (mgs). `material` selects `template_id`.
+        @param sampling: One of `SWEEP_SAMPLINGS` -> "grid"
+        @param samples: Total samples (`lhs`, `sobol`) or values per `(low,
+        high)` range (`grid`).
+        @param seed: Random seed of `lhs` and `sobol` sampling -> None
+        @param config: Base `simulation.yml` configuration -> `default.yml`
+        @param build: Writes `prepin.simulation` files -> True
+        @param num_proc: Number of processes to use.
+        @return: Dictionary of `created` and `skipped` simulation names.
+        """
+        start_time = time.perf_counter()
+
+        if config is None:
+            config_resource = files(data).joinpath(
+                os.path.join("simulation", "config", "default.yml")
+            )
+            with config_resource.open("r") as f:
+                config = yaml.safe_load(f)
+
+        base_parameters = self.flatten_config(config)
+
+        index = self.load_index()
+        existing = {entry["path"] for entry in index.values()}
+
+        tasks = {}
+        skipped = []
+        duplicates = 0
+        for sample in self.sweep_samples(parameters, sampling, samples, seed):
+            sample_parameters = {**base_parameters, **sample}
+            if "material" in sample_parameters:
+                sample_parameters["template_id"] = sample_parameters.pop("material")
+
+            # Names follow from parameters alone, regardless of which were
+            # swept, so that samples are deduplicated against the workspace.
+            name = Simulation(**sample_parameters).name
+            name += self.sweep_name_suffix(sample_parameters)
+
+            # Samples rounded onto the same simulation name.
+            if name in tasks:
+                duplicates += 1
+                continue
+            if name in existing or os.path.isdir(
+                os.path.join(self.workspace_path, name)
+            ):
+                skipped.append(name)
+                continue
+
+            tasks[name] = (
+                self.workspace_path,
+                name,
+                sample_parameters,
+                self.nest_parameters(sample_parameters),
+                build,
+            )
+
+        entries = []
+        progress = tqdm(total=len(tasks), desc="sweep_initialize", unit="simulation")
+        if num_proc > 1 and len(tasks):
+            executor = self.get_executor(num_proc)
+            for entry in executor.map(
+                initialize_sweep_simulation,
+                *zip(*tasks.values()),
+                chunksize=SWEEP_CHUNK_SIZE,
+            ):
+                entries.append(entry)
+                progress.update()
+        else:
+            for task in tasks.values():
+                entries.append(initialize_sweep_simulation(*task))
+                progress.update()
+        progress.close()
+
+        # Index is written once rather than once per simulation.
+        for entry in entries:
+            index[entry["name"]] = entry
+        self.save_index(index)
+
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"Initialized {len(entries)} simulation(s) in {elapsed:.2f} s, "
+            f"skipped {len(skipped)} existing and {duplicates} duplicate sample(s)."
+        )
+
+        return {
+            "created": sorted(tasks),
+            "skipped": sorted(set(skipped)),
+        }
+
+    @staticmethod
+    def sweep_samples(parameters, sampling="grid", samples=None, seed=None):
+        """
+        Samples parameter combinations.
+
+        @param parameters: Dictionary of `(low, high)` ranges, lists of values,
+        or fixed values per parameter.
+        @param sampling: One of `SWEEP_SAMPLINGS` -> "grid"
+        @param samples: Total samples (`lhs`, `sobol`) or values per `(low,
+        high)` range (`grid`).
+        @param seed: Random seed of `lhs` and `sobol` sampling -> None
+        @return: List of dictionaries of parameter values.
+        """
+        if sampling not in SWEEP_SAMPLINGS:
+            raise Exception(f"Sampling `{sampling}` not in {SWEEP_SAMPLINGS}.")
+
+        unknown = set(parameters) - set(DEFAULT_PARAMETERS) - {"material"}
+        if unknown:
+            raise Exception(
+                f"Unknown sweep parameters {sorted(unknown)}, "
+                f"expected any of {list(DEFAULT_PARAMETERS) + ['material']}."
+            )
+
+        fixed = {}
+        swept = {}
+        for key, values in parameters.items():
+            if isinstance(values, tuple):
+                if len(values) != 2:
+                    raise Exception(f"Range of `{key}` must be `(low, high)`.")
+                swept[key] = values
+            elif isinstance(values, list):
+                swept[key] = values
+            else:
+                fixed[key] = values
+
+        keys = list(swept)
+
+        if sampling == "grid":
+            axes = []
+            for key in keys:
+                if isinstance(swept[key], tuple):
+                    if samples is None:
+                        raise Exception(
+                            f"`samples` per range is required for `{key}` range."
+                        )
+                    axes.append(np.linspace(*swept[key], samples).tolist())
+                else:
+                    axes.append(swept[key])
+            points = list(itertools.product(*axes))
+        else:
+            if samples is None:
+                raise Exception(f"`samples` is required for `{sampling}` sampling.")
+
+            # Unit hypercube samples scaled onto each range or list of values.
+            if not len(keys):
+                unit = np.zeros((samples, 0))
+            elif sampling == "lhs":
+                unit = qmc.LatinHypercube(d=len(keys), seed=seed).random(samples)
+            else:
+                unit = qmc.Sobol(d=len(keys), seed=seed).random(samples)
+
+            points = []
+            for row in unit:
+                point = []
+                for key, u in zip(keys, row):
+                    if isinstance(swept[key], tuple):
+                        low, high = swept[key]
+                        point.append(low + u * (high - low))
+                    else:
+                        values = swept[key]
+                        point.append(values[min(int(u * len(values)), len(values) - 1)])
+                points.append(point)
+
+        sweep = []
+        for point in points:
+            sample = dict(fixed)
+            for key, value in zip(keys, point):
+                sample[key] = WorkspaceSimulationSweep.round_sample(key, value)
+            sweep.append(sample)
+
+        return sweep
+
+    @staticmethod
+    def sweep_name_suffix(parameters):
+        """
+        Hash suffix of parameters not encoded within simulation names
+        (`SWEEP_ROUNDING`) which differ from `DEFAULT_PARAMETERS` (or
+        `SWEEP_HASH_DEFAULTS`, i.e. `template_id`), so that these samples
+        are not deduplicated, i.e. `0_0100_1.0_299.15_1.0E-4_2.0E-5_3f2a9c1e`.
+
+        @param parameters: Dictionary of simulation parameter values.
+        @return: Suffix of simulation name, empty if all parameters are named.
+        """
+        defaults = {**DEFAULT_PARAMETERS, **SWEEP_HASH_DEFAULTS}
+        unnamed = {
+            key: value
+            for key, value in parameters.items()
+            if key in defaults and key not in SWEEP_ROUNDING and value != defaults[key]
+        }
+        if not len(unnamed):
+            return ""
+
+        digest = hashlib.sha1(json.dumps(unnamed, sort_keys=True, default=str).encode())
+        return f"_{digest.hexdigest()[:SWEEP_HASH_LENGTH]}"
+
+    @staticmethod
+    def round_sample(key, value):
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        if key not in SWEEP_ROUNDING or not isinstance(value, (int, float)):
+            return value
+
+        rounding = SWEEP_ROUNDING[key]
+        if isinstance(rounding, str):
+            return float(f"{Decimal(value):.{int(rounding) - 1}E}")
+        if rounding == 0:
+            return int(round(value))
+        return round(float(value), rounding)
+
+    @staticmethod
+    def flatten_config(config):
+        """
+        `simulation.yml` configuration to parameters, i.e. `mesh: {size: ...}`
+        to `mesh_size`, with the `prepin` section as `prepin_overrides`.
+        """
+        parameters = {}
+        for key, value in config.items():
+            if key == "prepin":
+                parameters["prepin_overrides"] = value or {}
+            elif isinstance(value, dict):
+                for nested_key, nested_value in value.items():
+                    parameters[f"{key}_{nested_key}"] = nested_value
+            else:
+                parameters[key] = value
+        return parameters
+
+    @staticmethod
+    def nest_parameters(parameters):
+        """
+        Parameters to `simulation.yml` configuration.
+        """
+        config = {}
+        for key, value in parameters.items():
+            if key == "template_id":
+                continue
+            if key == "prepin_overrides":
+                config["prepin"] = value
+                continue
+            for section in CONFIG_SECTIONS:
+                if key.startswith(f"{section}_"):
+                    config.setdefault(section, {})[key[len(section) + 1 :]] = value
+                    break
+            else:
+                config[key] = value
+        return config
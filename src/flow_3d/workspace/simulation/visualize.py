@@ -1,4 +1,3 @@
-import multiprocessing
 import os
 import pickle
 
@@ -37,28 +36,11 @@ class WorkspaceSimulationVisualize:
         @param num_proc: Number of processes to use.
         """
 
-        simulations = kwargs["simulations"]
-
-        if num_proc > 1:
-            with multiprocessing.Pool(processes=num_proc) as pool:
-                for simulation in tqdm(simulations):
-                    s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                    pool.apply_async(
-                        simulation.prepare_view_visualizations,
-                        kwds={
-                            **kwargs,
-                            "working_dir": s_dir_path,
-                        },
-                        # TODO: Move error callback to flow_3d class
-                        # error_callback=self.error_callback
-                    )
-                pool.close()
-                pool.join()
+        simulations = kwargs.pop("simulations")
 
-        else:
-            for simulation in tqdm(simulations):
-                s_dir_path = os.path.join(self.workspace_path, simulation.name)
-                simulation.prepare_view_visualizations(working_dir=s_dir_path, **kwargs)
+        return self.map_simulations(
+            "prepare_view_visualizations", simulations, num_proc=num_proc, **kwargs
+        )
 
     @WorkspaceUtils.with_simulations
     def visualize_all_generate_views_visualizations(
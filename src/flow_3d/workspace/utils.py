@@ -1,38 +1,26 @@
-import os
-import pickle
-
-from pathlib import Path
-
-
 class WorkspaceUtils:
 
     def with_simulations(func):
         """
         Decorator for sorting and retrieving simulations within workspace.
+
+        @param where: Filter on index, e.g., "power>200 and status=npz_done"
         """
 
-        def wrapper(self, *args, **kwargs):
+        def wrapper(self, *args, where=None, **kwargs):
 
-            # Only consider directories and skip over possible files.
-            simulation_folders = sorted(
-                [s.name for s in Path(self.workspace_path).iterdir() if s.is_dir()]
-            )
+            # Selects simulations from workspace index rather than unpickling
+            # every simulation folder, i.e. `where="power>200"`.
+            entries = self.index_select(where)
 
             if self.verbose:
-                print(
-                    f"Simulation Folders ({len(simulation_folders)}): {simulation_folders}"
-                )
+                names = [entry["name"] for entry in entries]
+                print(f"Simulations ({len(names)}): {names}")
 
             # Load simulations
             simulations = []
-            for simulation_folder in simulation_folders:
-
-                # Load simulation object
-                s_dir_path = os.path.join(self.workspace_path, simulation_folder)
-                s_pkl_path = os.path.join(s_dir_path, f"simulation.pkl")
-                with open(s_pkl_path, "rb") as file:
-                    simulation = pickle.load(file)
-                    simulations.append(simulation)
+            for entry in entries:
+                simulations.append(self.load_indexed_simulation(entry))
 
             kwargs = {
                 "simulations": simulations,
@@ -0,0 +1,20 @@
+import pytest
+
+from flow_3d.simulation import Simulation
+
+from flslnk import write_flslnk
+
+
+@pytest.fixture
+def simulation():
+    return Simulation(name="test")
+
+
+@pytest.fixture
+def flslnk_npz_path(simulation, tmp_path):
+    """
+    Simulation folder with `flslnk_npz.zip` of 3 generated timesteps.
+    """
+    write_flslnk(tmp_path / "flslnk.tmp", num_timesteps=3)
+    simulation.flslnk_to_npz(working_dir=tmp_path)
+    return tmp_path
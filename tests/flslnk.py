@@ -0,0 +1,64 @@
+"""
+Helpers for writing generated flslnk files used within tests.
+"""
+
+import numpy as np
+
+COLUMNS = [
+    "x",
+    "y",
+    "z",
+    "p",
+    "tn",
+    "f",
+    "rho",
+    "scl4",
+    "scl5",
+    "scl6",
+    "scl7",
+    "scl8",
+    "u",
+    "v",
+    "w",
+    "nfs",
+]
+
+
+def chunk_lines(t=5.52563142e-06, shape=(4, 3, 5), seed=0):
+    """
+    Lines of flslnk chunk with `x` varying fastest, then `y` and `z`.
+    """
+    rng = np.random.default_rng(seed)
+    z_length, y_length, x_length = shape
+
+    lines = [
+        " flslnk\n",
+        f"  printing tn, scl4 and nfs       t={t:.8E}  ix=2 to  {x_length + 1}\n",
+        f" 2        2      {t:.3E}      {t:.3E}        2      {x_length + 1}\n",
+        "  ".join(COLUMNS) + "\n",
+    ]
+    for k in range(z_length):
+        for j in range(y_length):
+            for i in range(x_length):
+                values = [i * 2e-3, j * 2e-3, k * 2e-3]
+                values += list(rng.uniform(0, 3000, len(COLUMNS) - 3))
+                lines.append("  ".join(f"{v:.6E}" for v in values) + "\n")
+
+    return lines
+
+
+def write_chunk(path, **kwargs):
+    with open(path, "w") as f:
+        f.writelines(chunk_lines(**kwargs))
+
+
+def write_flslnk(path, num_timesteps=3):
+    """
+    Writes `flslnk.tmp` with metadata chunk, timestep chunks and trailer chunk.
+    """
+    with open(path, "w") as f:
+        f.write(" flslnk metadata\n\n")
+        for index in range(num_timesteps):
+            f.writelines(chunk_lines(t=(index + 1) * 5e-06, seed=index))
+            f.write("\n\n")
+        f.write(" end of flslnk\n")
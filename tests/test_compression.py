@@ -0,0 +1,59 @@
+import os
+import pytest
+import zipfile
+
+from flow_3d.simulation import Simulation
+
+
+@pytest.fixture
+def simulation():
+    return Simulation(name="test")
+
+
+@pytest.fixture
+def source(tmp_path):
+    source_path = tmp_path / "flslnk.tmp"
+    with open(source_path, "wb") as f:
+        f.write(os.urandom(1024) * 2048)
+    return source_path
+
+
+@pytest.mark.parametrize("codec", ["stored", "deflated", "bzip2", "lzma"])
+def test_compress_file_zip_codecs(simulation, source, tmp_path, codec):
+    name = str(tmp_path / "flslnk")
+    compressed_file_path = simulation.compress_file(source, name, codec=codec)
+
+    assert compressed_file_path == f"{name}.zip"
+    assert simulation.find_compressed_file(name) == compressed_file_path
+
+    with simulation.open_compressed_file(name) as f:
+        assert f.read() == source.read_bytes()
+
+
+def test_compress_file_zstd(simulation, source, tmp_path):
+    pytest.importorskip("zstandard")
+
+    name = str(tmp_path / "flsgrf")
+    compressed_file_path = simulation.compress_file(
+        source, name, codec="zstd", num_threads=2
+    )
+    assert compressed_file_path == f"{name}.zst"
+
+    destination = tmp_path / "flsgrf.simulation"
+    simulation.decompress_file(name, destination)
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_open_compressed_file_combines_members(simulation, tmp_path):
+    name = str(tmp_path / "flsgrf")
+    with zipfile.ZipFile(f"{name}.zip", "w") as zip_ref:
+        zip_ref.writestr("part_0", b"abc" * 10)
+        zip_ref.writestr("part_1", b"def" * 10)
+
+    with simulation.open_compressed_file(name) as f:
+        assert f.read() == b"abc" * 10 + b"def" * 10
+
+
+def test_compress_file_unknown_codec(simulation, source, tmp_path):
+    with pytest.raises(Exception):
+        simulation.compress_file(source, str(tmp_path / "flslnk"), codec="gzip")
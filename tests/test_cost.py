@@ -0,0 +1,50 @@
+import pytest
+
+from flow_3d.simulation import Simulation
+from flow_3d.workspace import Workspace
+
+REPORT = """
+ restart and spatial data available at t= 1.00001E-03
+
+ end of calculation at   t =    1.00001E-03,     cycle =   44577
+  normal completion
+
+
+ flsgrf.simulation file size:   29 gb
+
+ elapsed time =    5.67105E+03 seconds, or
+                   0 days :  1 hours : 34 minutes : 31 seconds
+
+     cpu time =    1.79030E+05 seconds
+"""
+
+
+def test_cost_estimate():
+    estimate = Simulation().cost_estimate()
+    assert estimate["cells"] == 150 * 50 * 30
+    assert estimate["frames"] == 201
+    assert estimate["cycles"] == pytest.approx(44577, rel=1e-3)
+    assert estimate["elapsed"] == pytest.approx(5671.05, rel=1e-3)
+    assert estimate["output_bytes"] == pytest.approx(29 * 1024**3, rel=1e-3)
+
+    # Doubling the output interval halves the output frames.
+    simulation = Simulation(prepin_overrides={"xput": {"tpltd(1)": 1e-5}})
+    assert simulation.cost_frames() == 101
+
+
+def test_cost_calibrate(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    workspace.simulation_initialize("run", config={"power": 100})
+    workspace.simulation_initialize("pending", config={"power": 200})
+    (tmp_path / "run" / "report.simulation").write_text(
+        REPORT.replace("29 gb", "58 gb")
+    )
+
+    model = workspace.cost_calibrate()
+    assert [record["name"] for record in model["observed"]] == ["run"]
+    assert model["observed"][0]["cycle"] == 44577
+    assert model["observed"][0]["output_bytes"] == 58 * 1024**3
+
+    estimates = workspace.cost_estimate_all()
+    assert len(estimates) == 2
+    assert estimates[0]["output_bytes"] == pytest.approx(58 * 1024**3)
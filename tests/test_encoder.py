@@ -0,0 +1,50 @@
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+from flow_3d.simulation.encoder import (
+    GifFrameWriter,
+    SimulationFrameEncoder,
+    imageio_ffmpeg,
+)
+
+
+@pytest.mark.parametrize("in_process", [True, False])
+def test_encode_gif(tmp_path, in_process):
+    path = str(tmp_path / "temperature.gif")
+    frames = [np.full((6, 10, 3), 40 * index, dtype=np.uint8) for index in range(5)]
+
+    with SimulationFrameEncoder(path, fps=20, in_process=in_process, queue_size=2) as e:
+        for frame in frames:
+            e.append(frame)
+
+    assert e.count == 5
+    encoded = imageio.mimread(path)
+    assert len(encoded) == 5
+    for frame, encoded_frame in zip(frames, encoded):
+        assert np.array_equal(encoded_frame[..., :3], frame)
+
+
+def test_gif_frames_written_as_appended(tmp_path):
+    writer = GifFrameWriter(str(tmp_path / "temperature.gif"), fps=10)
+    rng = np.random.default_rng(0)
+
+    # Frames are written to the open file rather than kept until closed.
+    sizes = []
+    for _ in range(3):
+        writer.append(rng.integers(0, 255, (32, 32, 3), dtype=np.uint8))
+        sizes.append(writer.file.tell())
+    assert sizes[0] < sizes[1] < sizes[2]
+    assert not hasattr(writer, "frames")
+
+    writer.close()
+    assert len(imageio.mimread(str(tmp_path / "temperature.gif"))) == 3
+
+
+def test_encode_format(tmp_path):
+    with pytest.raises(Exception, match="Animation format"):
+        SimulationFrameEncoder(str(tmp_path / "temperature.avi"))
+
+    if imageio_ffmpeg is None:
+        with pytest.raises(ImportError):
+            SimulationFrameEncoder(str(tmp_path / "temperature.mp4"))
@@ -0,0 +1,78 @@
+import imageio.v2 as imageio
+import numpy as np
+
+from matplotlib import colormaps
+
+from flow_3d.simulation.frames import (
+    BAD_COLOR,
+    COLORBAR_WIDTH,
+    ISOMETRIC_SCALE,
+    TITLE_HEIGHT,
+    SimulationFrameRenderer,
+    SimulationIsometricRenderer,
+)
+
+
+def test_render_frame():
+    renderer = SimulationFrameRenderer("plasma", [300, 3000], label="temperature")
+    data = np.array([[0, 300, 1650], [3000, 5000, np.nan]])
+
+    frame = renderer.render(data, "Temperature (100 W, 1.0 m/s)")
+    assert frame.shape == (TITLE_HEIGHT + 2 * 4, 3 * 4 + COLORBAR_WIDTH, 3)
+    assert frame.dtype == np.uint8
+
+    body = frame[TITLE_HEIGHT:, : 3 * 4][::4, ::4]
+    colors = np.round(colormaps["plasma"]([0.0, 0.0, 0.5, 1.0, 1.0])[:, :3] * 255)
+    assert np.abs(body.reshape(-1, 3)[:5].astype(int) - colors).max() <= 1
+    assert tuple(body[1, 2]) == BAD_COLOR
+
+    # Strips are drawn once and reused.
+    renderer.render(data, "Temperature (100 W, 1.0 m/s)")
+    assert len(renderer.titles) == 1
+    assert len(renderer.colorbars) == 1
+
+
+def test_generate_views_visualizations(simulation, flslnk_npz_path):
+    views = ["isometric", "cross_section_xy", "cross_section_xz"]
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=views)
+    simulation.generate_views(
+        working_dir=flslnk_npz_path, views=views, slices={"cross_section_xy": 1}
+    )
+    simulation.prepare_view_visualizations(working_dir=flslnk_npz_path, views=views)
+    simulation.generate_views_visualizations(
+        working_dir=flslnk_npz_path,
+        views=views,
+        num_proc=2,
+        save_frames=True,
+        encoder_process=True,
+    )
+
+    for view in views:
+        gif_path = flslnk_npz_path / "visualizations" / view / "temperature.gif"
+        frames = imageio.mimread(gif_path)
+        assert len(frames) == 3
+
+        png_path = gif_path.parent / "temperature" / "0000.png"
+        assert imageio.imread(png_path).shape[:2] == frames[0].shape[:2]
+
+
+def test_isometric_renderer():
+    renderer = SimulationIsometricRenderer("plasma", [300, 3000])
+    volume = np.full((3, 2, 2), 200.0)
+    volume[1, 0, 1] = 1650
+
+    frame = renderer.render(volume, threshold=300)
+    body = frame[TITLE_HEIGHT:, :-COLORBAR_WIDTH]
+    height = (3 + 2) * ISOMETRIC_SCALE // 2 + 2 * ISOMETRIC_SCALE
+    assert body.shape == (height, (3 + 2) * ISOMETRIC_SCALE, 3)
+
+    # Only the single voxel above threshold is drawn, its top face brightest.
+    color = np.round(colormaps["plasma"](0.5)[:3] * np.array(255))
+    drawn = body[(body != 255).any(axis=-1)].astype(int)
+    assert len(drawn) == 3 * ISOMETRIC_SCALE**2
+    assert np.abs(drawn.max(axis=0) - color).max() <= 1
+
+    # Faces hidden behind a nearer voxel are not drawn.
+    volume[1, 0, 0] = 1650
+    body = renderer.render(volume, threshold=300)[TITLE_HEIGHT:, :-COLORBAR_WIDTH]
+    assert (body != 255).any(axis=-1).sum() == 5 * ISOMETRIC_SCALE**2
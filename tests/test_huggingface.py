@@ -0,0 +1,28 @@
+import numpy as np
+import os
+import zipfile
+
+from datasets import Array3D, Array4D, Value, load_from_disk
+
+
+def test_create_flslnk_dataset(simulation, flslnk_npz_path):
+    dataset_path = simulation.create_flslnk_dataset(
+        working_dir=flslnk_npz_path, delete_output=False
+    )
+    dataset = load_from_disk(flslnk_npz_path / dataset_path)
+
+    assert len(dataset) == 3
+    assert isinstance(dataset.features["temperature"], Array3D)
+    assert isinstance(dataset.features["x_y_z"], Array4D)
+    assert isinstance(dataset.features["power"], Value)
+    assert not os.path.exists(flslnk_npz_path / "flslnk_dataset_cache")
+    assert os.path.exists(flslnk_npz_path / "flslnk_dataset.zip")
+
+    with zipfile.ZipFile(flslnk_npz_path / "flslnk_npz.zip") as zip_ref:
+        for index, npz_file in enumerate(sorted(zip_ref.namelist())):
+            with zip_ref.open(npz_file) as f:
+                npz_data = np.load(f)
+                for key in npz_data.files:
+                    assert np.array_equal(
+                        np.asarray(dataset[index][key]), npz_data[key][0]
+                    )
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from skimage import measure
+
+
+def largest_blob_by_image(image):
+    """
+    Previous skimage implementation of largest blob used as reference.
+    """
+    labels_all = measure.label(image)
+    regionprops = measure.regionprops(labels_all)
+
+    blob_max_area = 0
+    for index, blob in enumerate(regionprops):
+        if blob.area > blob_max_area:
+            blob_max_area_index = index
+            blob_max_area = blob.area
+
+    blob_max = regionprops[blob_max_area_index]
+    labels_max_blob = np.where(labels_all == blob_max.label, 1, 0)
+
+    return labels_all, labels_max_blob, blob_max.bbox
+
+
+def test_largest_blobs_matches_skimage(simulation):
+    rng = np.random.default_rng(0)
+    projections = rng.uniform(size=(16, 20, 30)) > 0.55
+
+    output = simulation.largest_blobs(projections)
+
+    for index, image in enumerate(projections):
+        labels_all, labels_max_blob, bbox = largest_blob_by_image(image)
+        assert np.array_equal(output["labels_all"][index], labels_all)
+        assert np.array_equal(output["labels_max_blob"][index], labels_max_blob)
+        assert tuple(output["bbox"][index]) == bbox
+
+
+def test_generate_melt_pool_measurements(simulation, flslnk_npz_path):
+    simulation.prepare_melt_pool_measurements(working_dir=flslnk_npz_path)
+    simulation.generate_melt_pool_measurements(
+        working_dir=flslnk_npz_path, num_proc=2, batch_size=2
+    )
+
+    df = pd.read_parquet(flslnk_npz_path / "measurements/melt_pool/temperature.parquet")
+    df = df.sort_values("timestep")
+    assert list(df["timestep"]) == ["00000001", "00000002", "00000003"]
+
+    results = simulation.load_results(flslnk_npz_path / "flslnk_npz")
+    for example, row in zip(results, df.itertuples()):
+        thresholded = example["temperature"][0] > 1697
+        xy = np.flip(thresholded.any(axis=0), axis=(0, 1))
+        xz = np.flip(thresholded.any(axis=1), axis=(0, 1))
+        _, _, bbox_xy = largest_blob_by_image(xy)
+        _, _, bbox_xz = largest_blob_by_image(xz)
+
+        assert row.width_px == bbox_xy[2] - bbox_xy[0]
+        assert row.length_px == bbox_xy[3] - bbox_xy[1]
+        assert row.depth_px == bbox_xz[2] - bbox_xz[0]
+        assert row.depth_m == row.depth_px * simulation.mesh_size
+
+
+def test_interpolated_extents(simulation):
+    # Linear field crossing zero at rows 0.5 and 4.5, columns 2.5 and 6.5.
+    rows, cols = np.meshgrid(np.arange(6), np.arange(10), indexing="ij")
+    fields = (100 - 40 * np.abs(cols - 4.5) - 40 * np.abs(rows - 2.5))[np.newaxis]
+
+    extents = simulation.interpolated_extents(fields, fields > 0, threshold=0)
+
+    assert np.allclose(extents, [[4.0, 4.0]])
+
+
+def test_generate_melt_pool_measurements_interpolate(simulation, flslnk_npz_path):
+    simulation.prepare_melt_pool_measurements(working_dir=flslnk_npz_path)
+    simulation.generate_melt_pool_measurements(
+        working_dir=flslnk_npz_path, batch_size=2, interpolate=True
+    )
+
+    df = pd.read_parquet(flslnk_npz_path / "measurements/melt_pool/temperature.parquet")
+    for dimension in ["depth", "length", "width"]:
+        interp = df[f"{dimension}_interp_m"] / simulation.mesh_size
+        # Sub-voxel extent lies within one voxel of the pixel extent.
+        assert (interp >= df[f"{dimension}_px"] - 1 - 1e-9).all()
+        assert (interp <= df[f"{dimension}_px"] + 1 + 1e-9).all()
+
+
+def test_generate_melt_pool_measurements_save_masks(simulation, flslnk_npz_path):
+    simulation.prepare_melt_pool_measurements(working_dir=flslnk_npz_path)
+    simulation.generate_melt_pool_measurements(
+        working_dir=flslnk_npz_path, save_masks=True
+    )
+
+    df = pd.read_parquet(flslnk_npz_path / "measurements/melt_pool/temperature.parquet")
+    results = simulation.load_results(flslnk_npz_path / "flslnk_npz")
+    for row in df.itertuples():
+        thresholded = results[row.timestep]["temperature"][0] > 1697
+        xy = np.flip(thresholded.any(axis=0), axis=(0, 1))
+        labels_all, labels_max_blob, bbox = largest_blob_by_image(xy)
+
+        mask = simulation.unpack_mask(row.mask_xy, row.mask_shape_xy)
+        mask_max_blob = simulation.unpack_mask(row.mask_max_blob_xy, row.mask_shape_xy)
+        assert np.array_equal(mask, labels_all > 0)
+        assert np.array_equal(mask_max_blob, labels_max_blob > 0)
+        assert tuple(row.bbox_xy) == bbox
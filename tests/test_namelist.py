@@ -0,0 +1,51 @@
+import pytest
+import yaml
+
+from flow_3d.simulation import Simulation
+from flow_3d.simulation.namelist import SimulationNamelist
+from flow_3d.workspace import Workspace
+
+
+def test_namelist_edits():
+    content = Simulation().prepin_file_content
+    namelist = SimulationNamelist(content)
+
+    assert str(namelist) == content
+    assert namelist.get("xput", "tpltd(1)") == 5e-06
+    assert namelist.get("bcdata", "tbct(1, 6)") == 299.15
+    assert namelist.get("mesh", "px(2)") == 0.3
+    assert namelist.get("props", "fluid1") == "Fe-316_Stainless_Steel-Mills data"
+
+    namelist.update({"xput": {"tpltd(1)": 1e-5, "tpltd(2)": 2e-5}})
+    assert namelist.get("xput", "tpltd(1)") == 1e-5
+    assert namelist.validate()["xput"]["tpltd"] == [1e-5, 2e-5]
+    assert namelist.diff(content) == {
+        "xput": {"tpltd(1)": (1e-5, 5e-06), "tpltd(2)": (2e-5, None)}
+    }
+    # Material tables are kept.
+    assert str(namelist).endswith(content.split("#start tables")[1])
+
+    with pytest.raises(Exception, match="expects int"):
+        namelist.set("xput", "ifvof", 1.5)
+    with pytest.raises(Exception, match="not in"):
+        namelist.set("missing", "ifvof", 1)
+
+
+def test_simulation_build_prepin_overrides(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    for power in [100, 200]:
+        workspace.simulation_initialize(f"p{power}", config={"power": power})
+
+    assert sorted(workspace.simulation_build_all()) == ["p100", "p200"]
+    assert workspace.simulation_build_all() == []
+
+    config_path = tmp_path / "p200" / "simulation.yml"
+    config = yaml.safe_load(config_path.read_text())
+    config["prepin"] = {"xput": {"tpltd(1)": 1e-5}}
+    config_path.write_text(yaml.dump(config))
+
+    assert workspace.simulation_build_all() == ["p200"]
+
+    diff = workspace.simulation_prepin_diff("p100", "p200")
+    assert diff["xput"] == {"tpltd(1)": (5e-06, 1e-5)}
+    assert diff["weld"] == {"powlbm(1,1)": (1e9, 2e9)}
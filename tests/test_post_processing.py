@@ -0,0 +1,245 @@
+import copy
+import numpy as np
+import os
+import pandas as pd
+import pytest
+import zipfile
+
+from flslnk import write_chunk, write_flslnk
+
+
+def df_to_numpy_by_row(df):
+    """
+    Previous row by row implementation of `df_to_numpy` used as reference.
+    """
+    dtdx_dtdy_dtdz_timestep, dtdx_dtdy_dtdz_z, dtdx_dtdy_dtdz_y = [], [], []
+    x_y_z_timestep, x_y_z_z, x_y_z_y = [], [], []
+    vx_vy_vz_timestep, vx_vy_vz_z, vx_vy_vz_y = [], [], []
+
+    keys = [
+        "pressure",
+        "temperature",
+        "melt_region",
+        "temperature_gradient",
+        "liquid_label",
+        "fraction_of_fluid",
+    ]
+    values = {"timestep": [], "z": [], "y": []}
+    key_values = {key: copy.deepcopy(values) for key in keys}
+
+    prev_z = None
+    prev_y = None
+
+    for i in range(len(df)):
+        row = df.iloc[i]
+        z, y = row["z"], row["y"]
+
+        if y != prev_y and prev_y is not None:
+            dtdx_dtdy_dtdz_z.append(dtdx_dtdy_dtdz_y)
+            dtdx_dtdy_dtdz_y = []
+            x_y_z_z.append(x_y_z_y)
+            x_y_z_y = []
+            vx_vy_vz_z.append(vx_vy_vz_y)
+            vx_vy_vz_y = []
+            for key in keys:
+                key_values[key]["z"].append(key_values[key]["y"])
+                key_values[key]["y"] = []
+
+        if z != prev_z and prev_z is not None:
+            dtdx_dtdy_dtdz_timestep.append(dtdx_dtdy_dtdz_z)
+            dtdx_dtdy_dtdz_z = []
+            x_y_z_timestep.append(x_y_z_z)
+            x_y_z_z = []
+            vx_vy_vz_timestep.append(vx_vy_vz_z)
+            vx_vy_vz_z = []
+            for key in keys:
+                key_values[key]["timestep"].append(key_values[key]["z"])
+                key_values[key]["z"] = []
+
+        dtdx_dtdy_dtdz_y.append([row["dtdx"], row["dtdy"], row["dtdz"]])
+        x_y_z_y.append([row["x"], row["y"], row["z"]])
+        vx_vy_vz_y.append([row["vx"], row["vy"], row["vz"]])
+        for key in keys:
+            key_values[key]["y"].append(row[key])
+
+        prev_z = z
+        prev_y = y
+
+    timestep = {key: [np.array(key_values[key]["timestep"])] for key in keys}
+    other = {
+        "dtdx_dtdy_dtdz": [np.array(dtdx_dtdy_dtdz_timestep)],
+        "x_y_z": [np.array(x_y_z_timestep)],
+        "vx_vy_vz": [np.array(vx_vy_vz_timestep)],
+    }
+    return {**timestep, **other}
+
+
+@pytest.fixture
+def chunk_df(tmp_path):
+    chunk_file_path = tmp_path / "000000000001.txt"
+    write_chunk(chunk_file_path)
+    df = pd.read_csv(chunk_file_path, skiprows=3, sep=r"\s+", dtype=float)
+    return df.rename(
+        columns={
+            "p": "pressure",
+            "tn": "temperature",
+            "f": "fraction_of_fluid",
+            "rho": "density",
+            "scl4": "melt_region",
+            "scl5": "temperature_gradient",
+            "scl6": "dtdx",
+            "scl7": "dtdy",
+            "scl8": "dtdz",
+            "u": "vx",
+            "v": "vy",
+            "w": "vz",
+            "nfs": "liquid_label",
+        }
+    )
+
+
+def test_df_to_numpy_matches_row_by_row(simulation, chunk_df):
+    expected = df_to_numpy_by_row(chunk_df)
+    output = simulation.df_to_numpy(chunk_df)
+
+    assert output.keys() == expected.keys()
+    for key in expected:
+        assert output[key][0].shape == expected[key][0].shape
+        assert output[key][0].dtype == expected[key][0].dtype
+        assert np.array_equal(output[key][0], expected[key][0])
+
+
+def test_df_to_numpy_shapes(simulation, chunk_df):
+    output = simulation.df_to_numpy(chunk_df)
+
+    assert output["temperature"][0].shape == (3, 3, 5)
+    assert output["x_y_z"][0].shape == (3, 3, 5, 3)
+
+
+def test_df_to_numpy_rejects_incomplete_grid(simulation, chunk_df):
+    with pytest.raises(Exception):
+        simulation.df_to_numpy(chunk_df.iloc[:-1])
+
+
+def test_process_chunk_file(simulation, tmp_path):
+    chunk_file_path = tmp_path / "000000000001.txt"
+    write_chunk(chunk_file_path)
+
+    simulation.process_chunk_file(chunk_file_path, tmp_path / "000000000001")
+
+    npz_data = np.load(tmp_path / "000000000001.npz")
+    assert npz_data["temperature"].shape == (1, 3, 3, 5)
+    assert npz_data["timestep"][0] == pytest.approx(5.526e-06)
+    assert npz_data["power"][0] == simulation.power
+
+
+def test_flslnk_to_npz_matches_chunks(simulation, tmp_path):
+    chunks_path = tmp_path / "chunks"
+    stream_path = tmp_path / "stream"
+    os.makedirs(chunks_path)
+    os.makedirs(stream_path)
+
+    write_flslnk(chunks_path / "flslnk.tmp")
+    simulation.chunk_flslnk(working_dir=chunks_path, delete_output=False)
+    simulation.flslnk_chunk_to_npz(working_dir=chunks_path, delete_output=False)
+
+    # Streams straight from `flslnk.zip` without `flslnk.tmp`.
+    write_flslnk(tmp_path / "flslnk.tmp")
+    with zipfile.ZipFile(stream_path / "flslnk.zip", "w") as zip_ref:
+        zip_ref.write(tmp_path / "flslnk.tmp", "flslnk.tmp")
+    simulation.flslnk_to_npz(working_dir=stream_path, delete_output=False)
+
+    npz_files = sorted(os.listdir(chunks_path / "flslnk_npz"))
+    assert len(npz_files) == 3
+    assert sorted(os.listdir(stream_path / "flslnk_npz")) == npz_files
+    assert not os.path.exists(stream_path / "flslnk_chunks.zip")
+
+    for npz_file in npz_files:
+        expected = np.load(chunks_path / "flslnk_npz" / npz_file)
+        output = np.load(stream_path / "flslnk_npz" / npz_file)
+        assert output.files == expected.files
+        for key in expected.files:
+            assert np.array_equal(output[key], expected[key])
+
+
+def test_flslnk_chunk_to_npz_num_proc(simulation, tmp_path):
+    write_flslnk(tmp_path / "flslnk.tmp", num_timesteps=4)
+    simulation.chunk_flslnk(working_dir=tmp_path, delete_output=False)
+
+    # Corrupt one chunk so that it fails without stopping other chunks.
+    with open(tmp_path / "flslnk_chunks" / "00000002.txt", "w") as f:
+        f.write("corrupt\n")
+
+    simulation.flslnk_chunk_to_npz(
+        working_dir=tmp_path, num_proc=2, max_in_flight=2, delete_output=False
+    )
+
+    npz_files = sorted(os.listdir(tmp_path / "flslnk_npz"))
+    assert npz_files == ["00000001.npz", "00000003.npz", "00000004.npz"]
+
+    # Source chunks are kept when any chunk fails.
+    assert os.path.isdir(tmp_path / "flslnk_chunks")
+
+
+def test_build_flslnk_store(simulation, tmp_path):
+    write_flslnk(tmp_path / "flslnk.tmp", num_timesteps=3)
+    simulation.flslnk_to_npz(working_dir=tmp_path)
+
+    # Builds straight from `flslnk_npz.zip` after the folder is deleted.
+    assert not os.path.exists(tmp_path / "flslnk_npz")
+    manifest = simulation.build_flslnk_store(working_dir=tmp_path)
+
+    assert manifest["timesteps"] == ["00000001", "00000002", "00000003"]
+    assert manifest["fields"]["temperature"]["shape"] == [3, 3, 3, 5]
+
+    store_dir_path = tmp_path / "flslnk_store"
+    assert simulation.load_flslnk_store_manifest(store_dir_path) == manifest
+
+    temperature = simulation.load_flslnk_store("temperature", store_dir_path)
+    assert isinstance(temperature, np.memmap)
+
+    with zipfile.ZipFile(tmp_path / "flslnk_npz.zip") as zip_ref:
+        with zip_ref.open("00000002.npz") as f:
+            npz_data = np.load(f)
+            assert np.array_equal(temperature[1], npz_data["temperature"][0])
+            assert np.array_equal(
+                temperature[1, :, 1], npz_data["temperature"][0][:, 1]
+            )
+
+    timestep = simulation.load_flslnk_store("timestep", store_dir_path)
+    assert timestep.shape == (3,)
+
+
+def test_flslnk_to_npz_resumes_from_manifest(simulation, tmp_path):
+    write_flslnk(tmp_path / "flslnk.tmp", num_timesteps=3)
+    kwargs = {"working_dir": tmp_path, "delete_source": False, "zip_output": False}
+    simulation.flslnk_to_npz(delete_output=False, **kwargs)
+
+    status = simulation.check_status(tmp_path)
+    assert status["post_process_create_npz_completed"]
+    assert status["progress"]["flslnk_npz"] == {
+        "completed": 3,
+        "total": 3,
+        "done": True,
+    }
+
+    # Interrupted after the first two timesteps were recorded.
+    manifest_path = tmp_path / "flslnk_npz.manifest.jsonl"
+    lines = manifest_path.read_text().splitlines(keepends=True)
+    manifest_path.write_text("".join(lines[:2]) + '{"name": "0000')
+    os.remove(tmp_path / "flslnk_npz" / "00000003.npz")
+    mtime = os.path.getmtime(tmp_path / "flslnk_npz" / "00000001.npz")
+
+    status = simulation.check_status(tmp_path)
+    assert not status["post_process_create_npz_completed"]
+    assert status["progress"]["flslnk_npz"]["completed"] == 2
+
+    simulation.flslnk_to_npz(delete_output=False, **kwargs)
+
+    assert os.path.getmtime(tmp_path / "flslnk_npz" / "00000001.npz") == mtime
+    assert os.path.exists(tmp_path / "flslnk_npz" / "00000003.npz")
+    assert simulation.check_status(tmp_path)["progress"]["flslnk_npz"] == {
+        "completed": 3,
+        "total": 3,
+        "done": True,
+    }
@@ -0,0 +1,37 @@
+import pickle
+import pytest
+
+from flow_3d.simulation import Simulation
+from flow_3d.simulation.prepin import SimulationPrepin, SimulationPrepinTemplate
+
+
+def test_prepin_template_render():
+    template = SimulationPrepinTemplate("a=<POWER>, b=<MESH_SIZE>, c=<POWER>")
+    assert template.keys == ["power", "mesh_size", "power"]
+    assert template.render({"power": 1e9, "mesh_size": 0.002}) == (
+        "a=1000000000.0, b=0.002, c=1000000000.0"
+    )
+
+    with pytest.raises(Exception, match="unfilled"):
+        template.render({"power": 1e9})
+
+    with pytest.raises(Exception, match="unknown placeholders"):
+        SimulationPrepinTemplate("a=<POWER>, b=<LASER_POWER>")
+
+
+def test_build_prepins_matches_simulation():
+    grid = [{"power": power, "velocity": 0.8} for power in [100, 150, 200]]
+    prepins = list(SimulationPrepin.build_prepins(grid, template_id="N07718"))
+
+    for parameters, prepin in zip(grid, prepins):
+        simulation = Simulation(template_id="N07718", **parameters)
+        assert prepin == simulation.prepin_file_content
+        assert "<POWER>" not in prepin
+
+    assert prepins[0] != prepins[1]
+
+    # Content is rendered on access rather than pickled.
+    assert b"prepin_file_content" not in pickle.dumps(simulation)
+
+    with pytest.raises(Exception, match="Unknown process parameters"):
+        list(SimulationPrepin.build_prepins([{"laser_power": 100}]))
@@ -0,0 +1,77 @@
+import json
+import numpy as np
+import os
+import pytest
+
+from flow_3d.simulation.utils.profile import (
+    CLEAR_REFS_PATH,
+    PROFILE_ENV,
+    PROFILE_FILENAME,
+    SimulationUtilsProfile,
+)
+from flow_3d.workspace import Workspace
+
+
+def test_profile_stages(simulation, flslnk_npz_path, tmp_path, monkeypatch):
+    profile_path = tmp_path / PROFILE_FILENAME
+    monkeypatch.setenv(PROFILE_ENV, str(profile_path))
+
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=["cross_section_xz"])
+    simulation.generate_views(working_dir=flslnk_npz_path, views=["cross_section_xz"])
+    # Working directory is not restored when the method raises.
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        simulation.generate_views(working_dir=flslnk_npz_path, npz_dir_path="missing")
+
+    with open(profile_path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert [record["stage"] for record in records] == ["views", "views"]
+    assert [record["status"] for record in records] == ["success", "error"]
+    assert records[0]["name"] == "test"
+    assert records[0]["wall"] > 0
+    assert records[0]["peak_rss"] > 0
+    assert records[0]["write_bytes"] > 0
+
+    summary = Workspace(workspace_path=str(tmp_path)).profile_summary()
+    assert summary["stages"]["views"]["count"] == 2
+    assert summary["stages"]["views"]["failed"] == 1
+    assert len(summary["slowest"]) == 2
+
+
+def test_profile_disabled(simulation, flslnk_npz_path, tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=["cross_section_xz"])
+    simulation.generate_views(working_dir=flslnk_npz_path, views=["cross_section_xz"])
+
+    with pytest.raises(FileNotFoundError):
+        Workspace(workspace_path=str(tmp_path)).profile_summary()
+
+
+@pytest.mark.skipif(
+    not os.path.exists(CLEAR_REFS_PATH), reason="Peak RSS reset is Linux only."
+)
+def test_profile_peak_rss_per_stage(tmp_path, monkeypatch):
+    profile_path = tmp_path / PROFILE_FILENAME
+    monkeypatch.setenv(PROFILE_ENV, str(profile_path))
+
+    class Stages:
+        name = "test"
+
+        @SimulationUtilsProfile.profile_stage("heavy")
+        def heavy(self):
+            np.ones(256 * 1024**2, dtype=np.uint8).sum()
+
+        @SimulationUtilsProfile.profile_stage("light")
+        def light(self):
+            pass
+
+    Stages().heavy()
+    Stages().light()
+
+    with open(profile_path) as f:
+        heavy, light = [json.loads(line) for line in f]
+
+    # Later stages of a reused process do not report earlier peaks.
+    assert heavy["peak_rss"] > 256 * 1024**2
+    assert light["peak_rss"] < heavy["peak_rss"] - 128 * 1024**2
@@ -0,0 +1,126 @@
+import json
+import os
+import pytest
+import time
+
+from flow_3d.simulation.report import (
+    PERFORMANCE_FILENAME,
+    PROGRESS_SAMPLE_FILENAME,
+    SimulationReport,
+    SimulationReportFollower,
+)
+from flow_3d.simulation.status import SimulationStatus
+
+PROGRESS = "".join(
+    f" restart and spatial data available at t= {t:.5E}\n"
+    f"   t= {t:.5E}  cycle= {cycle}  dt= 2.00000E-08\n"
+    for t, cycle in [(1e-4, 5000), (2e-4, 10000), (3e-4, 15000)]
+)
+
+SUMMARY = """
+ end of calculation at   t =    1.00001E-03,     cycle =   44577
+  normal completion
+
+ flsgrf.simulation file size:   29 gb
+
+ elapsed time =    5.67105E+03 seconds, or
+                   0 days :  1 hours : 34 minutes : 31 seconds
+
+     cpu time =    1.79030E+05 seconds
+"""
+
+
+def test_report_follower(tmp_path):
+    report_path = tmp_path / "report.simulation"
+    report_path.write_text(PROGRESS[:-10])
+
+    follower = SimulationReportFollower(str(report_path), finish_time=1e-3)
+    assert follower.poll() == len(PROGRESS) - 10
+    assert follower.progress()["cycle"] == 10000
+
+    with open(report_path, "a") as f:
+        f.write(PROGRESS[-10:])
+    # Only appended bytes are read, completing the partial line.
+    assert follower.poll() == 10
+    assert follower.poll() == 0
+
+    progress = follower.progress()
+    assert progress["time"] == 3e-4
+    assert progress["cycle"] == 15000
+    assert progress["timestep"] == 2e-8
+    assert progress["frames"] == 3
+    assert progress["percent"] == 30.0
+
+    # Stdout lines of the same frames are not counted twice.
+    follower.feed(" restart and spatial data available at t= 3.00000E-04")
+    assert follower.progress()["frames"] == 3
+
+    with open(report_path, "a") as f:
+        f.write(SUMMARY)
+    follower.poll()
+
+    record = follower.record(name="test")
+    assert record["completed"]
+    assert record["cycle"] == 44577
+    assert record["output_bytes"] == 29 * 1024**3
+    assert record["cycles_per_second"] == 44577 / 5671.05
+    assert record["cpu_utilization"] == 179030 / 5671.05
+
+    summary = SimulationReport.read_summary(str(report_path), tail_bytes=512)
+    assert summary["completed"]
+    assert summary["elapsed"] == 5671.05
+
+
+def test_report_status_and_runhyd(simulation, tmp_path, monkeypatch):
+    # Stand-in solver writing progress to stdout and report.
+    bin_path = tmp_path / "bin"
+    bin_path.mkdir()
+    runhyd_path = bin_path / "runhyd"
+    runhyd_path.write_text(
+        "#!/bin/sh\n"
+        f"printf '{PROGRESS}'\n"
+        f"printf '{PROGRESS + SUMMARY}' > report.$1\n"
+        "printf 'output' > flsgrf.$1\n"
+    )
+    runhyd_path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_path}{os.pathsep}{os.environ['PATH']}")
+
+    s_dir_path = tmp_path / "simulation"
+    s_dir_path.mkdir()
+    assert simulation.runhyd(working_dir=str(s_dir_path)) == "success"
+
+    with open(s_dir_path / PERFORMANCE_FILENAME) as f:
+        record = json.load(f)
+    assert record["completed"]
+    assert record["frames"] == 3
+    assert record["returncode"] == 0
+    assert os.path.exists(s_dir_path / PROGRESS_SAMPLE_FILENAME)
+
+    assert SimulationStatus.check_status(str(s_dir_path))["completed"]
+
+    progress = SimulationReport.read_progress(
+        str(s_dir_path / "report.simulation"), finish_time=1e-3
+    )
+    assert progress["percent"] == 100
+
+
+def test_read_progress_in_progress(tmp_path):
+    report_path = tmp_path / "report.simulation"
+    report_path.write_text(PROGRESS)
+    sample_path = tmp_path / PROGRESS_SAMPLE_FILENAME
+
+    # Solver started 60 s ago, `t = 3e-4` of `1e-3` after 60 s.
+    SimulationReport.write_sample(str(sample_path), (time.time() - 60, 0.0))
+    progress = SimulationReport.read_progress(
+        str(report_path), finish_time=1e-3, sample_path=str(sample_path)
+    )
+    assert progress["percent"] == 30.0
+    assert progress["eta"] == pytest.approx(140, rel=0.05)
+
+    # Without a solver start sample, the first read records one for the next.
+    os.remove(sample_path)
+    progress = SimulationReport.read_progress(
+        str(report_path), finish_time=1e-3, sample_path=str(sample_path)
+    )
+    assert progress["eta"] is None
+    assert json.loads(sample_path.read_text())["first"][1] == 3e-4
@@ -0,0 +1,49 @@
+import numpy as np
+import zipfile
+
+from flow_3d.simulation import SimulationResults
+
+
+def test_results_from_zip(flslnk_npz_path):
+    results = SimulationResults(flslnk_npz_path / "flslnk_npz")
+
+    assert results.source == "zip"
+    assert len(results) == 3
+    assert results[-1].name == results.names[2]
+    assert "temperature" in results.keys()
+
+    with zipfile.ZipFile(flslnk_npz_path / "flslnk_npz.zip") as zip_ref:
+        zip_ref.extractall(flslnk_npz_path / "flslnk_npz")
+
+    folder_results = SimulationResults(flslnk_npz_path / "flslnk_npz")
+    assert folder_results.source == "npz"
+
+    for example, folder_example in zip(results, folder_results):
+        assert np.array_equal(example["temperature"], folder_example["temperature"])
+
+
+def test_results_from_store(simulation, flslnk_npz_path):
+    simulation.build_flslnk_store(working_dir=flslnk_npz_path)
+    npz_results = SimulationResults(
+        flslnk_npz_path / "flslnk_npz", store_dir_path=flslnk_npz_path / "missing"
+    )
+    results = SimulationResults(
+        flslnk_npz_path / "flslnk_npz", flslnk_npz_path / "flslnk_store"
+    )
+
+    assert results.source == "store"
+    assert results.names == npz_results.names
+    assert np.array_equal(results[1]["temperature"], npz_results[1]["temperature"])
+
+
+def test_results_cache_evicts_least_recently_used(flslnk_npz_path):
+    results = SimulationResults(flslnk_npz_path / "flslnk_npz")
+    nbytes = results[0]["temperature"].nbytes
+    results.cache_size = 2 * nbytes
+
+    results[1]["temperature"]
+    results[0]["temperature"]
+    results[2]["temperature"]
+
+    assert list(results.cache.keys()) == [(0, "temperature"), (2, "temperature")]
+    assert results.cache_bytes == 2 * nbytes
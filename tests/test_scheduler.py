@@ -0,0 +1,76 @@
+import time
+
+from flow_3d.workspace.scheduler import WorkspaceRunScheduler
+
+
+def solver(name):
+    time.sleep(0.05)
+    return {"skip": "skipped", "error": "error"}.get(name, "success")
+
+
+def post(name):
+    if name == "fail":
+        raise Exception(f"{name} failed")
+    time.sleep(0.05)
+
+
+def test_scheduler_pipelines_stages():
+    scheduler = WorkspaceRunScheduler(
+        {"solver": solver, "guipost": post, "convert": post},
+        stage_concurrency={"convert": 2},
+    )
+    report = scheduler.run(["a", "b", "skip", "fail", "error"])
+
+    summary = report["summary"]
+    assert summary["solver"]["count"] == 5
+    assert summary["guipost"]["count"] == 3
+    assert summary["convert"]["count"] == 2
+    assert sorted(report["failed"]) == ["error/solver", "fail/guipost"]
+
+    # Guipost of `a` runs while solver runs `b`.
+    timings = {(t["name"], t["stage"]): t for t in report["timings"]}
+    assert timings[("a", "guipost")]["start"] < timings[("b", "solver")]["end"]
+
+
+def test_scheduler_memory_budget():
+    scheduler = WorkspaceRunScheduler(
+        {"solver": solver, "convert": post},
+        stage_concurrency={"solver": 4, "convert": 4},
+        stage_resources={"convert": {"disk": 0, "memory": 2}},
+        memory_budget=3,
+    )
+    report = scheduler.run(["a", "b", "c"])
+
+    # Only one conversion fits within memory budget at a time.
+    convert = sorted(
+        [t for t in report["timings"] if t["stage"] == "convert"],
+        key=lambda t: t["start"],
+    )
+    assert len(convert) == 3
+    for previous, current in zip(convert, convert[1:]):
+        assert current["start"] >= previous["end"]
+
+
+def test_scheduler_holds_solver_disk():
+    scheduler = WorkspaceRunScheduler(
+        {"solver": solver, "guipost": post},
+        stage_concurrency={"solver": 2},
+        stage_resources={"guipost": {"disk": 4, "memory": 0}},
+        disk_budget=5,
+        job_resources={name: {"solver": {"disk": 3}} for name in ["a", "b"]},
+    )
+
+    # Solver output of `a` stays reserved until its guipost starts.
+    scheduler.reserved["disk"] = scheduler.held["a"] = 3
+    # Memory of a running job, so that budgets are checked.
+    scheduler.reserved["memory"] = 1
+    assert not scheduler.fits("solver", "b")
+    assert scheduler.fits("guipost", "a")
+    assert not scheduler.fits("guipost", "b")
+
+    scheduler.reserved = {"disk": 0, "memory": 0}
+    scheduler.held = {}
+    report = scheduler.run(["a", "b"])
+    assert report["summary"]["guipost"]["count"] == 2
+    assert scheduler.reserved == {"disk": 0, "memory": 0}
+    assert scheduler.held == {}
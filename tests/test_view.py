@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from flow_3d.simulation.store import SimulationStore
+from flow_3d.simulation.view import COLUMNS_CONFIG
+
+
+def test_generate_views(simulation, flslnk_npz_path):
+    views = ["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"]
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=views)
+    simulation.generate_views(
+        working_dir=flslnk_npz_path,
+        views=views,
+        slices={"cross_section_xy": 1, "cross_section_yz": -1},
+        num_proc=2,
+    )
+
+    results = simulation.load_results(flslnk_npz_path / "flslnk_npz")
+    views_path = flslnk_npz_path / "views"
+
+    for index, example in enumerate(results):
+        index_string = f"{index}".zfill(4)
+        temperature = example["temperature"][0]
+
+        isometric = np.load(
+            views_path / "isometric/temperature" / f"{index_string}.npz"
+        )
+        assert np.array_equal(isometric["data"], np.transpose(temperature, (2, 1, 0)))
+
+        for key in COLUMNS_CONFIG.keys():
+            values = example[key][0]
+            expected = {
+                "cross_section_xy": values[1, :, :],
+                "cross_section_xz": values[:, values.shape[1] // 2, :],
+                "cross_section_yz": values[:, :, -1],
+            }
+            for view, expected_array in expected.items():
+                data = np.load(views_path / view / key / f"{index_string}.npz")
+                assert np.array_equal(data["data"], expected_array[::-1, ::-1])
+
+
+def test_slice_index(simulation):
+    mesh = np.array([0.0, 0.002, 0.004, 0.006])
+
+    assert simulation.slice_index("midpoint", mesh) == 2
+    assert simulation.slice_index(-1, mesh) == 3
+    assert simulation.slice_index(0.005, mesh) == 2
+
+    with pytest.raises(Exception):
+        simulation.slice_index(4, mesh)
+
+
+def test_generate_views_beam(simulation, flslnk_npz_path, monkeypatch):
+    # Laser starts at 40 µm, mesh x ticks are every 20 µm.
+    simulation.beam_x = 4e-5
+    views = ["cross_section_yz", "beam_window"]
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=views)
+    simulation.generate_views(
+        working_dir=flslnk_npz_path,
+        views=views,
+        slices={"cross_section_yz": "beam"},
+        beam_window=(2e-5, 2e-5),
+    )
+
+    results = simulation.load_results(flslnk_npz_path / "flslnk_npz")
+    views_path = flslnk_npz_path / "views"
+
+    for index, example in enumerate(results):
+        index_string = f"{index}".zfill(4)
+        temperature = example["temperature"][0]
+
+        yz = np.load(
+            views_path / "cross_section_yz/temperature" / f"{index_string}.npz"
+        )
+        assert np.array_equal(yz["data"], temperature[:, :, 2][::-1, ::-1])
+
+        window = np.load(views_path / "beam_window/temperature" / f"{index_string}.npz")
+        assert window["x_start"] == 1
+        assert window["x_index"] == 2
+        assert np.array_equal(window["data"], temperature[:, :, 1:4])
+
+    monkeypatch.chdir(flslnk_npz_path)
+    with pytest.raises(Exception, match="can not follow laser"):
+        simulation.view_slice_indices(
+            ["cross_section_xz"], {"cross_section_xz": "beam"}
+        )
+
+
+class SliceOnlyField:
+    """
+    Store field that fails when copied whole, only cropped slices are read.
+    """
+
+    def __init__(self, array):
+        self.array = array
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple) and len(index) >= 3:
+            return self.array[index]
+        return SliceOnlyField(self.array[index])
+
+    def __array__(self, *args, **kwargs):
+        raise AssertionError("Whole field copied from store.")
+
+
+def test_generate_views_store_slices(simulation, flslnk_npz_path, monkeypatch):
+    simulation.build_flslnk_store(working_dir=flslnk_npz_path)
+
+    load_flslnk_store = SimulationStore.load_flslnk_store
+    monkeypatch.setattr(
+        SimulationStore,
+        "load_flslnk_store",
+        lambda key, *args, **kwargs: (
+            SliceOnlyField(load_flslnk_store(key, *args, **kwargs))
+            if key in COLUMNS_CONFIG
+            else load_flslnk_store(key, *args, **kwargs)
+        ),
+    )
+
+    views = ["cross_section_xy", "cross_section_xz", "cross_section_yz"]
+    simulation.prepare_views(working_dir=flslnk_npz_path, views=views)
+    simulation.generate_views(working_dir=flslnk_npz_path, views=views)
+
+    data = np.load(flslnk_npz_path / "views/cross_section_xz/temperature/0000.npz")
+    assert data["data"].ndim == 2
@@ -0,0 +1,41 @@
+import pickle
+import shutil
+
+from flow_3d.simulation import Simulation
+from flow_3d.workspace import Workspace
+from flow_3d.workspace.executor import task_result
+
+
+def test_map_simulations(tmp_path, flslnk_npz_path):
+    workspace = Workspace(workspace_path=str(tmp_path / "workspace"))
+    for name in ["a", "b", "c"]:
+        workspace.simulation_initialize(name)
+
+    # Simulation `c` has no `flslnk_npz.zip` and fails.
+    for name in ["a", "b"]:
+        shutil.copy(flslnk_npz_path / "flslnk_npz.zip", tmp_path / "workspace" / name)
+
+    output = workspace.view_all_prepare_views(num_proc=2, views=["cross_section_xz"])
+    assert sorted(output["results"]) == ["a", "b"]
+    assert list(output["failed"]) == ["c"]
+    assert (tmp_path / "workspace/a/views/cross_section_xz/temperature").is_dir()
+
+    # Pool is reused across calls and left out when pickled.
+    executor = workspace.executor_pool
+    output = workspace.view_all_prepare_views(num_proc=2, where="name!='c'")
+    assert workspace.executor_pool is executor
+    assert sorted(output["results"]) == ["a", "b"]
+    assert pickle.loads(pickle.dumps(workspace)).executor_pool is None
+
+    workspace.executor_shutdown()
+    assert workspace.executor_pool is None
+
+    output = workspace.view_all_prepare_views(num_proc=1)
+    assert list(output["failed"]) == ["c"]
+
+
+def test_task_result():
+    # Simulations (`self`) returned by methods are not sent back from workers.
+    assert task_result(Simulation()) is None
+    assert task_result("success") == "success"
+    assert task_result({"frames": 3}) == {"frames": 3}
@@ -0,0 +1,69 @@
+import json
+import os
+import pytest
+
+from flow_3d.simulation.status import SimulationStatus
+from flow_3d.workspace import Workspace
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    for power in [100, 200, 300]:
+        workspace.simulation_initialize(f"p{power}", power=power)
+    return workspace
+
+
+def test_index_maintained_by_initialize(workspace, tmp_path):
+    with open(tmp_path / "index.json") as f:
+        index = json.load(f)
+
+    assert sorted(index.keys()) == ["p100", "p200", "p300"]
+    assert index["p200"]["parameters"]["power"] == 200
+    assert index["p200"]["status"] == "initialized"
+
+
+def test_index_select_where(workspace, tmp_path):
+    # Stray folders without `simulation.pkl` are skipped.
+    os.makedirs(tmp_path / "stray")
+    open(tmp_path / "p300" / "flsgrf.zip", "w").close()
+
+    entries = workspace.index_select("power>=200")
+    assert [entry["name"] for entry in entries] == ["p200", "p300"]
+
+    entries = workspace.index_select("power>100 and status=run_done")
+    assert [entry["name"] for entry in entries] == ["p300"]
+
+    with pytest.raises(Exception):
+        workspace.index_select("power")
+
+
+def test_with_simulations_where(workspace):
+    names = []
+
+    @Workspace.with_simulations
+    def method(self, **kwargs):
+        names.extend([simulation.name for simulation in kwargs["simulations"]])
+
+    method(workspace, where="power<300")
+    assert names == ["p100", "p200"]
+
+
+def test_index_sync_refreshes_modified(workspace, tmp_path, monkeypatch):
+    workspace.index_sync()
+
+    checked = []
+    check_status = SimulationStatus.check_status
+    monkeypatch.setattr(
+        SimulationStatus,
+        "check_status",
+        lambda path: checked.append(os.path.basename(path)) or check_status(path),
+    )
+
+    workspace.index_select("power>=100")
+    assert checked == []
+
+    open(tmp_path / "p200" / "flsgrf.zip", "w").close()
+    entries = workspace.index_select("status=run_done")
+    assert checked == ["p200"]
+    assert [entry["name"] for entry in entries] == ["p200"]
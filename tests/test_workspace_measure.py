@@ -0,0 +1,31 @@
+import pandas as pd
+import shutil
+
+from flow_3d.workspace import Workspace
+
+
+def test_aggregate_melt_pool_measurements(tmp_path, flslnk_npz_path):
+    workspace = Workspace(workspace_path=str(tmp_path / "workspace"))
+    for power in [100, 200]:
+        simulation = workspace.simulation_initialize(f"p{power}", power=power)
+        s_dir_path = tmp_path / "workspace" / simulation.name
+        shutil.copy(flslnk_npz_path / "flslnk_npz.zip", s_dir_path)
+        simulation.prepare_melt_pool_measurements(working_dir=s_dir_path)
+        simulation.generate_melt_pool_measurements(
+            working_dir=s_dir_path, interpolate=power == 200, save_masks=True
+        )
+
+    output_path = workspace.measure_all_aggregate_melt_pool_measurements()
+
+    df = pd.read_parquet(output_path)
+    assert sorted(df["name"].unique()) == ["p100", "p200"]
+    assert len(df) == 6
+    assert "mask_xy" not in df.columns
+    assert df[df["name"] == "p100"]["depth_interp_m"].isna().all()
+
+    output_path = workspace.measure_all_aggregate_melt_pool_measurements(
+        where="power>100", include_masks=True
+    )
+    df = pd.read_parquet(output_path)
+    assert list(df["name"].unique()) == ["p200"]
+    assert "mask_xy" in df.columns
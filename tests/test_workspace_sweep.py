@@ -0,0 +1,85 @@
+import yaml
+
+from flow_3d.workspace import Workspace
+from flow_3d.workspace.simulation.sweep import WorkspaceSimulationSweep
+
+
+def test_sweep_samples():
+    grid = WorkspaceSimulationSweep.sweep_samples(
+        {"power": (100, 300), "velocity": [0.5, 1.0], "mesh_size": 2e-5},
+        samples=3,
+    )
+    assert len(grid) == 6
+    assert {sample["power"] for sample in grid} == {100, 200, 300}
+    assert all(sample["mesh_size"] == 2e-5 for sample in grid)
+
+    for sampling in ["lhs", "sobol"]:
+        samples = WorkspaceSimulationSweep.sweep_samples(
+            {"power": (100, 400), "velocity": (0.5, 1.5), "material": ["S31603"]},
+            sampling=sampling,
+            samples=16,
+            seed=0,
+        )
+        assert len(samples) == 16
+        assert all(100 <= sample["power"] <= 400 for sample in samples)
+        assert all(isinstance(sample["power"], int) for sample in samples)
+        assert all(
+            sample["velocity"] == round(sample["velocity"], 2) for sample in samples
+        )
+
+
+def test_sweep_initialize(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    output = workspace.sweep_initialize(
+        {"power": [100, 200], "velocity": [0.5, 1.0]}, num_proc=2
+    )
+    workspace.executor_shutdown()
+
+    assert len(output["created"]) == 4
+    assert output["skipped"] == []
+
+    index = workspace.load_index()
+    assert sorted(index) == output["created"]
+    assert {entry["status"] for entry in index.values()} == {"built"}
+
+    name = output["created"][0]
+    config = yaml.safe_load((tmp_path / name / "simulation.yml").read_text())
+    simulation = workspace.simulation_load(name)
+    assert config["power"] == simulation.power
+    assert config["mesh"]["size"] == simulation.mesh_size
+
+    # Rebuilding from `simulation.yml` leaves sweep prepins as is.
+    assert not workspace.simulation_build(name)
+
+    output = workspace.sweep_initialize({"power": [100, 300], "velocity": [0.5, 1.0]})
+    assert len(output["created"]) == 2
+    assert len(output["skipped"]) == 2
+
+
+def test_sweep_initialize_unnamed_parameters(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    output = workspace.sweep_initialize(
+        {"lens_radius": [4e-5, 5e-5, 6e-5], "simulation_finish_time": [1e-3, 2e-3]}
+    )
+    assert len(output["created"]) == 6
+
+    lens_radii = {workspace.simulation_load(n).lens_radius for n in output["created"]}
+    assert lens_radii == {4e-5, 5e-5, 6e-5}
+
+    # Same values as the default finish time of the first sweep.
+    output = workspace.sweep_initialize({"lens_radius": [4e-5, 7e-5]})
+    assert len(output["created"]) == 1
+    assert len(output["skipped"]) == 1
+
+
+def test_sweep_initialize_material(tmp_path):
+    workspace = Workspace(workspace_path=str(tmp_path))
+    output = workspace.sweep_initialize({"power": [100, 200]})
+
+    # Default material is named the same whether swept or not.
+    output = workspace.sweep_initialize(
+        {"power": [100, 200], "material": ["S31603", "N07718"]}
+    )
+    assert len(output["skipped"]) == 2
+    assert len(output["created"]) == 2
+    assert workspace.simulation_load(output["created"][0]).template_id == "N07718"